@@ -111,6 +111,7 @@ class Match(db.Model):
     home_score = db.Column(db.Integer, nullable=True)
     away_score = db.Column(db.Integer, nullable=True)
     match_time = db.Column(db.Integer, nullable=True)  # Elapsed minutes for live matches (1-90+)
+    match_time_at = db.Column(db.DateTime, nullable=True)  # When match_time was last reported
     
     # Half-time scores
     ht_home_score = db.Column(db.Integer, nullable=True)
@@ -150,13 +151,23 @@ class Match(db.Model):
     correct_score_odds = db.Column(db.Text, nullable=True)  # JSON string of score odds
     
     is_manual = db.Column(db.Boolean, default=True)  # True for manually managed matches
-    api_fixture_id = db.Column(db.Integer, nullable=True)  # For API-based matches
+    api_fixture_id = db.Column(db.Integer, unique=True, nullable=True)  # For API-based matches
+    content_hash = db.Column(db.String(64), nullable=True)  # Hash of the last synced API payload
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     def __repr__(self):
         return f'<Match {self.home_team} vs {self.away_team}>'
     
+    @property
+    def live_minute(self):
+        """match_time advanced by the wall clock since it was last reported, capped at the end of the period"""
+        if self.status != MatchStatus.LIVE.value or self.match_time is None or self.match_time_at is None:
+            return self.match_time
+        minute = self.match_time + int((datetime.utcnow() - self.match_time_at).total_seconds() // 60)
+        period_end = 45 if self.match_time <= 45 else 90 if self.match_time <= 90 else 120
+        return max(self.match_time, min(minute, period_end))
+    
     def to_dict(self):
         return {
             'id': self.id,
@@ -167,7 +178,7 @@ class Match(db.Model):
             'status': self.status,
             'home_score': self.home_score,
             'away_score': self.away_score,
-            'match_time': self.match_time,  # Add match time in minutes
+            'match_time': self.live_minute,  # Add match time in minutes (interpolated between polls)
             'ht_home_score': self.ht_home_score,
             'ht_away_score': self.ht_away_score,
             'ht_status': self.ht_status,
@@ -195,7 +206,7 @@ class Bet(db.Model):
     
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
-    match_id = db.Column(db.Integer, db.ForeignKey('matches.id'), nullable=True)  # Link to match
+    match_id = db.Column(db.Integer, nullable=True, index=True)  # Link to match (matches or matches_archive)
     amount = db.Column(db.Float, nullable=False)  # in BTC
     odds = db.Column(db.Float, nullable=False)
     potential_payout = db.Column(db.Float, nullable=False)  # amount * odds
@@ -216,7 +227,19 @@ class Bet(db.Model):
     
     # Relationships
     user = db.relationship('User', back_populates='bets')
-    match = db.relationship('Match', backref='bets', foreign_keys=[match_id])
+    # No FK on match_id: finished matches move to matches_archive with their id
+    match = db.relationship(
+        'Match', primaryjoin='foreign(Bet.match_id) == Match.id',
+        backref=db.backref('bets', passive_deletes='all')
+    )
+    archived_match = db.relationship(
+        'MatchArchive', primaryjoin='foreign(Bet.match_id) == MatchArchive.id', viewonly=True
+    )
+    
+    @property
+    def match_record(self):
+        """The bet's match, from the hot table or the archive"""
+        return self.match or self.archived_match
     
     def __repr__(self):
         return f'<Bet {self.id} - {self.status}>'
@@ -236,3 +259,7 @@ class BookingCode(db.Model):
     
     def __repr__(self):
         return f'<BookingCode {self.code}>'
+
+# Imported last: archive helpers refer back to Match
+from app.models.match_archive import MatchArchive
+from app.models.fetch_job import FetchJob
@@ -0,0 +1,42 @@
+"""Casino round journal - append-only record of dice, plinko, mines and crash rounds"""
+from app.extensions import db
+from datetime import datetime
+import json
+
+
+class CasinoRound(db.Model):
+    __tablename__ = 'casino_rounds'
+    __table_args__ = (
+        db.Index('ix_casino_rounds_user_game_created', 'user_id', 'game', 'created_at'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    game = db.Column(db.String(20), nullable=False)  # 'dice', 'plinko', 'mines', 'crash'
+    stake = db.Column(db.Float, nullable=False)  # in USD
+    multiplier = db.Column(db.Float, nullable=False, default=0.0)
+    payout = db.Column(db.Float, nullable=False, default=0.0)  # 0 for a lost round
+    server_seed = db.Column(db.String(64), nullable=True)
+    client_seed = db.Column(db.String(64), nullable=True)
+    nonce = db.Column(db.BigInteger, nullable=True)
+    details = db.Column(db.Text, nullable=True)  # JSON: game-specific outcome (target, bucket, mines...)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
+    def __repr__(self):
+        return f'<CasinoRound {self.id} {self.game} user={self.user_id}>'
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'game': self.game,
+            'amount': self.stake,
+            'multiplier': self.multiplier,
+            'payout': self.payout,
+            'profit': self.payout - self.stake,
+            'status': 'won' if self.payout > self.stake else 'lost' if self.payout < self.stake else 'push',
+            'details': json.loads(self.details) if self.details else None,
+            'server_seed': self.server_seed,
+            'client_seed': self.client_seed,
+            'nonce': self.nonce,
+            'created_at': self.created_at.isoformat() if self.created_at else None
+        }
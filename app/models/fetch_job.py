@@ -0,0 +1,42 @@
+"""Fetch job - progress and control of one admin API fetch, shared by every worker"""
+from app.extensions import db
+from datetime import datetime
+
+
+class FetchJob(db.Model):
+    __tablename__ = 'fetch_jobs'
+
+    id = db.Column(db.String(32), primary_key=True)  # uuid4 hex
+    kind = db.Column(db.String(30), nullable=False)  # 'fetch_matches', 'update_live_matches'
+    # Set to kind while queued or running and cleared when finished: the
+    # unique constraint allows one unfinished job per kind across workers
+    active_kind = db.Column(db.String(30), unique=True, nullable=True)
+    user_id = db.Column(db.Integer, nullable=False)
+    params = db.Column(db.JSON, nullable=True)
+    status = db.Column(db.String(20), nullable=False, default='queued')  # queued, running, completed, failed, cancelled
+    progress = db.Column(db.JSON, nullable=True)  # steps_done, steps_total, current, fetched, created, updated
+    error = db.Column(db.Text, nullable=True)
+    cancel_requested = db.Column(db.Boolean, nullable=False, default=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)  # last progress heartbeat
+    finished_at = db.Column(db.DateTime, nullable=True)
+
+    def __repr__(self):
+        return f'<FetchJob {self.id} {self.kind} {self.status}>'
+
+    @property
+    def finished(self):
+        return self.status in ('completed', 'failed', 'cancelled')
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'kind': self.kind,
+            'status': self.status,
+            'params': self.params or {},
+            'progress': dict(self.progress or {}),
+            'error': self.error,
+            'cancel_requested': self.cancel_requested,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None
+        }
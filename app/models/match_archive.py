@@ -0,0 +1,57 @@
+"""Match archive - finished matches moved out of the hot matches table"""
+from app.extensions import db
+from datetime import datetime
+
+
+class MatchArchive(db.Model):
+    """Same columns as Match; ids are kept so bets.match_id still resolves"""
+    __tablename__ = 'matches_archive'
+    __table_args__ = (
+        db.Index('ix_matches_archive_match_date', 'match_date'),
+        db.Index('ix_matches_archive_api_fixture_id', 'api_fixture_id'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    home_team = db.Column(db.String(100), nullable=False)
+    away_team = db.Column(db.String(100), nullable=False)
+    league = db.Column(db.String(100), nullable=True)
+    match_date = db.Column(db.DateTime, nullable=False)
+    status = db.Column(db.String(20))
+    home_score = db.Column(db.Integer, nullable=True)
+    away_score = db.Column(db.Integer, nullable=True)
+    match_time = db.Column(db.Integer, nullable=True)
+    match_time_at = db.Column(db.DateTime, nullable=True)
+    ht_home_score = db.Column(db.Integer, nullable=True)
+    ht_away_score = db.Column(db.Integer, nullable=True)
+    ht_status = db.Column(db.String(20))
+    home_odds = db.Column(db.Float, nullable=False)
+    draw_odds = db.Column(db.Float, nullable=False)
+    away_odds = db.Column(db.Float, nullable=False)
+    home_draw_odds = db.Column(db.Float, nullable=True)
+    home_away_odds = db.Column(db.Float, nullable=True)
+    draw_away_odds = db.Column(db.Float, nullable=True)
+    gg_odds = db.Column(db.Float, nullable=True)
+    ng_odds = db.Column(db.Float, nullable=True)
+    over25_odds = db.Column(db.Float, nullable=True)
+    under25_odds = db.Column(db.Float, nullable=True)
+    over15_odds = db.Column(db.Float, nullable=True)
+    under15_odds = db.Column(db.Float, nullable=True)
+    over35_odds = db.Column(db.Float, nullable=True)
+    under35_odds = db.Column(db.Float, nullable=True)
+    htft_odds = db.Column(db.Text, nullable=True)
+    correct_score_odds = db.Column(db.Text, nullable=True)
+    is_manual = db.Column(db.Boolean)
+    api_fixture_id = db.Column(db.Integer, nullable=True)
+    content_hash = db.Column(db.String(64), nullable=True)
+    created_at = db.Column(db.DateTime)
+    updated_at = db.Column(db.DateTime)
+    archived_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
+    def __repr__(self):
+        return f'<MatchArchive {self.home_team} vs {self.away_team}>'
+
+    def to_dict(self):
+        from app.models import Match
+        data = Match.to_dict(self)
+        data['archived_at'] = self.archived_at.isoformat() if self.archived_at else None
+        return data
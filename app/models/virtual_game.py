@@ -1,3 +1,4 @@
+import json
 from app.extensions import db
 from datetime import datetime
 from enum import Enum
@@ -71,12 +72,19 @@ class VirtualTeam(db.Model):
 
 class VirtualGame(db.Model):
     __tablename__ = 'virtual_games'
+    __table_args__ = (
+        db.Index('ix_virtual_games_league_season_round', 'league_id', 'season_number', 'round_number'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     league_id = db.Column(db.Integer, db.ForeignKey('virtual_leagues.id'), nullable=False)
     home_team_id = db.Column(db.Integer, db.ForeignKey('virtual_teams.id'), nullable=False)
     away_team_id = db.Column(db.Integer, db.ForeignKey('virtual_teams.id'), nullable=False)
     
+    # Season fixture slot (null for games scheduled one round at a time)
+    season_number = db.Column(db.Integer, nullable=True)
+    round_number = db.Column(db.Integer, nullable=True)
+    
     # Game timing
     scheduled_start = db.Column(db.DateTime, nullable=False)
     actual_start = db.Column(db.DateTime, nullable=True)
@@ -142,6 +150,8 @@ class VirtualGame(db.Model):
         
         # Only include scores if game is in_progress or finished
         include_scores = self.status in ['in_progress', 'finished']
+        # Timelines are simulated before kickoff and must stay hidden until then
+        kicked_off = self.status in ['live', 'in_progress', 'finished']
         
         result = {
             'id': self.id,
@@ -151,6 +161,8 @@ class VirtualGame(db.Model):
             'away_team': away_team_name,
             'home_team_obj': self.home_team.to_dict() if self.home_team else None,
             'away_team_obj': self.away_team.to_dict() if self.away_team else None,
+            'season_number': self.season_number,
+            'round_number': self.round_number,
             'scheduled_start': self.scheduled_start.isoformat() if self.scheduled_start else None,
             'scheduled_time': self.scheduled_start.isoformat() if self.scheduled_start else None,  # For compatibility
             'actual_start': self.actual_start.isoformat() if self.actual_start else None,
@@ -159,8 +171,8 @@ class VirtualGame(db.Model):
             'current_minute': self.current_minute if include_scores else 0,
             'home_score': self.home_score if include_scores else None,
             'away_score': self.away_score if include_scores else None,
-            'ht_home_score': self.ht_home_score,
-            'ht_away_score': self.ht_away_score,
+            'ht_home_score': self.ht_home_score if include_scores else None,
+            'ht_away_score': self.ht_away_score if include_scores else None,
             'home_odds': self.home_odds,
             'draw_odds': self.draw_odds,
             'away_odds': self.away_odds,
@@ -176,7 +188,7 @@ class VirtualGame(db.Model):
             'over35_odds': self.over35_odds,
             'under35_odds': self.under35_odds,
             'correct_score_odds': self.correct_score_odds,
-            'events': self.events,
+            'events': self.events if kicked_off else None,
             'is_auto_play': self.is_auto_play,
             'result_set_manually': self.result_set_manually,
             'finished_at': self.finished_at.isoformat() if self.finished_at else None,
@@ -195,3 +207,47 @@ class VirtualGame(db.Model):
         }
         
         return result
+
+class VirtualSeasonArchive(db.Model):
+    """
+    One finished season of a league, packed: each per-game field is a NumPy
+    array stored as bytes (see app.services.virtual_season_archive), so a
+    380-game season is one small row instead of 380 wide ones
+    """
+    __tablename__ = 'virtual_season_archive'
+    __table_args__ = (
+        db.UniqueConstraint('league_id', 'season_number', name='uq_virtual_season_archive_league_season'),
+    )
+    
+    id = db.Column(db.Integer, primary_key=True)
+    league_id = db.Column(db.Integer, nullable=False, index=True)  # No FK: history outlives a deleted league
+    season_number = db.Column(db.Integer, nullable=False)
+    games_count = db.Column(db.Integer, nullable=False)
+    teams = db.Column(db.Text, nullable=False)  # JSON {team_id: name} as of the season
+    
+    # Packed per-game arrays, all in the same game order
+    round_numbers = db.Column(db.LargeBinary, nullable=False)
+    home_team_ids = db.Column(db.LargeBinary, nullable=False)
+    away_team_ids = db.Column(db.LargeBinary, nullable=False)
+    scores = db.Column(db.LargeBinary, nullable=False)  # (games, 4): home, away, ht home, ht away
+    odds_columns = db.Column(db.Text, nullable=False)  # JSON names of the odds matrix columns
+    odds = db.Column(db.LargeBinary, nullable=False)  # (games, len(odds_columns))
+    
+    standings = db.Column(db.Text, nullable=False)  # JSON final table
+    started_at = db.Column(db.DateTime, nullable=True)
+    finished_at = db.Column(db.DateTime, nullable=True)
+    archived_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    def __repr__(self):
+        return f'<VirtualSeasonArchive league {self.league_id} season {self.season_number}>'
+    
+    def to_dict(self):
+        return {
+            'league_id': self.league_id,
+            'season_number': self.season_number,
+            'games_count': self.games_count,
+            'standings': json.loads(self.standings),
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None,
+            'archived_at': self.archived_at.isoformat() if self.archived_at else None
+        }
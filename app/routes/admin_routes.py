@@ -77,6 +77,37 @@ def get_platform_statistics(user):
         logger.error(f"[Platform Stats] Error: {e}")
         return jsonify({'message': 'Error fetching statistics'}), 500
 
+# --- Outbound API Health ---
+@admin_bp.route('/http-stats', methods=['GET'])
+@admin_required
+def get_http_stats(user):
+    """Per-host latency, error and circuit-breaker state for outbound API calls"""
+    from app.services.http_client import http_client
+    from app.services.http_cache import api_cache
+    return jsonify({
+        'hosts': http_client.stats(),
+        'cache': api_cache.stats()
+    }), 200
+
+# --- House Liability ---
+@admin_bp.route('/liability', methods=['GET'])
+@admin_required
+def get_liability(user):
+    """Worst-case payout per match across open singles and accumulator legs"""
+    from app.services.liability import load_book, DEFAULT_MAX_GOALS
+    try:
+        max_goals = min(max(request.args.get('max_goals', DEFAULT_MAX_GOALS, type=int), 1), 15)
+        match_id = request.args.get('match_id', type=int)
+        matches = load_book(db.session).worst_cases([match_id] if match_id else None, max_goals)
+        return jsonify({
+            'matches': matches,
+            'max_goals': max_goals,
+            'total_worst_payout': round(sum(m['worst_payout'] for m in matches), 8)
+        }), 200
+    except Exception as e:
+        logger.error(f"[Liability] Error: {e}")
+        return jsonify({'message': 'Error computing liability'}), 500
+
 # --- Recent Activity ---
 @admin_bp.route('/activity/recent', methods=['GET'])
 @admin_required
@@ -501,16 +532,17 @@ def list_bets(user):
                 }
                 
                 # Add match details if available
-                if bet.match:
+                match = bet.match_record  # hot table or archive
+                if match:
                     bet_dict['match'] = {
-                        'id': bet.match.id,
-                        'home_team': bet.match.home_team,
-                        'away_team': bet.match.away_team,
-                        'league': bet.match.league,
-                        'status': bet.match.status,
-                        'home_score': bet.match.home_score,
-                        'away_score': bet.match.away_score,
-                        'match_time': bet.match.match_time.isoformat() if bet.match.match_time else None
+                        'id': match.id,
+                        'home_team': match.home_team,
+                        'away_team': match.away_team,
+                        'league': match.league,
+                        'status': match.status,
+                        'home_score': match.home_score,
+                        'away_score': match.away_score,
+                        'match_time': match.match_time.isoformat() if match.match_time else None
                     }
                 
                 bets_data.append(bet_dict)
@@ -568,55 +600,35 @@ def list_matches(user):
         logger.error(f"[List Matches] Error: {e}")
         return jsonify({'message': 'Error fetching matches'}), 500
 
+def _start_fetch_job(user, kind, **params):
+    """Start a background fetch job and return 202 with its id (progress is pushed as 'fetch_job_progress')"""
+    from app.services.fetch_jobs import fetch_jobs
+    from config import Config
+    
+    # Check if API key is configured
+    api_key = os.environ.get('FOOTBALL_API_KEY') or getattr(Config, 'FOOTBALL_API_KEY', None)
+    
+    if not api_key:
+        return jsonify({
+            'message': 'API key not configured. Please set FOOTBALL_API_KEY environment variable.'
+        }), 400
+    
+    job, started = fetch_jobs.start(current_app._get_current_object(), kind, user.id, api_key, **params)
+    return jsonify({
+        'message': 'Fetch job started' if started else 'A fetch job of this kind is already running',
+        'job': job.to_dict()
+    }), 202
+
 @admin_bp.route('/fetch-matches', methods=['POST'])
 @admin_required
 def fetch_matches_from_api(user):
-    """Fetch matches from ALL sports API and save to database"""
+    """Start a background job fetching matches from ALL sports API into the database"""
+    from app.services.fetch_jobs import JOB_FETCH_MATCHES
     try:
-        from app.services.multi_sport_api_service import multi_sport_api
-        from config import Config
-        
-        # Check if API key is configured
-        api_key = os.environ.get('FOOTBALL_API_KEY') or getattr(Config, 'FOOTBALL_API_KEY', None)
-        
-        if not api_key:
-            return jsonify({
-                'message': 'API key not configured. Please set FOOTBALL_API_KEY environment variable.'
-            }), 400
-        
-        # Use the global instance and initialize it
-        multi_sport_api.initialize(api_key)
-        
-        # Fetch matches from ALL SPORTS (8 prioritized sports)
-        logger.info("="*50)
-        logger.info("STARTING MULTI-SPORT API FETCH")
-        logger.info(f"API Key configured: {api_key[:10]}...")
-        logger.info("="*50)
-        
-        matches_data = multi_sport_api.get_all_sports_matches(days_ahead=7)
-        
-        logger.info(f"Total matches fetched from all sports: {len(matches_data) if matches_data else 0}")
-        logger.info(f"Total matches fetched from all sports: {len(matches_data) if matches_data else 0}")
-        
-        if not matches_data:
-            logger.warning("No matches returned from any sport!")
-            return jsonify({'message': 'No matches available today from any sport. Check logs for details.'}), 404
-        
-        logger.info(f"Fetched {len(matches_data)} total matches from API")
-        
-        # Sync to database
-        created, updated = multi_sport_api.sync_matches_to_database(matches_data)
-        
-        logger.info(f"Database sync complete: {created} created, {updated} updated")
-        logger.info("="*50)
-        
-        return jsonify({
-            'message': f'Successfully fetched matches from {len(matches_data)} sports!',
-            'created': created,
-            'updated': updated,
-            'total': created + updated
-        }), 200
-        
+        days_ahead = int((request.get_json(silent=True) or {}).get('days_ahead', 7))
+        return _start_fetch_job(user, JOB_FETCH_MATCHES, days_ahead=max(1, min(days_ahead, 14)))
+    except (TypeError, ValueError):
+        return jsonify({'message': 'days_ahead must be a number'}), 400
     except Exception as e:
         logger.error(f"Fetch matches error: {e}")
         return jsonify({'message': str(e)}), 500
@@ -625,36 +637,47 @@ def fetch_matches_from_api(user):
 @admin_bp.route('/update-live-matches', methods=['POST'])
 @admin_required
 def update_live_matches_endpoint(user):
-    """Update scores and times for all live matches"""
+    """Start a background job updating scores and times for all live matches"""
+    from app.services.fetch_jobs import JOB_UPDATE_LIVE
     try:
-        from app.services.multi_sport_api_service import multi_sport_api
-        from config import Config
-        
-        api_key = os.environ.get('FOOTBALL_API_KEY') or getattr(Config, 'FOOTBALL_API_KEY', None)
-        
-        if not api_key:
-            return jsonify({'message': 'API key not configured'}), 400
-        
-        multi_sport_api.initialize(api_key)
-        
-        logger.info("="*50)
-        logger.info("UPDATING LIVE MATCHES")
-        logger.info("="*50)
-        
-        updated = multi_sport_api.update_live_matches()
-        
-        logger.info("="*50)
-        
-        return jsonify({
-            'message': f'Successfully updated {updated} live matches',
-            'updated': updated
-        }), 200
-        
+        return _start_fetch_job(user, JOB_UPDATE_LIVE)
     except Exception as e:
         logger.error(f"[Fetch Matches] Error: {e}")
-        db.session.rollback()
         return jsonify({'message': f'Error fetching matches: {str(e)}'}), 500
 
+
+@admin_bp.route('/fetch-jobs', methods=['GET'])
+@admin_required
+def list_fetch_jobs(user):
+    """Recent fetch jobs, newest first"""
+    from app.services.fetch_jobs import fetch_jobs
+    return jsonify({'jobs': fetch_jobs.list()}), 200
+
+
+@admin_bp.route('/fetch-jobs/<job_id>', methods=['GET'])
+@admin_required
+def get_fetch_job(user, job_id):
+    """Status and progress of one fetch job"""
+    from app.services.fetch_jobs import fetch_jobs
+    job = fetch_jobs.get(job_id)
+    if not job:
+        return jsonify({'message': 'Job not found'}), 404
+    return jsonify({'job': job.to_dict()}), 200
+
+
+@admin_bp.route('/fetch-jobs/<job_id>/cancel', methods=['POST'])
+@admin_required
+def cancel_fetch_job(user, job_id):
+    """Stop a fetch job at its next step"""
+    from app.services.fetch_jobs import fetch_jobs
+    job = fetch_jobs.cancel(job_id)
+    if not job:
+        return jsonify({'message': 'Job not found'}), 404
+    return jsonify({
+        'message': 'Cancellation requested' if not job.finished else f'Job already {job.status}',
+        'job': job.to_dict()
+    }), 200
+
 # --- Create New Match ---
 @admin_bp.route('/matches', methods=['POST'])
 @admin_required
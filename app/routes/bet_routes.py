@@ -199,7 +199,7 @@ def get_active_bets(user):
 				'is_cashed_out': getattr(bet, 'is_cashed_out', False),
 				'cashout_value': getattr(bet, 'cashout_value', None),
 				'created_at': bet.created_at.isoformat() if getattr(bet, 'created_at', None) else None,
-				'match': bet.match.to_dict() if getattr(bet, 'match', None) else None
+				'match': bet.match_record.to_dict() if bet.match_record else None
 			} for bet in bets]
 		}), 200
 	except Exception as e:
@@ -260,23 +260,11 @@ def cashout_bet(user, bet_id):
 		if bet.is_cashed_out:
 			return jsonify({'message': 'Bet already cashed out'}), 400
 
-		# Calculate cashout value based on stake amount
-		# Before 1 minute: 100% of stake
-		# After 1 minute: 85% of stake (15% deduction)
+		# Value the bet from the live score (full stake back inside the first minute)
 		from datetime import datetime
-		time_elapsed = datetime.utcnow() - bet.created_at
-		minutes_elapsed = time_elapsed.total_seconds() / 60.0
-		
-		stake_amount = bet.amount
-		
-		if minutes_elapsed < 1.0:
-			# Before 1 minute: Full stake refund
-			cashout_percentage = 1.0
-			cashout_value = stake_amount
-		else:
-			# After 1 minute: 85% of stake (15% deduction)
-			cashout_percentage = 0.85
-			cashout_value = stake_amount * 0.85
+		cashout_value, cashout_percentage = betting_service.get_cashout_value(bet)
+		if cashout_value <= 0:
+			return jsonify({'message': 'Cashout not available'}), 400
 
 		# Update bet
 		bet.is_cashed_out = True
@@ -318,23 +306,8 @@ def get_cashout_value(user, bet_id):
 		if bet.status != BetStatus.ACTIVE.value or bet.is_cashed_out:
 			return jsonify({'message': 'Cashout not available'}), 400
 
-		# Calculate current cashout value based on stake amount
-		# Before 1 minute: 100% of stake
-		# After 1 minute: 85% of stake (15% deduction)
-		from datetime import datetime
-		time_elapsed = datetime.utcnow() - bet.created_at
-		minutes_elapsed = time_elapsed.total_seconds() / 60.0
-		
-		stake_amount = bet.amount
-		
-		if minutes_elapsed < 1.0:
-			# Before 1 minute: Full stake refund
-			cashout_percentage = 1.0
-			cashout_value = stake_amount
-		else:
-			# After 1 minute: 85% of stake (15% deduction)
-			cashout_percentage = 0.85
-			cashout_value = stake_amount * 0.85
+		# Value the bet from the live score (full stake back inside the first minute)
+		cashout_value, cashout_percentage = betting_service.get_cashout_value(bet)
 
 		return jsonify({
 			'cashout_value': cashout_value,
@@ -346,6 +319,30 @@ def get_cashout_value(user, bet_id):
 		return jsonify({'message': 'An error occurred'}), 500
 
 
+@bet_bp.route('/cashout-quotes', methods=['GET'])
+@token_required
+def get_cashout_quotes(user):
+	"""Current cashout values for all of the user's active bets in one call"""
+	try:
+		quotes = betting_service.get_cashout_quotes(user)
+		return jsonify({
+			'quotes': [
+				{
+					'bet_id': bet_id,
+					'cashout_value': quote['cashout_value'],
+					'cashout_percentage': quote['cashout_percentage'] * 100,
+					'win_probability': quote['win_probability'],
+					'available': quote['cashout_value'] > 0
+				}
+				for bet_id, quote in quotes.items()
+			]
+		}), 200
+
+	except Exception as e:
+		logger.error(f"Get cashout quotes error: {e}")
+		return jsonify({'message': 'An error occurred'}), 500
+
+
 @bet_bp.route('/matches/manual', methods=['GET'])
 def get_manual_matches():
 	"""Get all matches (both manual and API) - PUBLIC endpoint (no auth required)"""
@@ -6,6 +6,7 @@ from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from app.extensions import db
 from app.models import User, Bet, Transaction, BetStatus
+from app.services.round_journal import round_journal
 import time
 import random
 import hashlib
@@ -15,6 +16,12 @@ from decimal import Decimal
 
 crash_bp = Blueprint('crash', __name__, url_prefix='/api/crash')
 
+# Crash point distribution: (cumulative probability, low, width), point = low + U * width
+# 10% instant crash, 60% 1.2x - 2.5x, 20% 2.5x - 10x, 10% 10x - 50x (house advantage)
+CRASH_SEGMENTS = ((0.10, 1.0, 0.0), (0.70, 1.2, 1.3), (0.90, 2.5, 7.5), (1.00, 10.0, 40.0))
+MAX_FLIGHT_SECONDS = 20.0  # rounds still flying are crashed here
+GROWTH_PER_SECOND = 0.15  # linear multiplier growth
+
 # Game state
 current_game = {
     'game_id': None,
@@ -33,29 +40,17 @@ def generate_crash_point(server_seed, client_seed, game_id):
     # Use timestamp + random for true randomness
     random.seed(time.time() * random.random() * game_id)
     
-    # Generate random value 0-1
+    # Generate random value 0-1 and find its segment of CRASH_SEGMENTS
     rand_val = random.random()
+    for upper, low, width in CRASH_SEGMENTS:
+        if rand_val < upper:
+            break
     
     # House edge 10% - instant crash
-    if rand_val < 0.10:
-        return 1.00
+    if not width:
+        return low
     
-    # Most games crash early (house advantage)
-    # 70% of games: 1.2x - 2.5x
-    # 20% of games: 2.5x - 10x  
-    # 10% of games: 10x - 50x
-    
-    if rand_val < 0.70:  # 60% after house edge
-        # Early crash: 1.2x - 2.5x
-        return round(1.2 + (random.random() * 1.3), 2)
-    elif rand_val < 0.90:  # 20%
-        # Medium: 2.5x - 10x
-        return round(2.5 + (random.random() * 7.5), 2)
-    else:  # 10%
-        # Big win: 10x - 50x
-        return round(10.0 + (random.random() * 40.0), 2)
-    
-    return round(crash_point, 2)
+    return round(low + (random.random() * width), 2)
 
 def start_new_game():
     """Initialize a new crash game"""
@@ -69,6 +64,10 @@ def start_new_game():
     # Calculate crash point
     crash_point = generate_crash_point(server_seed, client_seed, game_id)
     
+    # Journal any bets still riding on the previous round
+    if current_game['status'] in ('flying', 'crashed'):
+        process_crashed_game()
+    
     # Save previous game to history
     if current_game['game_id'] and current_game['crash_point']:
         current_game['history'].insert(0, {
@@ -104,8 +103,7 @@ def get_current_multiplier():
     elapsed = time.time() - current_game['start_time']
     
     # Cap at 20 seconds max flight time for faster games
-    max_flight_time = 20.0
-    if elapsed >= max_flight_time:
+    if elapsed >= MAX_FLIGHT_SECONDS:
         # Force crash
         if current_game['status'] == 'flying':
             current_game['status'] = 'crashed'
@@ -115,7 +113,7 @@ def get_current_multiplier():
     
     # Linear growth: 0.15x per second (reaches 4x in 20 seconds)
     # More realistic and faster than exponential
-    multiplier = 1.00 + (elapsed * 0.15)
+    multiplier = 1.00 + (elapsed * GROWTH_PER_SECOND)
     
     # If reached crash point, game ends
     if multiplier >= current_game['crash_point']:
@@ -129,11 +127,23 @@ def get_current_multiplier():
 
 def process_crashed_game():
     """Process all bets when game crashes"""
-    # Just log - balance already deducted on bet placement
+    # Balance already deducted on bet placement - only the journal needs writing
+    lost = []
     for user_id, bet_data in current_game['bets'].items():
-        if not bet_data.get('cashed_out', False):
-            # User lost (balance already deducted when they placed bet)
-            pass
+        if not bet_data.get('cashed_out', False) and not bet_data.get('journaled', False):
+            bet_data['journaled'] = True
+            lost.append({
+                'user_id': user_id,
+                'game': 'crash',
+                'stake': bet_data['amount'],
+                'multiplier': 0.0,
+                'payout': 0.0,
+                'server_seed': current_game['server_seed'],
+                'client_seed': current_game['client_seed'],
+                'nonce': current_game['game_id'],
+                'details': {'crash_point': current_game['crash_point']}
+            })
+    round_journal.record_many(lost)
 
 @crash_bp.route('/status', methods=['GET'])
 def get_status():
@@ -270,6 +280,14 @@ def cash_out():
     # Mark as cashed out
     bet_data['cashed_out'] = True
     bet_data['cash_out_multiplier'] = multiplier
+    bet_data['journaled'] = True
+    
+    round_journal.record(
+        user.id, 'crash', bet_data['amount'], multiplier, float(winnings),
+        server_seed=current_game['server_seed'], client_seed=current_game['client_seed'],
+        nonce=current_game['game_id'],
+        details={'crash_point': current_game['crash_point'], 'cash_out_multiplier': multiplier}
+    )
     
     return jsonify({
         'success': True,
@@ -6,6 +6,9 @@ from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from app.extensions import db
 from app.models import User, Bet, Transaction, BetStatus
+from app.services.auto_bet_service import auto_bet_service
+from app.services.round_journal import round_journal, get_round_history
+import numpy as np
 import random
 import hashlib
 import secrets
@@ -14,6 +17,8 @@ from decimal import Decimal
 
 dice_bp = Blueprint('dice', __name__, url_prefix='/api/dice')
 
+DICE_OUTCOMES = 10000  # rolls 0.00 - 99.99
+
 def generate_dice_result(client_seed, server_seed, nonce):
     """Generate provably fair dice result (0.00 - 99.99)"""
     combined = f"{server_seed}{client_seed}{nonce}"
@@ -21,10 +26,22 @@ def generate_dice_result(client_seed, server_seed, nonce):
     
     # Convert first 8 hex chars to number 0-99.99
     hash_int = int(hash_result[:8], 16)
-    result = (hash_int % 10000) / 100.0
+    result = (hash_int % DICE_OUTCOMES) / 100.0
     
     return round(result, 2)
 
+def dice_results(digests):
+    """Rolls from raw SHA-256 digests (rows of 32 bytes), the mapping of generate_dice_result"""
+    head = digests[:, :4].astype(np.uint64)
+    hash_ints = (head[:, 0] << 24) | (head[:, 1] << 16) | (head[:, 2] << 8) | head[:, 3]
+    return (hash_ints % DICE_OUTCOMES) / 100.0
+
+def dice_multiplier(target, prediction):
+    """Payout multiplier: 99 / (100 - target) for over, 99 / target for under"""
+    if prediction == 'over':
+        return round(99.0 / (100 - target), 2)
+    return round(99.0 / target, 2)
+
 @dice_bp.route('/roll', methods=['POST'])
 @jwt_required()
 def roll_dice():
@@ -68,14 +85,7 @@ def roll_dice():
         won = True
     
     # Calculate payout
-    # Formula: multiplier = 99 / (100 - target) for over
-    #          multiplier = 99 / target for under
-    if prediction == 'over':
-        multiplier = 99.0 / (100 - target)
-    else:
-        multiplier = 99.0 / target
-    
-    multiplier = round(multiplier, 2)
+    multiplier = dice_multiplier(target, prediction)
     
     bet_amount = Decimal(str(amount))
     
@@ -94,6 +104,12 @@ def roll_dice():
     
     db.session.commit()
     
+    round_journal.record(
+        user.id, 'dice', amount, multiplier, float(winnings),
+        server_seed=server_seed, client_seed=client_seed, nonce=nonce,
+        details={'target': target, 'prediction': prediction, 'result': result}
+    )
+    
     return jsonify({
         'success': True,
         'result': result,
@@ -110,26 +126,105 @@ def roll_dice():
         'nonce': nonce
     })
 
+@dice_bp.route('/auto', methods=['POST'])
+@jwt_required()
+def auto_roll():
+    """Roll the dice many times in one request (auto-bet)"""
+    user_id = get_jwt_identity()
+    data = request.json or {}
+
+    amount = float(data.get('amount', 0))
+    target = float(data.get('target', 50))
+    prediction = data.get('prediction', 'over')
+    count = int(data.get('count', 10))
+    stop_on_profit = float(data.get('stop_on_profit') or 0)
+    stop_on_loss = float(data.get('stop_on_loss') or 0)
+
+    if amount <= 0:
+        return jsonify({'error': 'Invalid bet amount'}), 400
+
+    if target < 1 or target > 98:
+        return jsonify({'error': 'Target must be between 1 and 98'}), 400
+
+    if prediction not in ['over', 'under']:
+        return jsonify({'error': 'Prediction must be over or under'}), 400
+
+    if count < 1 or count > auto_bet_service.MAX_ROUNDS:
+        return jsonify({'error': f'Count must be between 1 and {auto_bet_service.MAX_ROUNDS}'}), 400
+
+    if not auto_bet_service.valid_client_seed(data.get('client_seed')):
+        return jsonify({'error': f'Client seed must be at most {auto_bet_service.MAX_SEED_LENGTH} characters'}), 400
+
+    user = User.query.get(user_id)
+    if not user:
+        return jsonify({'error': 'User not found'}), 404
+
+    if user.balance < amount:
+        return jsonify({'error': 'Insufficient balance'}), 400
+
+    # One seed pair, consecutive nonces
+    server_seed, client_seed = auto_bet_service.new_seeds(data.get('client_seed'))
+    nonce_start = int(datetime.utcnow().timestamp() * 1000)
+    digests = auto_bet_service.hash_rounds(server_seed, client_seed, nonce_start, count)
+
+    results = dice_results(digests)
+    multiplier = dice_multiplier(target, prediction)
+    won = results > target if prediction == 'over' else results < target
+
+    payouts = np.where(won, amount * multiplier, 0.0)
+    profits = payouts - amount
+
+    played = auto_bet_service.rounds_to_play(
+        profits, amount, user.balance, stop_on_profit, stop_on_loss
+    )
+    if played == 0:
+        return jsonify({'error': 'Insufficient balance'}), 400
+
+    profits = profits[:played]
+    net_profit = float(profits.sum())
+    required = auto_bet_service.required_balance(profits, amount)
+
+    new_balance = auto_bet_service.apply_net_change(user.id, net_profit, required)
+    if new_balance is None:
+        return jsonify({'error': 'Balance changed during auto-bet, please retry'}), 409
+
+    round_journal.record_many([{
+        'user_id': user.id,
+        'game': 'dice',
+        'stake': amount,
+        'multiplier': multiplier,
+        'payout': float(payouts[i]),
+        'server_seed': server_seed,
+        'client_seed': client_seed,
+        'nonce': nonce_start + i,
+        'details': {'target': target, 'prediction': prediction, 'result': float(results[i])}
+    } for i in range(played)])
+
+    return jsonify({
+        'success': True,
+        'rounds_played': played,
+        'target': target,
+        'prediction': prediction,
+        'multiplier': multiplier,
+        'amount': amount,
+        'fields': ['result', 'won', 'payout'],
+        'rounds': [
+            [float(r), int(w), round(float(p), 8)]
+            for r, w, p in zip(results[:played], won[:played], payouts[:played])
+        ],
+        'wins': int(won[:played].sum()),
+        'total_wagered': amount * played,
+        'profit': net_profit,
+        'new_balance': float(new_balance),
+        'server_seed': server_seed,
+        'client_seed': client_seed,
+        'nonce_start': nonce_start
+    })
+
 @dice_bp.route('/history', methods=['GET'])
 @jwt_required()
 def get_history():
     """Get user's dice history"""
     user_id = get_jwt_identity()
     
-    bets = Bet.query.filter_by(
-        user_id=user_id,
-        bet_type='dice'
-    ).order_by(Bet.created_at.desc()).limit(50).all()
-    
-    history = []
-    for bet in bets:
-        history.append({
-            'id': bet.id,
-            'amount': float(bet.stake),
-            'multiplier': float(bet.odds),
-            'description': bet.description,
-            'status': bet.status,
-            'created_at': bet.created_at.isoformat()
-        })
-    
-    return jsonify({'history': history})
+    return jsonify({'history': get_round_history(user_id, 'dice')})
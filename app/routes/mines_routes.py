@@ -6,6 +6,7 @@ from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from app.extensions import db
 from app.models import User, Bet, Transaction, BetStatus
+from app.services.round_journal import round_journal, get_round_history
 import random
 import hashlib
 import secrets
@@ -139,6 +140,13 @@ def reveal_tile():
         # Balance already deducted when game started
         user = User.query.get(user_id)
         
+        round_journal.record(
+            user.id, 'mines', game['amount'], 0.0, 0.0,
+            server_seed=game['server_seed'], client_seed=game['client_seed'],
+            details={'mines': game['num_mines'], 'revealed': game['revealed'],
+                     'mine_positions': game['mine_positions']}
+        )
+        
         return jsonify({
             'success': True,
             'is_mine': True,
@@ -207,6 +215,13 @@ def cashout():
     # Mark game as complete
     game['status'] = 'won'
     
+    round_journal.record(
+        user.id, 'mines', game['amount'], multiplier, float(winnings),
+        server_seed=game['server_seed'], client_seed=game['client_seed'],
+        details={'mines': game['num_mines'], 'revealed': game['revealed'],
+                 'mine_positions': game['mine_positions']}
+    )
+    
     return jsonify({
         'success': True,
         'multiplier': multiplier,
@@ -223,20 +238,4 @@ def get_history():
     """Get user's mines history"""
     user_id = get_jwt_identity()
     
-    bets = Bet.query.filter_by(
-        user_id=user_id,
-        bet_type='mines'
-    ).order_by(Bet.created_at.desc()).limit(50).all()
-    
-    history = []
-    for bet in bets:
-        history.append({
-            'id': bet.id,
-            'amount': float(bet.stake),
-            'multiplier': float(bet.odds),
-            'description': bet.description,
-            'status': bet.status,
-            'created_at': bet.created_at.isoformat()
-        })
-    
-    return jsonify({'history': history})
+    return jsonify({'history': get_round_history(user_id, 'mines')})
@@ -6,6 +6,9 @@ from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from app.extensions import db
 from app.models import User, Bet, Transaction, BetStatus
+from app.services.auto_bet_service import auto_bet_service
+from app.services.round_journal import round_journal, get_round_history
+import numpy as np
 import random
 import hashlib
 import secrets
@@ -22,9 +25,11 @@ MULTIPLIERS = {
     'high': [33.0, 11.0, 4.0, 2.0, 1.1, 1.0, 0.5, 0.2, 0.1, 0.2, 0.5, 1.0, 1.1, 2.0, 4.0, 11.0, 33.0]
 }
 
-def generate_plinko_path(server_seed, client_seed, rows=16):
+def generate_plinko_path(server_seed, client_seed, rows=16, nonce=None):
     """Generate provably fair plinko path"""
     combined = f"{server_seed}{client_seed}"
+    if nonce is not None:
+        combined += str(nonce)  # Auto-bet rounds share one seed pair
     hash_result = hashlib.sha256(combined.encode()).hexdigest()
     
     # Each row, ball can go left (L) or right (R)
@@ -100,6 +105,12 @@ def drop_ball():
     
     db.session.commit()
     
+    round_journal.record(
+        user.id, 'plinko', amount, multiplier, float(winnings),
+        server_seed=server_seed, client_seed=client_seed,
+        details={'risk': risk, 'bucket': bucket}
+    )
+    
     return jsonify({
         'success': True,
         'path': path,
@@ -113,6 +124,98 @@ def drop_ball():
         'client_seed': client_seed
     })
 
+@plinko_bp.route('/auto', methods=['POST'])
+@jwt_required()
+def auto_drop():
+    """Drop many plinko balls in one request (auto-bet)"""
+    user_id = get_jwt_identity()
+    data = request.json or {}
+
+    amount = float(data.get('amount', 0))
+    risk = data.get('risk', 'medium')
+    count = int(data.get('count', 10))
+    stop_on_profit = float(data.get('stop_on_profit') or 0)
+    stop_on_loss = float(data.get('stop_on_loss') or 0)
+    rows = 16
+
+    if amount <= 0:
+        return jsonify({'error': 'Invalid bet amount'}), 400
+
+    if risk not in ['low', 'medium', 'high']:
+        return jsonify({'error': 'Risk must be low, medium, or high'}), 400
+
+    if count < 1 or count > auto_bet_service.MAX_ROUNDS:
+        return jsonify({'error': f'Count must be between 1 and {auto_bet_service.MAX_ROUNDS}'}), 400
+
+    if not auto_bet_service.valid_client_seed(data.get('client_seed')):
+        return jsonify({'error': f'Client seed must be at most {auto_bet_service.MAX_SEED_LENGTH} characters'}), 400
+
+    user = User.query.get(user_id)
+    if not user:
+        return jsonify({'error': 'User not found'}), 404
+
+    if user.balance < amount:
+        return jsonify({'error': 'Insufficient balance'}), 400
+
+    server_seed, client_seed = auto_bet_service.new_seeds(data.get('client_seed'))
+    nonce_start = int(datetime.utcnow().timestamp() * 1000)
+    digests = auto_bet_service.hash_rounds(server_seed, client_seed, nonce_start, count)
+
+    # Same mapping as generate_plinko_path: byte i decides row i (odd = right)
+    rights = (digests[:, :rows] & 1).astype(np.int64)
+    buckets = np.clip(8 + 2 * rights.sum(axis=1) - rows, 0, len(MULTIPLIERS[risk]) - 1)
+    multipliers = np.asarray(MULTIPLIERS[risk])[buckets]
+
+    payouts = amount * multipliers
+    profits = payouts - amount
+
+    played = auto_bet_service.rounds_to_play(
+        profits, amount, user.balance, stop_on_profit, stop_on_loss
+    )
+    if played == 0:
+        return jsonify({'error': 'Insufficient balance'}), 400
+
+    profits = profits[:played]
+    net_profit = float(profits.sum())
+    required = auto_bet_service.required_balance(profits, amount)
+
+    new_balance = auto_bet_service.apply_net_change(user.id, net_profit, required)
+    if new_balance is None:
+        return jsonify({'error': 'Balance changed during auto-bet, please retry'}), 409
+
+    # Paths packed as bitmasks (bit i set = ball went right on row i)
+    path_masks = (rights[:played] << np.arange(rows)).sum(axis=1)
+
+    round_journal.record_many([{
+        'user_id': user.id,
+        'game': 'plinko',
+        'stake': amount,
+        'multiplier': float(multipliers[i]),
+        'payout': float(payouts[i]),
+        'server_seed': server_seed,
+        'client_seed': client_seed,
+        'nonce': nonce_start + i,
+        'details': {'risk': risk, 'bucket': int(buckets[i])}
+    } for i in range(played)])
+
+    return jsonify({
+        'success': True,
+        'rounds_played': played,
+        'risk': risk,
+        'amount': amount,
+        'fields': ['bucket', 'multiplier', 'payout', 'path_mask'],
+        'rounds': [
+            [int(b), float(m), round(float(p), 8), int(mask)]
+            for b, m, p, mask in zip(buckets[:played], multipliers[:played], payouts[:played], path_masks)
+        ],
+        'total_wagered': amount * played,
+        'profit': net_profit,
+        'new_balance': float(new_balance),
+        'server_seed': server_seed,
+        'client_seed': client_seed,
+        'nonce_start': nonce_start
+    })
+
 @plinko_bp.route('/multipliers', methods=['GET'])
 def get_multipliers():
     """Get multipliers for all risk levels"""
@@ -126,20 +229,4 @@ def get_history():
     """Get user's plinko history"""
     user_id = get_jwt_identity()
     
-    bets = Bet.query.filter_by(
-        user_id=user_id,
-        bet_type='plinko'
-    ).order_by(Bet.created_at.desc()).limit(50).all()
-    
-    history = []
-    for bet in bets:
-        history.append({
-            'id': bet.id,
-            'amount': float(bet.stake),
-            'multiplier': float(bet.odds),
-            'description': bet.description,
-            'status': bet.status,
-            'created_at': bet.created_at.isoformat()
-        })
-    
-    return jsonify({'history': history})
+    return jsonify({'history': get_round_history(user_id, 'plinko')})
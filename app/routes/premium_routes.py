@@ -4,6 +4,7 @@ from app.extensions import db
 from app.models import User
 from app.models.premium_booking import PremiumBooking, PremiumBookingPurchase
 from app.models import Match
+from app.services.bet_builder import bet_builder
 from datetime import datetime, timedelta
 from sqlalchemy import and_
 import logging
@@ -34,10 +35,11 @@ def create_premium_booking():
         if not selections or len(selections) == 0:
             return jsonify({'error': 'At least one selection is required'}), 400
         
-        # Calculate total odds
-        total_odds = 1.0
-        for sel in selections:
-            total_odds *= float(sel.get('odds', 1.0))
+        # Total odds: selections on the same match are priced jointly, the rest multiply
+        try:
+            total_odds = bet_builder.quote_matches(selections)['total_odds']
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
         
         # Generate unique booking code
         booking_code = PremiumBooking.generate_code()
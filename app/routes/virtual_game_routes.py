@@ -3,6 +3,10 @@ from flask_jwt_extended import jwt_required, get_jwt_identity
 from app.models import db, User
 from app.models.virtual_game import VirtualLeague, VirtualTeam, VirtualGame, VirtualGameStatus
 from app.services.virtual_game_service import VirtualGameService
+from app.services.bet_builder import bet_builder
+from app.services.virtual_season_archive import (
+    archive_finished_seasons, head_to_head, season_standings, standings_table
+)
 from app.utils.decorators import token_required
 from datetime import datetime, timedelta
 from sqlalchemy import func
@@ -53,7 +57,8 @@ def get_league_games(league_id):
         
         return jsonify({
             'success': True,
-            'games': [game.to_dict() for game in games]
+            'games': [game.to_dict() for game in games],
+            'server_time': datetime.utcnow().isoformat()
         }), 200
     except Exception as e:
         logger.error(f"[VirtualGame] Error fetching games: {e}")
@@ -288,6 +293,17 @@ def get_league_race_info(league_id):
         current_season = ((current_race - 1) // 38) + 1
         race_in_season = ((current_race - 1) % 38) + 1
         
+        # Leagues with a generated season know their round directly
+        season_game = VirtualGame.query.filter(
+            VirtualGame.league_id == league_id,
+            VirtualGame.status == VirtualGameStatus.LIVE.value,
+            VirtualGame.round_number.isnot(None)
+        ).first()
+        season_round = (season_game.season_number, season_game.round_number) if season_game \
+            else virtual_game_service.next_round(league_id)
+        if season_round:
+            current_season, race_in_season = season_round
+        
         # Get scheduled games count
         scheduled_count = VirtualGame.query.filter_by(
             league_id=league_id,
@@ -353,97 +369,107 @@ def get_league_race_info(league_id):
         logger.error(f"[VirtualGame] Error getting race info: {e}")
         return jsonify({'success': False, 'message': str(e)}), 500
 
+@virtual_game_bp.route('/leagues/<int:league_id>/round', methods=['GET'])
+def get_league_round(league_id):
+    """Get the league's round in progress, or when the next one kicks off
+    
+    Read-only: rounds are kicked off and finished by the virtual scheduler and
+    pushed to the league room; clients call this to catch up on a missed push.
+    """
+    try:
+        live_games = virtual_game_service.get_live_games(league_id)
+        if live_games:
+            return jsonify({
+                'success': True,
+                'message': 'Round in progress',
+                'round': virtual_game_service.round_payload(live_games)
+            }), 200
+        
+        upcoming = virtual_game_service.get_upcoming_games(league_id, limit=1)
+        if upcoming:
+            return jsonify({
+                'success': False,
+                'message': 'Next round has not started yet',
+                'scheduled_start': upcoming[0].scheduled_start.isoformat(),
+                'server_time': datetime.utcnow().isoformat()
+            }), 409
+        return jsonify({'success': False, 'message': 'No scheduled games'}), 404
+    except Exception as e:
+        logger.error(f"[VirtualGame] Error fetching round for league {league_id}: {e}")
+        return jsonify({'success': False, 'message': str(e)}), 500
+
 @virtual_game_bp.route('/leagues/<int:league_id>/standings', methods=['GET'])
 def get_league_standings(league_id):
-    """Get league standings table calculated from ALL finished games in database"""
+    """Get the league table - the current season by default, or ?season=N (archived seasons included)"""
     try:
-        from sqlalchemy import func
-        
-        # Get all finished games for this league from database
-        finished_games = VirtualGame.query.filter_by(
-            league_id=league_id,
-            status=VirtualGameStatus.FINISHED.value
-        ).all()
-        
-        logger.info(f"[VirtualStandings] ==========================================")
-        logger.info(f"[VirtualStandings] League {league_id}: Found {len(finished_games)} finished games in database")
-        
-        if len(finished_games) > 0:
-            logger.info(f"[VirtualStandings] Sample games: {[(g.id, g.home_score, g.away_score, g.status) for g in finished_games[:3]]}")
-        
-        # Get all teams in the league
-        teams_data = {}
-        all_teams = VirtualTeam.query.filter_by(league_id=league_id).all()
-        
-        # Initialize all teams with 0 stats
-        for team in all_teams:
-            teams_data[team.name] = {
-                'name': team.name,
-                'played': 0,
-                'won': 0,
-                'drawn': 0,
-                'lost': 0,
-                'gf': 0,
-                'ga': 0,
-                'pts': 0
-            }
+        season = request.args.get('season', type=int)
+        if season:
+            archived = season_standings(league_id, season)
+            if archived is not None:
+                return jsonify({
+                    'success': True,
+                    'standings': archived,
+                    'games_played': sum(team['played'] for team in archived) // 2,
+                    'season_number': season
+                }), 200
+        else:
+            season = db.session.query(func.max(VirtualGame.season_number)).filter_by(league_id=league_id).scalar()
+        
+        # Only the columns the table needs, aggregated in one vectorized pass
+        query = db.session.query(
+            VirtualGame.home_team_id, VirtualGame.away_team_id, VirtualGame.home_score, VirtualGame.away_score
+        ).filter_by(league_id=league_id, status=VirtualGameStatus.FINISHED.value)
+        if season:
+            query = query.filter_by(season_number=season)
+        results = query.all()
+        names = {team_id: name for team_id, name in
+                 db.session.query(VirtualTeam.id, VirtualTeam.name).filter_by(league_id=league_id)}
+        
+        standings = standings_table(
+            [r.home_team_id for r in results], [r.away_team_id for r in results],
+            [r.home_score or 0 for r in results], [r.away_score or 0 for r in results], names
+        )
         
-        # Calculate stats from finished games
-        for game in finished_games:
-            # Get team names safely
-            home_team = game.home_team.name if game.home_team else game.to_dict()['home_team']
-            away_team = game.away_team.name if game.away_team else game.to_dict()['away_team']
-            
-            # Ensure teams exist in dict
-            if home_team not in teams_data:
-                teams_data[home_team] = {'name': home_team, 'played': 0, 'won': 0, 'drawn': 0, 'lost': 0, 'gf': 0, 'ga': 0, 'pts': 0}
-            if away_team not in teams_data:
-                teams_data[away_team] = {'name': away_team, 'played': 0, 'won': 0, 'drawn': 0, 'lost': 0, 'gf': 0, 'ga': 0, 'pts': 0}
-            
-            teams_data[home_team]['played'] += 1
-            teams_data[away_team]['played'] += 1
-            teams_data[home_team]['gf'] += game.home_score or 0
-            teams_data[home_team]['ga'] += game.away_score or 0
-            teams_data[away_team]['gf'] += game.away_score or 0
-            teams_data[away_team]['ga'] += game.home_score or 0
-            
-            if game.home_score > game.away_score:
-                teams_data[home_team]['won'] += 1
-                teams_data[home_team]['pts'] += 3
-                teams_data[away_team]['lost'] += 1
-            elif game.home_score < game.away_score:
-                teams_data[away_team]['won'] += 1
-                teams_data[away_team]['pts'] += 3
-                teams_data[home_team]['lost'] += 1
-            else:
-                teams_data[home_team]['drawn'] += 1
-                teams_data[away_team]['drawn'] += 1
-                teams_data[home_team]['pts'] += 1
-                teams_data[away_team]['pts'] += 1
-        
-        # Sort standings
-        standings = sorted(teams_data.values(), key=lambda x: (
-            -x['pts'],  # Points descending
-            -(x['gf'] - x['ga']),  # Goal difference descending
-            -x['gf'],  # Goals for descending
-            x['name']  # Name ascending (alphabetical tiebreaker)
-        ))
-        
-        # If no games played yet, sort alphabetically
-        if not finished_games:
-            standings = sorted(standings, key=lambda x: x['name'])
-        
-        logger.info(f"[VirtualGame] Calculated standings for league {league_id}: {len(standings)} teams, {len(finished_games)} games")
+        logger.info(f"[VirtualGame] Calculated standings for league {league_id}: {len(standings)} teams, {len(results)} games")
         
         return jsonify({
             'success': True,
             'standings': standings,
-            'games_played': len(finished_games)
+            'games_played': len(results),
+            'season_number': season
         }), 200
     except Exception as e:
         logger.error(f"[VirtualGame] Error calculating standings: {e}")
         return jsonify({'success': False, 'message': str(e)}), 500
 
+@virtual_game_bp.route('/leagues/<int:league_id>/head-to-head', methods=['GET'])
+def get_head_to_head(league_id):
+    """Get every meeting of two teams (?team_a=<id>&team_b=<id>) across all seasons"""
+    try:
+        team_a = request.args.get('team_a', type=int)
+        team_b = request.args.get('team_b', type=int)
+        if not team_a or not team_b or team_a == team_b:
+            return jsonify({'success': False, 'message': 'Two different team ids are required'}), 400
+        
+        record = head_to_head(league_id, team_a, team_b)
+        return jsonify({'success': True, 'team_a': team_a, 'team_b': team_b, **record}), 200
+    except Exception as e:
+        logger.error(f"[VirtualGame] Error fetching head-to-head: {e}")
+        return jsonify({'success': False, 'message': str(e)}), 500
+
+@virtual_game_bp.route('/bets/quote', methods=['POST'])
+def quote_virtual_bet():
+    """Price a virtual bet slip; same-game legs are priced from the joint score distribution"""
+    try:
+        data = request.get_json() or {}
+        quote = bet_builder.quote_virtual(data.get('selections', []))
+        return jsonify({'success': True, **quote}), 200
+    except ValueError as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
+    except Exception as e:
+        logger.error(f"[VirtualBet] Error quoting bet slip: {e}")
+        return jsonify({'success': False, 'message': str(e)}), 500
+
 @virtual_game_bp.route('/bets/place', methods=['POST'])
 @jwt_required()
 def place_virtual_bet():
@@ -469,10 +495,12 @@ def place_virtual_bet():
         if user.balance < amount:
             return jsonify({'success': False, 'message': 'Insufficient balance'}), 400
         
-        # Calculate total odds
-        total_odds = 1.0
-        for sel in selections:
-            total_odds *= float(sel.get('odd', 1))
+        # Price the slip server-side: legs on the same game are priced jointly.
+        # Betting closes at kickoff - the goal timeline is public from then on
+        try:
+            total_odds = bet_builder.quote_virtual(selections)['total_odds']
+        except ValueError as e:
+            return jsonify({'success': False, 'message': str(e)}), 400
         
         potential_win = amount * total_odds
         
@@ -604,48 +632,37 @@ def schedule_league_games(user, league_id):
         return jsonify({'success': False, 'message': str(e)}), 500
 
 @virtual_game_bp.route('/admin/leagues/<int:league_id>/generate-games', methods=['POST'])
-def generate_league_games(league_id):
-    """Generate games for a league (10 matches for 20-team format) - Auto-called by frontend"""
+@admin_required
+def generate_league_games(user, league_id):
+    """Return the league's next round, generating a new season when the current one is used up
+    
+    Rounds come from a pre-generated season and activate by their scheduled time,
+    so repeated calls return the same round instead of replacing it. The virtual
+    scheduler does this on its own; admins can call it to prepare a league early.
+    """
     try:
-        data = request.get_json() or {}
-        num_games = data.get('num_games', 10)  # Default 10 matches per race
-        
-        # Clean up ONLY scheduled games (keep finished games for standings history)
-        old_scheduled = VirtualGame.query.filter_by(
-            league_id=league_id,
-            status=VirtualGameStatus.SCHEDULED.value
-        ).all()
-        
-        for game in old_scheduled:
-            db.session.delete(game)
-        
-        if old_scheduled:
-            db.session.commit()
-            logger.info(f"[VirtualGame] Cleaned up {len(old_scheduled)} scheduled games for league {league_id}")
-        
-        # Count total finished games for history tracking
-        finished_count = VirtualGame.query.filter_by(
-            league_id=league_id,
-            status=VirtualGameStatus.FINISHED.value
-        ).count()
-        logger.info(f"[VirtualGame] League {league_id} has {finished_count} finished games in history")
-        
-        # Pass None so service will set start_time = now + 180 seconds (countdown)
-        games = virtual_game_service.schedule_games_for_league(
-            league_id=league_id,
-            num_games=num_games,
-            start_time=None  # Service will add 180 second countdown
+        # Clean up leftover one-off scheduled games (not part of a season)
+        removed = virtual_game_service.delete_games(
+            VirtualGame.league_id == league_id,
+            VirtualGame.status == VirtualGameStatus.SCHEDULED.value,
+            VirtualGame.round_number.is_(None)
         )
+        if removed:
+            logger.info(f"[VirtualGame] Cleaned up {removed} scheduled games for league {league_id}")
         
-        logger.info(f"[VirtualGame] Auto-generated {len(games)} games for league {league_id}, starting in 180 seconds")
+        games = virtual_game_service.prepare_next_round(league_id)
         
         return jsonify({
             'success': True,
-            'message': f'Generated {len(games)} games',
+            'message': f'Next round has {len(games)} games',
             'games': [game.to_dict() for game in games],
-            'scheduled_start': games[0].scheduled_start.isoformat() if games else None
+            'season_number': games[0].season_number if games else None,
+            'round_number': games[0].round_number if games else None,
+            'scheduled_start': games[0].scheduled_start.isoformat() if games else None,
+            'server_time': datetime.utcnow().isoformat()
         }), 201
     except Exception as e:
+        db.session.rollback()
         logger.error(f"[VirtualGame] Error generating games: {e}")
         return jsonify({'success': False, 'message': str(e)}), 500
 
@@ -696,46 +713,24 @@ def update_score(user, game_id):
         return jsonify({'success': False, 'message': str(e)}), 500
 
 @virtual_game_bp.route('/admin/games/<int:game_id>/finish', methods=['POST'])
-def finish_game(game_id):
-    """Finish a virtual game - Auto-called by frontend"""
+@admin_required
+def finish_game(user, game_id):
+    """Finish a virtual game with its simulated result (or the score an admin set) and settle its bets"""
     try:
-        data = request.get_json() or {}
-        home_score = data.get('home_score', 0)
-        away_score = data.get('away_score', 0)
-        
-        # Update game scores before finishing
-        game = VirtualGame.query.get(game_id)
-        if not game:
-            return jsonify({'success': False, 'message': 'Game not found'}), 404
-        
-        game.home_score = home_score
-        game.away_score = away_score
-        game.status = VirtualGameStatus.FINISHED.value  # Use .value to get string 'finished'
-        db.session.commit()
-        
-        logger.info(f"[VirtualGame] ✅ Game {game_id} saved to DB: {home_score}-{away_score}, status={game.status}")
-        
-        # Verify it's actually in the database
-        check_game = VirtualGame.query.get(game_id)
-        logger.info(f"[VirtualGame] Verification: Game {game_id} status in DB = {check_game.status if check_game else 'NOT FOUND'}")
+        game = virtual_game_service.finish_game(game_id)
         
-        # Count total finished games for this league
-        total_finished = VirtualGame.query.filter_by(
-            league_id=game.league_id,
-            status=VirtualGameStatus.FINISHED.value
-        ).count()
-        logger.info(f"[VirtualGame] League {game.league_id} now has {total_finished} finished games in database")
-        
-        # Settle ALL pending virtual bets (not just for this game)
+        # Settle multi-game slips that were waiting on this game
         virtual_game_service.settle_all_virtual_bets()
         
-        logger.info(f"[VirtualGame] Game {game_id} finished automatically: {home_score}-{away_score}")
+        logger.info(f"[VirtualGame] Admin {user.username} finished game {game_id}: {game.home_score}-{game.away_score}")
         
         return jsonify({
             'success': True,
             'message': 'Game finished and bets settled',
             'game': game.to_dict()
         }), 200
+    except ValueError as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
     except Exception as e:
         logger.error(f"[VirtualGame] Error finishing game: {e}")
         return jsonify({'success': False, 'message': str(e)}), 500
@@ -781,14 +776,8 @@ def delete_game(user, game_id):
 def reset_all_leagues(user):
     """Reset all leagues to Matchday 1 - Clear ALL games (finished and scheduled)"""
     try:
-        # Delete ALL games (both finished AND scheduled) from all leagues
-        all_games = VirtualGame.query.all()
-        total_deleted = len(all_games)
-        
-        for game in all_games:
-            db.session.delete(game)
-        
-        db.session.commit()
+        # Delete ALL games (both finished AND scheduled) from all leagues, in chunks
+        total_deleted = virtual_game_service.clear_all_games()
         
         logger.info(f"[VirtualGame] Admin {user.username} reset all leagues - deleted {total_deleted} total games (finished + scheduled)")
         
@@ -802,6 +791,24 @@ def reset_all_leagues(user):
         logger.error(f"[VirtualGame] Error resetting leagues: {e}")
         return jsonify({'success': False, 'message': str(e)}), 500
 
+@virtual_game_bp.route('/admin/archive-seasons', methods=['POST'])
+@admin_required
+def archive_seasons(user):
+    """Pack every fully finished season into the season archive (the scheduler does this at season close)"""
+    try:
+        archived = archive_finished_seasons()
+        
+        logger.info(f"[VirtualGame] Admin {user.username} archived {archived} finished seasons")
+        
+        return jsonify({
+            'success': True,
+            'message': f'Archived {archived} seasons',
+            'seasons_archived': archived
+        }), 200
+    except Exception as e:
+        logger.error(f"[VirtualGame] Error archiving seasons: {e}")
+        return jsonify({'success': False, 'message': str(e)}), 500
+
 # Quick Setup Endpoint
 @virtual_game_bp.route('/admin/quick-setup', methods=['POST'])
 @admin_required
@@ -862,17 +869,14 @@ def quick_setup(user):
                     rating=rating
                 )
             
-            # Schedule games (10 matches for 20-team format)
-            games = virtual_game_service.schedule_games_for_league(
-                league_id=league.id,
-                num_games=10,
-                start_time=datetime.utcnow()
-            )
+            # Generate the full season (38 rounds of 10 matches for 20 teams)
+            season = virtual_game_service.generate_season(league.id)
+            games_scheduled = VirtualGame.query.filter_by(league_id=league.id, season_number=season).count()
             
             created_leagues.append({
                 'league': league.to_dict(),
                 'teams_count': len(config['teams']),
-                'games_scheduled': len(games)
+                'games_scheduled': games_scheduled
             })
         
         # Calculate totals
@@ -1019,27 +1023,19 @@ def clear_all_virtual_games():
 @virtual_game_bp.route('/admin/delete-all-leagues', methods=['POST'])
 @admin_required
 def delete_all_leagues(user):
-    """Delete all virtual leagues, teams, and games - complete reset"""
+    """Delete all virtual leagues, teams, and games - complete reset (leagues with unsettled bets are kept)"""
     try:
+        summary = virtual_game_service.delete_all_leagues()
+        kept = summary['leagues_kept']
         
-        # Get counts before deletion
-        leagues_count = VirtualLeague.query.count()
-        teams_count = VirtualTeam.query.count()
-        games_count = VirtualGame.query.count()
+        logger.info(f"[VirtualGame] Admin {user.username} deleted ALL virtual data: {summary['leagues_deleted']} leagues, "
+                    f"{summary['teams_deleted']} teams, {summary['games_deleted']} games ({len(kept)} leagues kept)")
         
-        # Delete all (cascade will handle teams and games)
-        VirtualLeague.query.delete()
-        db.session.commit()
-        
-        logger.info(f"[VirtualGame] Admin {user.username} deleted ALL virtual data: {leagues_count} leagues, {teams_count} teams, {games_count} games")
-        
-        return jsonify({
-            'success': True,
-            'message': f'Deleted everything: {leagues_count} leagues, {teams_count} teams, {games_count} games',
-            'leagues_deleted': leagues_count,
-            'teams_deleted': teams_count,
-            'games_deleted': games_count
-        }), 200
+        message = (f"Deleted everything: {summary['leagues_deleted']} leagues, {summary['teams_deleted']} teams, "
+                   f"{summary['games_deleted']} games")
+        if kept:
+            message += f"; kept {len(kept)} leagues with unsettled bets"
+        return jsonify(dict(summary, success=True, message=message)), 200
     except Exception as e:
         db.session.rollback()
         logger.error(f"[VirtualGame] Error deleting all leagues: {e}")
@@ -0,0 +1,133 @@
+"""
+Auto-Bet Service - batched rounds for the in-house casino games
+Generates a whole range of provably fair rounds from one seed pair and
+settles the net result against the user's balance in a single update
+"""
+import hashlib
+import logging
+import random
+
+import numpy as np
+
+from app.extensions import db
+from app.models import User
+from app.websocket_events import push_balance_update
+
+logger = logging.getLogger(__name__)
+
+
+class AutoBetService:
+    """Service for batched auto-play of dice and plinko"""
+
+    MAX_ROUNDS = 500  # Upper bound per batch request
+    MAX_SEED_LENGTH = 64  # CasinoRound.client_seed is String(64)
+
+    def new_seeds(self, client_seed=None):
+        """Create a fresh server seed (and client seed if none was given)"""
+        server_seed = hashlib.sha256(str(random.random()).encode()).hexdigest()
+        if not client_seed:
+            client_seed = hashlib.sha256(str(random.random()).encode()).hexdigest()[:16]
+        return server_seed, client_seed
+
+    def valid_client_seed(self, client_seed):
+        """A user-supplied client seed is optional, but must be a string that fits the round journal"""
+        return client_seed is None or (isinstance(client_seed, str) and len(client_seed) <= self.MAX_SEED_LENGTH)
+
+    def hash_rounds(self, server_seed, client_seed, nonce_start, count):
+        """
+        Hash every nonce in [nonce_start, nonce_start + count)
+
+        Uses the same "{server_seed}{client_seed}{nonce}" layout as the
+        single-round endpoints, so each round can be verified on its own.
+
+        Returns:
+            uint8 array of shape (count, 32) holding the raw SHA-256 digests
+        """
+        prefix = hashlib.sha256(f"{server_seed}{client_seed}".encode())
+        digests = bytearray()
+        for nonce in range(nonce_start, nonce_start + count):
+            h = prefix.copy()
+            h.update(str(nonce).encode())
+            digests += h.digest()
+        return np.frombuffer(bytes(digests), dtype=np.uint8).reshape(count, 32)
+
+    def rounds_to_play(self, profits, amount, starting_balance,
+                       stop_on_profit=None, stop_on_loss=None):
+        """
+        Work out how many of the generated rounds are actually played
+
+        A round is only played if the running balance can cover the stake,
+        and play stops after the round that reaches the profit target or
+        the loss limit.
+
+        Args:
+            profits: Per-round profit array (payout - stake)
+            amount: Stake per round
+            starting_balance: Balance before the first round
+            stop_on_profit: Stop once cumulative profit >= this value
+            stop_on_loss: Stop once cumulative loss >= this value
+
+        Returns:
+            Number of rounds played (0..len(profits))
+        """
+        count = len(profits)
+        if count == 0:
+            return 0
+
+        cumulative = np.cumsum(profits)
+        before_round = np.concatenate(([0.0], cumulative[:-1]))
+
+        # First round the balance can no longer cover
+        broke = np.nonzero(starting_balance + before_round < amount)[0]
+        played = int(broke[0]) if broke.size else count
+
+        # First round that hits a stop condition (inclusive)
+        stop = np.zeros(count, dtype=bool)
+        if stop_on_profit:
+            stop |= cumulative >= stop_on_profit
+        if stop_on_loss:
+            stop |= cumulative <= -stop_on_loss
+        hits = np.nonzero(stop[:played])[0]
+        if hits.size:
+            played = int(hits[0]) + 1
+
+        return played
+
+    def required_balance(self, profits, amount):
+        """Smallest starting balance that can afford every played round"""
+        if len(profits) == 0:
+            return 0.0
+        before_round = np.concatenate(([0.0], np.cumsum(profits)[:-1]))
+        return float(np.max(amount - before_round))
+
+    def apply_net_change(self, user_id, net, required_balance):
+        """
+        Apply the batch result with one guarded UPDATE
+
+        The WHERE clause re-checks the balance so a concurrent spend between
+        reading the balance and writing the result cannot overdraw the account.
+
+        Returns:
+            The new balance, or None if the guard rejected the update
+        """
+        try:
+            rows = User.query.filter(
+                User.id == user_id,
+                User.balance >= required_balance
+            ).update({User.balance: User.balance + net}, synchronize_session=False)
+
+            if rows != 1:
+                db.session.rollback()
+                return None
+
+            db.session.commit()
+            balance = db.session.query(User.balance).filter(User.id == user_id).scalar()
+            push_balance_update(user_id, balance, net)
+            return balance
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"[AutoBet] Error applying batch result for user {user_id}: {e}")
+            raise
+
+
+auto_bet_service = AutoBetService()
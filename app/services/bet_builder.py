@@ -0,0 +1,164 @@
+"""
+Bet Builder - same-match multi pricing from a joint score distribution
+Legs on the same match are correlated (a home win makes over 2.5 more
+likely), so multiplying their odds misprices the combination. Each
+match's legs are priced together instead: the probability that all of
+them win is the mass of the score-probability matrix where every leg's
+outcome mask holds, evaluated for the whole leg set in one pass. Legs on
+different matches are independent and still multiply.
+
+Virtual games use the pricing engine's matrix, so single legs come out at
+the listed odds. Real matches use the cashout pricer's in-play model from
+their current state. Joint probabilities are cached per (match, state,
+leg set), so quotes are cheap enough to request on every bet-slip change.
+"""
+import logging
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from app.models import Match, MatchStatus
+from app.models.virtual_game import VirtualGame, VirtualGameStatus
+from app.services.cashout_pricer import cashout_pricer
+from app.services.liability import OTHER, outcome_key, outcome_mask
+from app.services.virtual_pricing import MAX_ODDS, MIN_ODDS, pricing_engine
+
+logger = logging.getLogger(__name__)
+
+CACHE_SIZE = 10000
+
+
+class BetBuilder:
+    """Joint pricing of same-match legs"""
+
+    def __init__(self, engine=None, pricer=None):
+        self.engine = engine or pricing_engine
+        self.pricer = pricer or cashout_pricer
+        goals = np.arange(self.engine.max_goals + 1)
+        self._virtual_grid = np.meshgrid(goals, goals, indexing='ij')
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+    def joint_probability(self, distribution, outcomes):
+        """Probability every outcome wins, from (score probabilities, home goals, away goals)"""
+        p, home_goals, away_goals = distribution
+        masks = np.stack([outcome_mask(outcome, home_goals, away_goals) for outcome in outcomes])
+        return float((p * masks.all(axis=0)).sum())
+
+    def odds(self, probability):
+        """Decimal odds at the pricing engine's margin, rounded down and clamped like the listed odds"""
+        if probability <= 0:
+            return None
+        odds = 1.0 / (probability * (1 + self.engine.margin))
+        return float(min(max(np.floor(odds * 100) / 100, MIN_ODDS), MAX_ODDS))
+
+    # ---- quotes ----
+
+    def quote_virtual(self, selections):
+        """
+        Price a virtual bet slip
+
+        Args:
+            selections: [{'game_id', 'market', 'selection', ...}]
+
+        Returns:
+            {'total_odds', 'groups': [{'game_id', 'outcomes', 'probability', 'odds'}]}
+
+        Raises:
+            ValueError: unknown selection, game not open for betting, or legs that can't all win
+        """
+        groups = self._group(selections, 'game_id')
+        games = {game.id: game for game in VirtualGame.query.filter(VirtualGame.id.in_(list(groups))).all()}
+        priced = []
+        for game_id, legs in groups.items():
+            game = games.get(game_id)
+            if not game or game.status != VirtualGameStatus.SCHEDULED.value:
+                raise ValueError('Betting is closed for one or more selected games')
+            outcomes = self._outcomes(legs)
+            ratings = (game.home_team.rating if game.home_team else 75,
+                       game.away_team.rating if game.away_team else 75)
+            probability = self._cached(('virtual', game_id, ratings, outcomes),
+                                       lambda: self._virtual_distribution(*ratings), outcomes)
+            priced.append(self._priced(game_id, outcomes, probability, self.odds(probability)))
+        return self._total(priced)
+
+    def quote_matches(self, selections):
+        """
+        Price a sports slip: single legs keep their listed odds, legs sharing a
+        match are repriced together from the match's score distribution
+
+        Args:
+            selections: [{'match_id', 'market', 'selection', 'odds'}]
+        """
+        groups = self._group(selections, 'match_id')
+        ids = [match_id for match_id, legs in groups.items() if len(legs) > 1]
+        matches = {match.id: match for match in Match.query.filter(Match.id.in_(ids)).all()} if ids else {}
+        priced = []
+        for match_id, legs in groups.items():
+            if len(legs) == 1:
+                odds = float(legs[0].get('odds') or 1.0)
+                priced.append({'match_id': match_id, 'outcomes': [legs[0].get('selection')],
+                               'probability': None, 'odds': odds})
+                continue
+            match = matches.get(match_id)
+            if not match or match.status in (MatchStatus.FINISHED.value, MatchStatus.CANCELLED.value):
+                raise ValueError('Betting is closed for one or more selected matches')
+            outcomes = self._outcomes(legs, match.home_team, match.away_team)
+            state = self.pricer.match_state(match)
+            probability = self._cached(('match', match_id, state, outcomes),
+                                       lambda: self.pricer.score_distribution(match), outcomes)
+            priced.append(self._priced(match_id, outcomes, probability, self.odds(probability), 'match_id'))
+        return self._total(priced)
+
+    # ---- helpers ----
+
+    def _group(self, selections, key):
+        if not selections:
+            raise ValueError('No selections provided')
+        groups = OrderedDict()
+        for sel in selections:
+            if sel.get(key) is None:
+                raise ValueError(f'Selection is missing {key}')
+            groups.setdefault(int(sel[key]), []).append(sel)
+        return groups
+
+    def _outcomes(self, legs, home_team=None, away_team=None):
+        outcomes = []
+        for leg in legs:
+            outcome = outcome_key(leg.get('market'), leg.get('selection'), home_team, away_team)
+            if outcome == OTHER or outcome.startswith('htft:'):
+                raise ValueError(f"Can't price {leg.get('market')}: {leg.get('selection')} with other legs on the same match"
+                                 if len(legs) > 1 else f"Unknown selection {leg.get('market')}: {leg.get('selection')}")
+            outcomes.append(outcome)
+        return tuple(sorted(set(outcomes)))
+
+    def _virtual_distribution(self, home_rating, away_rating):
+        matrix = self.engine.score_matrix(*self.engine.goal_rates([home_rating], [away_rating]))[0]
+        return (matrix, *self._virtual_grid)
+
+    def _cached(self, key, distribution, outcomes):
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                return self._cache[key]
+        probability = self.joint_probability(distribution(), outcomes)
+        with self._lock:
+            self._cache[key] = probability
+            while len(self._cache) > CACHE_SIZE:
+                self._cache.popitem(last=False)
+        return probability
+
+    def _priced(self, group_id, outcomes, probability, odds, key='game_id'):
+        if odds is None:
+            raise ValueError("These selections can't all win together")
+        return {key: group_id, 'outcomes': list(outcomes), 'probability': round(probability, 6), 'odds': odds}
+
+    def _total(self, priced):
+        total_odds = 1.0
+        for group in priced:
+            total_odds *= group['odds']
+        return {'total_odds': round(total_odds, 2), 'groups': priced}
+
+
+bet_builder = BetBuilder()
@@ -4,12 +4,16 @@ import logging
 from sqlalchemy.exc import OperationalError
 from sqlalchemy import text
 from types import SimpleNamespace
+from app.services.cashout_pricer import cashout_pricer, FULL_REFUND_SECONDS
 
 logger = logging.getLogger(__name__)
 
 class BettingService:
     """Service for betting operations"""
     
+    # Cashout: full stake back inside the first minute, then priced from the live score
+    CASHOUT_FULL_REFUND_SECONDS = FULL_REFUND_SECONDS
+    
     def create_bet(self, user: User, amount: float, odds: float, 
                    bet_type: str, event_description: str,
                    market_type: str = None, selection: str = None, 
@@ -48,6 +52,15 @@ class BettingService:
             db.session.rollback()
             raise
     
+    def get_cashout_value(self, bet: Bet, now: datetime = None):
+        """Current cashout value for an active bet, as (value, percentage of stake 0-1)"""
+        quote = cashout_pricer.quote(bet, now)
+        return quote['cashout_value'], quote['cashout_percentage']
+    
+    def get_cashout_quotes(self, user: User, now: datetime = None) -> dict:
+        """Cashout quotes for all of a user's active bets, keyed by bet id"""
+        return cashout_pricer.quotes(self.get_active_bets(user), now)
+    
     def settle_bet(self, bet: Bet, result: str, actual_payout: float = None) -> bool:
         """Settle a bet"""
         try:
@@ -255,13 +268,14 @@ class BettingService:
         import re
         
         # If bet has a direct match reference, return single match score
-        if bet.match:
+        match = bet.match_record  # may have been archived
+        if match:
             return {
-                'home_team': bet.match.home_team,
-                'away_team': bet.match.away_team,
-                'home_score': bet.match.home_score,
-                'away_score': bet.match.away_score,
-                'status': bet.match.status
+                'home_team': match.home_team,
+                'away_team': match.away_team,
+                'home_score': match.home_score,
+                'away_score': match.away_score,
+                'status': match.status
             }
         
         # For multi-bets, extract match names and find scores
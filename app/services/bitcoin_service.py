@@ -3,6 +3,8 @@ from typing import Optional, Dict, List
 from datetime import datetime
 import logging
 
+from app.services.http_client import http_client
+
 logger = logging.getLogger(__name__)
 
 class BitcoinService:
@@ -76,7 +78,7 @@ class BitcoinService:
         """Get balance of a Bitcoin address in BTC"""
         try:
             url = f"{self.base_url}/addr/{address}"
-            response = requests.get(url, timeout=10)
+            response = http_client.get(url, timeout=10)
             response.raise_for_status()
             data = response.json()
             # Convert from satoshis to BTC
@@ -89,7 +91,7 @@ class BitcoinService:
         """Get transaction details"""
         try:
             url = f"{self.base_url}/tx/{tx_hash}"
-            response = requests.get(url, timeout=10)
+            response = http_client.get(url, timeout=10)
             response.raise_for_status()
             return response.json()
         except requests.exceptions.RequestException as e:
@@ -100,7 +102,7 @@ class BitcoinService:
         """Get all transactions for an address"""
         try:
             url = f"{self.base_url}/addr/{address}/full"
-            response = requests.get(url, timeout=10)
+            response = http_client.get(url, timeout=10)
             response.raise_for_status()
             data = response.json()
             return data.get('txs', [])
@@ -140,7 +142,7 @@ class BitcoinService:
         try:
             url = f"{self.base_url}/txs/push"
             payload = {'tx': raw_tx}
-            response = requests.post(url, json=payload, timeout=10)
+            response = http_client.post(url, json=payload, timeout=10)
             response.raise_for_status()
             data = response.json()
             return data.get('tx', {}).get('hash')
@@ -152,7 +154,7 @@ class BitcoinService:
         """Get current Bitcoin network fee estimates"""
         try:
             url = "https://bitcoinfees.earn.com/api/v1/fees/recommended"
-            response = requests.get(url, timeout=10)
+            response = http_client.get(url, timeout=10)
             response.raise_for_status()
             data = response.json()
             return {
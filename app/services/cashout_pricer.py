@@ -0,0 +1,186 @@
+"""
+Cashout Pricer - live cashout quotes from an in-play goal model
+Goals still to come are Poisson with each side's rate scaled by the
+minutes left. The remaining-goal distribution for every (goal rate,
+minute) is precomputed once and kept in memory, so a quote is a table
+lookup, an outer product shifted by the current score, and the same
+outcome masks the liability engine uses. A match's goal rates are fitted
+to its 1X2 odds against a precomputed pre-match table.
+
+A bet is worth its potential payout times the probability that every leg
+still wins, less the cashout margin. Inside the first minute the stake is
+always returned in full. Bets the model can't price (virtual games,
+unrecognised selections) keep the flat stake-based rule.
+"""
+import logging
+import os
+from datetime import datetime
+
+import numpy as np
+from sqlalchemy import select
+
+from app.extensions import db
+from app.models import Match, MatchStatus
+from app.services.liability import OTHER, outcome_mask, resolve_legs
+
+logger = logging.getLogger(__name__)
+
+FULL_REFUND_SECONDS = 60  # full stake back inside the first minute
+FALLBACK_PERCENTAGE = 0.85  # of stake, for bets the model can't price
+DEFAULT_MARGIN = 0.05  # override with CASHOUT_MARGIN
+RATE_GRID = np.round(np.arange(0.2, 4.05, 0.1), 2)  # goals per side per 90 minutes
+DEFAULT_RATES = (1.4, 1.2)  # home, away when a match has no usable odds
+MAX_REMAINING = 10
+MINUTES = 90
+RESULTS = {'h': 'home', 'd': 'draw', 'a': 'away'}
+
+
+class CashoutPricer:
+    """Precomputed in-play tables and model-based cashout quotes"""
+
+    def __init__(self, margin=None):
+        if margin is None:
+            margin = float(os.environ.get('CASHOUT_MARGIN') or DEFAULT_MARGIN)
+        self.margin = margin
+        goals = np.arange(MAX_REMAINING + 1)
+        self._goals = goals
+
+        # Remaining goals per side, shape (rates, minutes 0..90, goals)
+        means = np.maximum(RATE_GRID[:, None] * (MINUTES - np.arange(MINUTES + 1)) / MINUTES, 1e-12)
+        log_factorial = np.cumsum(np.log(np.maximum(goals, 1)))
+        pmf = np.exp(goals * np.log(means)[..., None] - means[..., None] - log_factorial)
+        self._remaining = pmf / pmf.sum(axis=-1, keepdims=True)
+
+        # Pre-match 1X2 probabilities for every (home rate, away rate) pair
+        start = self._remaining[:, 0, :]
+        grid = start[:, None, :, None] * start[None, :, None, :]
+        diff = goals[:, None] - goals[None, :]
+        self._pregame = np.stack([(grid * (diff > 0)).sum(axis=(2, 3)),
+                                  (grid * (diff == 0)).sum(axis=(2, 3)),
+                                  (grid * (diff < 0)).sum(axis=(2, 3))], axis=-1)
+        self._default = tuple(int(np.abs(RATE_GRID - rate).argmin()) for rate in DEFAULT_RATES)
+        self._fits = {}
+
+    # ---- model ----
+
+    def rate_indices(self, home_odds, draw_odds, away_odds):
+        """Grid indices of the (home, away) goal rates closest to the 1X2 odds"""
+        key = (home_odds, draw_odds, away_odds)
+        if key not in self._fits:
+            if not all(odds and odds > 1 for odds in key):
+                self._fits[key] = self._default
+            else:
+                implied = 1 / np.array(key, dtype=float)
+                error = ((self._pregame - implied / implied.sum()) ** 2).sum(axis=-1)
+                home, away = np.unravel_index(error.argmin(), error.shape)
+                self._fits[key] = (int(home), int(away))
+        return self._fits[key]
+
+    def match_state(self, match):
+        """(rate indices, minute, home score, away score) the model prices a match from"""
+        if match.status == MatchStatus.FINISHED.value:
+            minute = MINUTES
+        elif match.status == MatchStatus.LIVE.value:
+            minute = min(max(match.live_minute or 0, 0), MINUTES)
+        else:
+            minute = 0
+        started = match.status != MatchStatus.SCHEDULED.value
+        home, away = (match.home_score or 0, match.away_score or 0) if started else (0, 0)
+        return self.rate_indices(match.home_odds, match.draw_odds, match.away_odds), minute, home, away
+
+    def score_distribution(self, match):
+        """Probability of every final score of the match from its current state, with its goal grids"""
+        return self._final_scores(*self.match_state(match))
+
+    def probability(self, outcome, match):
+        """Probability the outcome wins from the match's current state, or None if it can't be priced"""
+        if outcome == OTHER or match is None or match.status == MatchStatus.CANCELLED.value:
+            return None
+        rates, minute, home, away = self.match_state(match)
+        if outcome.startswith('htft:'):
+            return self._half_time_full_time(outcome, match, rates, minute, home, away)
+        return self._probability(outcome, rates, minute, home, away)
+
+    def _final_scores(self, rates, minute, home, away):
+        """Probability of every final score from here, with its home and away goal grids"""
+        home_idx, away_idx = rates
+        p = np.outer(self._remaining[home_idx, minute], self._remaining[away_idx, minute])
+        home_goals, away_goals = np.meshgrid(self._goals + home, self._goals + away, indexing='ij')
+        return p, home_goals, away_goals
+
+    def _probability(self, outcome, rates, minute, home, away):
+        p, home_goals, away_goals = self._final_scores(rates, minute, home, away)
+        return float((p * outcome_mask(outcome, home_goals, away_goals)).sum())
+
+    def _half_time_full_time(self, outcome, match, rates, minute, home, away):
+        half_time, full_time = RESULTS[outcome[-2]], RESULTS[outcome[-1]]
+        if minute > 45:
+            if match.ht_home_score is None or match.ht_away_score is None:
+                return None
+            ht = np.array([match.ht_home_score]), np.array([match.ht_away_score])
+            if not outcome_mask(half_time, *ht)[0]:
+                return 0.0
+            return self._probability(full_time, rates, minute, home, away)
+
+        # Goals to the break (remaining time 45 - minute), then a full second half
+        first, ht_home, ht_away = self._final_scores(rates, minute + 45, home, away)
+        first = first * outcome_mask(half_time, ht_home, ht_away)
+        second, _, _ = self._final_scores(rates, 45, 0, 0)
+        diffs = self._goals[:, None] - self._goals[None, :]
+        second_diff = np.bincount((diffs + MAX_REMAINING).ravel(), weights=second.ravel(),
+                                  minlength=2 * MAX_REMAINING + 1)
+        final_diff = (ht_home - ht_away)[..., None] + np.arange(-MAX_REMAINING, MAX_REMAINING + 1)
+        target = {'home': 1, 'draw': 0, 'away': -1}[full_time]
+        wins = ((np.sign(final_diff) == target) * second_diff).sum(axis=-1)
+        return float((first * wins).sum())
+
+    # ---- quotes ----
+
+    def quotes(self, bets, now=None):
+        """
+        Cashout quotes for a batch of open bets
+
+        Returns:
+            {bet_id: {'cashout_value', 'cashout_percentage' (0-1), 'win_probability', 'priced'}}
+        """
+        now = now or datetime.utcnow()
+        legs = resolve_legs(db.session.connection(), bets) if bets else {}
+        match_ids = {match_id for bet_legs in legs.values() for match_id, *_ in bet_legs}
+        matches = {match.id: match for match in db.session.execute(
+            select(Match).where(Match.id.in_(match_ids))).scalars()} if match_ids else {}
+
+        quotes = {}
+        for bet in bets:
+            probability = None
+            if legs.get(bet.id):
+                probability = 1.0
+                for match_id, outcome, _, _ in legs[bet.id]:
+                    leg = self.probability(outcome, matches.get(match_id))
+                    if leg is None:
+                        probability = None
+                        break
+                    probability *= leg
+            quotes[bet.id] = self._quote(bet, probability, now)
+        return quotes
+
+    def quote(self, bet, now=None):
+        return self.quotes([bet], now)[bet.id]
+
+    def _quote(self, bet, probability, now):
+        elapsed = (now - bet.created_at).total_seconds() if bet.created_at else FULL_REFUND_SECONDS
+        if probability is None:
+            value = bet.amount * (1.0 if elapsed < FULL_REFUND_SECONDS else FALLBACK_PERCENTAGE)
+        else:
+            value = bet.potential_payout * probability * (1 - self.margin)
+            if elapsed < FULL_REFUND_SECONDS:
+                value = max(value, bet.amount)
+        value = round(value, 8)
+        return {
+            'cashout_value': value,
+            'cashout_percentage': value / bet.amount if bet.amount else 0.0,
+            'win_probability': None if probability is None else round(probability, 6),
+            'priced': probability is not None
+        }
+
+
+cashout_pricer = CashoutPricer()
@@ -0,0 +1,177 @@
+"""
+Fetch Jobs - admin API fetches run as background jobs
+Fetching a week of fixtures can take minutes under the provider's rate
+limit, so the admin endpoints start a job and return its id at once. The
+job runs in a Socket.IO background task, one step per date,
+pushes progress to the admin's user room as 'fetch_job_progress' after
+every step, and stops at the next step boundary when cancelled.
+
+Job state lives in the fetch_jobs table, so status polls and cancels can
+reach any gunicorn worker and the one-unfinished-job-per-kind rule holds
+across workers (a unique active_kind column). A job whose worker died is
+failed once it stops reporting progress.
+"""
+import logging
+import uuid
+from datetime import datetime, timedelta
+
+from sqlalchemy import update
+from sqlalchemy.exc import IntegrityError
+
+from app import socketio
+from app.extensions import db
+from app.models.fetch_job import FetchJob
+
+logger = logging.getLogger(__name__)
+
+JOB_FETCH_MATCHES = 'fetch_matches'
+JOB_UPDATE_LIVE = 'update_live_matches'
+
+
+def new_progress():
+    return {'steps_done': 0, 'steps_total': 0, 'current': None, 'fetched': 0, 'created': 0, 'updated': 0}
+
+
+class JobCancelled(Exception):
+    """Raised at a step boundary once a cancel was requested"""
+
+
+class FetchJobManager:
+    """Starts, tracks and cancels fetch jobs; one unfinished job per kind"""
+
+    MAX_JOBS = 50  # jobs listed and kept for status queries
+    STALE_AFTER = timedelta(minutes=10)  # unfinished jobs silent this long lost their worker
+
+    def start(self, app, kind, user_id, api_key, **params):
+        """
+        Start a job, or return the unfinished job of the same kind
+
+        Returns:
+            (job, started) - started is False when an existing job was returned
+        """
+        self._fail_stale(kind)
+        job = FetchJob(id=uuid.uuid4().hex, kind=kind, active_kind=kind, user_id=user_id,
+                       params=params, status='queued', progress=new_progress(), cancel_requested=False)
+        db.session.add(job)
+        try:
+            db.session.commit()
+        except IntegrityError:
+            db.session.rollback()
+            running = FetchJob.query.filter_by(active_kind=kind).first()
+            if running is None:
+                raise
+            return running, False
+        self._prune()
+
+        socketio.start_background_task(self._run, app, job.id, api_key)
+        logger.info(f"[FetchJob] Started {kind} job {job.id}")
+        return job, True
+
+    def get(self, job_id):
+        return db.session.get(FetchJob, job_id)
+
+    def list(self):
+        jobs = FetchJob.query.order_by(FetchJob.created_at.desc()).limit(self.MAX_JOBS).all()
+        return [job.to_dict() for job in jobs]
+
+    def cancel(self, job_id):
+        """Ask a job to stop at its next step; returns the job or None"""
+        db.session.execute(
+            update(FetchJob)
+            .where(FetchJob.id == job_id, FetchJob.active_kind.isnot(None))
+            .values(cancel_requested=True),
+            execution_options={'synchronize_session': False}
+        )
+        db.session.commit()
+        return self.get(job_id)
+
+    def _fail_stale(self, kind):
+        """Free the kind from an unfinished job whose worker stopped reporting"""
+        now = datetime.utcnow()
+        result = db.session.execute(
+            update(FetchJob)
+            .where(FetchJob.active_kind == kind, FetchJob.updated_at < now - self.STALE_AFTER)
+            .values(active_kind=None, status='failed', error='Worker stopped reporting progress', finished_at=now),
+            execution_options={'synchronize_session': False}
+        )
+        db.session.commit()
+        if result.rowcount:
+            logger.warning(f"[FetchJob] Failed a stale {kind} job")
+
+    def _prune(self):
+        """Drop finished jobs older than the newest MAX_JOBS"""
+        cutoff = db.session.query(FetchJob.created_at).order_by(FetchJob.created_at.desc()) \
+            .offset(self.MAX_JOBS - 1).limit(1).scalar()
+        if cutoff is not None:
+            FetchJob.query.filter(FetchJob.active_kind.is_(None), FetchJob.created_at < cutoff) \
+                .delete(synchronize_session=False)
+            db.session.commit()
+
+    def _run(self, app, job_id, api_key):
+        from app.services.multi_sport_api_service import multi_sport_api
+
+        with app.app_context():
+            job = db.session.get(FetchJob, job_id)
+            try:
+                job.status, job.progress = 'running', new_progress()
+                self._save(job)
+                multi_sport_api.initialize(api_key)
+                if job.kind == JOB_FETCH_MATCHES:
+                    self._fetch_matches(job, multi_sport_api)
+                else:
+                    self._update_live(job, multi_sport_api)
+                job.status = 'completed'
+            except JobCancelled:
+                job.status = 'cancelled'
+            except Exception as e:
+                db.session.rollback()
+                job.status, job.error = 'failed', str(e)
+                logger.error(f"[FetchJob] {job.kind} job {job.id} failed: {e}")
+            try:
+                job.progress = dict(job.progress, current=None)
+                job.active_kind, job.finished_at = None, datetime.utcnow()
+                self._save(job)
+                logger.info(f"[FetchJob] {job.kind} job {job.id} {job.status}: {job.progress}")
+            finally:
+                db.session.remove()
+
+    def _fetch_matches(self, job, api):
+        """One step per date: fetch, normalize and write through the ingestion pipeline"""
+        from app.services.ingestion import ApiSportsAdapter, IngestionPipeline
+
+        pipeline = IngestionPipeline(adapter=ApiSportsAdapter(api))
+        dates = api.fetch_dates((job.params or {}).get('days_ahead', 7))
+        self._step(job, steps_total=len(dates))
+        for date in dates:
+            self._step(job, current=date)
+            self._stop_if_cancelled(job)
+            summary = pipeline.run_schedule(dates=[date], consumers=('matches',))
+            created, updated = summary.get('matches', (0, 0))
+            progress = job.progress
+            self._step(job, steps_done=progress['steps_done'] + 1, fetched=progress['fetched'] + summary['fetched'],
+                       created=progress['created'] + created, updated=progress['updated'] + updated)
+
+    def _update_live(self, job, api):
+        self._step(job, steps_total=1, current='live')
+        self._stop_if_cancelled(job)
+        self._step(job, updated=api.update_live_matches(), steps_done=1)
+
+    def _step(self, job, **progress):
+        job.progress = dict(job.progress, **progress)
+        self._save(job)
+
+    def _stop_if_cancelled(self, job):
+        """Step boundary: the commit in _save expired the row, so this reads the shared flag"""
+        if job.cancel_requested:
+            raise JobCancelled()
+
+    def _save(self, job):
+        job.updated_at = datetime.utcnow()
+        db.session.commit()
+        try:
+            socketio.emit('fetch_job_progress', job.to_dict(), room=f'user_{job.user_id}')
+        except Exception as e:
+            logger.debug(f"[FetchJob] Could not push progress for job {job.id}: {e}")
+
+
+fetch_jobs = FetchJobManager()
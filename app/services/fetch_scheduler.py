@@ -0,0 +1,193 @@
+"""
+Fetch Scheduler - concurrent, rate-limited execution of sports-API requests
+Requests run on a small worker pool, highest priority first (live before
+today before future fixtures), and each one spends a token from a bucket
+sized to the API plan's per-minute and per-day limits. The bucket and the
+daily count live in Redis, so every web worker and Celery child spends
+from the same plan budget instead of each getting the full quota.
+"""
+import heapq
+import itertools
+import logging
+import threading
+import time
+from concurrent.futures import Future
+from datetime import datetime
+
+from app.services.redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+
+# Request priorities (lower runs first)
+PRIORITY_LIVE = 0
+PRIORITY_TODAY = 1
+PRIORITY_FUTURE = 2
+
+
+class QuotaExceeded(Exception):
+    """Raised when the plan's daily request quota is used up"""
+    pass
+
+
+class TokenBucket:
+    """Thread-safe, per-process token bucket with a per-minute refill and a hard daily cap"""
+
+    def __init__(self, per_minute, per_day=None, clock=time.monotonic):
+        self.capacity = max(1, int(per_minute))
+        self.rate = self.capacity / 60.0  # tokens per second
+        self.per_day = per_day
+        self._clock = clock
+        self._tokens = float(self.capacity)
+        self._updated = clock()
+        self._day = datetime.utcnow().date()
+        self._used_today = 0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a token is available; raises QuotaExceeded once the daily cap is hit"""
+        while True:
+            with self._lock:
+                today = datetime.utcnow().date()
+                if today != self._day:
+                    self._day, self._used_today = today, 0
+                if self.per_day and self._used_today >= self.per_day:
+                    raise QuotaExceeded(f"Daily quota of {self.per_day} requests used")
+
+                now = self._clock()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    self._used_today += 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+    @property
+    def remaining_today(self):
+        with self._lock:
+            return None if not self.per_day else max(0, self.per_day - self._used_today)
+
+
+class RedisTokenBucket:
+    """Token bucket and daily count shared by every process through Redis"""
+
+    # KEYS: bucket hash, today's counter. ARGV: capacity, tokens per second, daily cap (0 = none).
+    # Returns 0 when a token was taken, -1 when the daily cap is used up, else ms to wait.
+    ACQUIRE_SCRIPT = """
+    local capacity, rate, per_day = tonumber(ARGV[1]), tonumber(ARGV[2]), tonumber(ARGV[3])
+    if per_day > 0 and tonumber(redis.call('GET', KEYS[2]) or '0') >= per_day then
+        return -1
+    end
+    local clock = redis.call('TIME')
+    local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+    local state = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+    local tokens = tonumber(state[1]) or capacity
+    local updated = tonumber(state[2]) or now
+    tokens = math.min(capacity, tokens + math.max(0, now - updated) * rate)
+    if tokens < 1 then
+        redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'updated', tostring(now))
+        return math.ceil((1 - tokens) / rate * 1000)
+    end
+    redis.call('HSET', KEYS[1], 'tokens', tostring(tokens - 1), 'updated', tostring(now))
+    redis.call('EXPIRE', KEYS[1], 3600)
+    redis.call('INCR', KEYS[2])
+    redis.call('EXPIRE', KEYS[2], 172800)
+    return 0
+    """
+
+    def __init__(self, client, name, per_minute, per_day=None):
+        self.client = client
+        self.name = name
+        self.capacity = max(1, int(per_minute))
+        self.rate = self.capacity / 60.0
+        self.per_day = per_day
+        self._acquire = client.register_script(self.ACQUIRE_SCRIPT)
+
+    def _day_key(self):
+        return f'ratelimit:{self.name}:day:{datetime.utcnow().date().isoformat()}'
+
+    def acquire(self):
+        """Block until a token is available; raises QuotaExceeded once the daily cap is hit"""
+        while True:
+            wait_ms = int(self._acquire(keys=[f'ratelimit:{self.name}:bucket', self._day_key()],
+                                        args=[self.capacity, self.rate, self.per_day or 0]))
+            if wait_ms == 0:
+                return
+            if wait_ms < 0:
+                raise QuotaExceeded(f"Daily quota of {self.per_day} requests used")
+            time.sleep(wait_ms / 1000.0)
+
+    @property
+    def remaining_today(self):
+        if not self.per_day:
+            return None
+        return max(0, self.per_day - int(self.client.get(self._day_key()) or 0))
+
+
+def token_bucket(name, per_minute, per_day=None):
+    """Shared Redis bucket when Redis is configured, else a per-process one"""
+    client = get_redis()
+    if client:
+        return RedisTokenBucket(client, name, per_minute, per_day)
+    return TokenBucket(per_minute, per_day)
+
+
+class FetchScheduler:
+    """Priority queue of request callables drained by a rate-limited worker pool"""
+
+    def __init__(self, per_minute, per_day=None, max_workers=4, name='api-sports'):
+        self.bucket = token_bucket(name, per_minute, per_day)
+        self.max_workers = max_workers
+        self._queue = []
+        self._counter = itertools.count()  # FIFO within a priority
+        self._cond = threading.Condition()
+        self._workers = []
+
+    def submit(self, priority, fn, *args, **kwargs):
+        """Queue fn(*args, **kwargs); returns a Future with its result"""
+        future = Future()
+        with self._cond:
+            heapq.heappush(self._queue, (priority, next(self._counter), future, fn, args, kwargs))
+            self._ensure_workers()
+            self._cond.notify()
+        return future
+
+    def run_all(self, calls):
+        """
+        Run [(priority, fn, args), ...] concurrently and wait for all of them
+
+        Returns:
+            Results in the same order as calls (an exception is returned in
+            place of the result for calls that failed)
+        """
+        futures = [self.submit(priority, fn, *args) for priority, fn, args in calls]
+        results = []
+        for future in futures:
+            try:
+                results.append(future.result())
+            except Exception as e:
+                results.append(e)
+        return results
+
+    def _ensure_workers(self):
+        while len(self._workers) < self.max_workers:
+            worker = threading.Thread(target=self._work, name=f'fetch-worker-{len(self._workers)}', daemon=True)
+            worker.start()
+            self._workers.append(worker)
+
+    def _work(self):
+        while True:
+            with self._cond:
+                while not self._queue:
+                    self._cond.wait()
+                priority, _, future, fn, args, kwargs = heapq.heappop(self._queue)
+
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                self.bucket.acquire()
+                future.set_result(fn(*args, **kwargs))
+            except Exception as e:
+                future.set_exception(e)
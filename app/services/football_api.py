@@ -7,6 +7,8 @@ from typing import List, Dict, Optional
 from datetime import datetime
 import logging
 
+from app.services.http_cache import api_cache
+
 logger = logging.getLogger(__name__)
 
 
@@ -27,12 +29,14 @@ class FootballAPIService:
             'x-apisports-key': self.api_key
         }
     
-    def get_live_matches(self, league_id: Optional[int] = None) -> List[Dict]:
+    def get_live_matches(self, league_id: Optional[int] = None, league_ids: List[int] = None) -> List[Dict]:
         """
         Get currently live matches
         
         Args:
             league_id: Optional league ID to filter by
+            league_ids: Optional league IDs to keep; filtered locally so every
+                league still costs a single request
             
         Returns:
             List of live match dictionaries
@@ -44,13 +48,14 @@ class FootballAPIService:
             if league_id:
                 params['league'] = league_id
             
-            response = requests.get(endpoint, headers=self.headers, params=params, timeout=10)
-            response.raise_for_status()
-            
-            data = response.json()
+            data = api_cache.get_json(endpoint, headers=self.headers, params=params, timeout=10)
             if data.get('response'):
                 logger.info(f"Fetched {len(data['response'])} live matches")
-                return self._parse_fixtures(data['response'])
+                matches = self._parse_fixtures(data['response'])
+                if league_ids:
+                    wanted = set(league_ids)
+                    matches = [m for m in matches if m['league_id'] in wanted]
+                return matches
             return []
             
         except requests.RequestException as e:
@@ -83,18 +88,12 @@ class FootballAPIService:
                 # Fetch for each league separately to ensure we get matches
                 for league_id in league_ids:
                     params['league'] = league_id
-                    response = requests.get(endpoint, headers=self.headers, params=params, timeout=10)
-                    response.raise_for_status()
-                    
-                    data = response.json()
+                    data = api_cache.get_json(endpoint, headers=self.headers, params=params, timeout=10)
                     if data.get('response'):
                         all_matches.extend(data['response'])
             else:
                 # Fetch all matches for the date
-                response = requests.get(endpoint, headers=self.headers, params=params, timeout=10)
-                response.raise_for_status()
-                
-                data = response.json()
+                data = api_cache.get_json(endpoint, headers=self.headers, params=params, timeout=10)
                 if data.get('response'):
                     all_matches = data['response']
             
@@ -123,10 +122,7 @@ class FootballAPIService:
                 'bookmaker': bookmaker_id
             }
             
-            response = requests.get(endpoint, headers=self.headers, params=params, timeout=10)
-            response.raise_for_status()
-            
-            data = response.json()
+            data = api_cache.get_json(endpoint, headers=self.headers, params=params, timeout=10)
             if data.get('response') and len(data['response']) > 0:
                 return self._parse_odds(data['response'][0])
             return {}
@@ -152,10 +148,7 @@ class FootballAPIService:
             if country:
                 params['country'] = country
             
-            response = requests.get(endpoint, headers=self.headers, params=params, timeout=10)
-            response.raise_for_status()
-            
-            data = response.json()
+            data = api_cache.get_json(endpoint, headers=self.headers, params=params, timeout=10)
             if data.get('response'):
                 return [{
                     'id': league['league']['id'],
@@ -171,29 +164,33 @@ class FootballAPIService:
             return []
     
     def _parse_fixtures(self, fixtures: List[Dict]) -> List[Dict]:
-        """Parse API fixtures into our format"""
+        """Parse API fixtures into our format (normalized by the ingestion adapter)"""
+        from app.services.ingestion import normalize_fixture
         parsed = []
         
         for fixture in fixtures:
             try:
-                parsed.append({
-                    'api_id': fixture['fixture']['id'],
-                    'league': fixture['league']['name'],
-                    'league_id': fixture['league']['id'],
-                    'home_team': fixture['teams']['home']['name'],
-                    'away_team': fixture['teams']['away']['name'],
-                    'home_logo': fixture['teams']['home']['logo'],
-                    'away_logo': fixture['teams']['away']['logo'],
-                    'kick_off': fixture['fixture']['date'],
-                    'status': fixture['fixture']['status']['short'],
-                    'elapsed': fixture['fixture']['status']['elapsed'],
-                    'home_score': fixture['goals']['home'],
-                    'away_score': fixture['goals']['away'],
-                    'venue': fixture['fixture']['venue']['name'] if fixture['fixture']['venue'] else None
-                })
-            except (KeyError, TypeError) as e:
+                record = normalize_fixture(fixture)
+            except (KeyError, TypeError, ValueError) as e:
                 logger.warning(f"Error parsing fixture: {e}")
                 continue
+            if not record:
+                continue
+            parsed.append({
+                'api_id': record['fixture_id'],
+                'league': record['league'],
+                'league_id': record['league_id'],
+                'home_team': record['home_team'],
+                'away_team': record['away_team'],
+                'home_logo': record['home_logo'],
+                'away_logo': record['away_logo'],
+                'kick_off': record['kick_off'].isoformat(),
+                'status': record['status_code'],
+                'elapsed': record['elapsed'],
+                'home_score': record['home_score'],
+                'away_score': record['away_score'],
+                'venue': record['venue']
+            })
         
         return parsed
     
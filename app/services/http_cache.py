@@ -0,0 +1,241 @@
+"""
+API Response Cache - shared on-disk cache for the sports API clients
+Responses are keyed by URL + params and kept for a per-endpoint TTL
+(leagues for a day, fixtures for minutes, live data for seconds). Stale
+entries are revalidated with If-None-Match / If-Modified-Since when the
+provider sent an ETag or Last-Modified, so a 304 costs no payload.
+The directory is pruned as it's written: entries untouched for MAX_AGE go,
+then the least recently used beyond MAX_ENTRIES.
+
+Modes (API_CACHE_MODE):
+    normal  - serve fresh entries, fetch and store the rest (default)
+    record  - always hit the network and store every response
+    replay  - serve only from disk, never touch the network
+    off     - bypass the cache entirely
+"""
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from urllib.parse import urlparse
+
+import requests
+
+from app.services.http_client import http_client
+
+logger = logging.getLogger(__name__)
+
+
+class CacheMiss(requests.exceptions.RequestException):
+    """No recorded response for a request in replay mode"""
+    pass
+
+
+class ResponseCache:
+    """Disk-backed JSON response cache with per-endpoint TTLs"""
+
+    MODES = ('normal', 'record', 'replay', 'off')
+
+    # Seconds a response stays fresh, by the last path segment of the URL
+    ENDPOINT_TTLS = {
+        'leagues': 86400,
+        'teams': 86400,
+        'seasons': 86400,
+        'countries': 86400,
+        'fixtures': 300,
+        'games': 300,
+        'odds': 600,
+    }
+    # Any request with live=... or ids=...: well under the 15s poll tick, so each
+    # tick refetches (or revalidates) and only callers within the same tick share
+    LIVE_TTL = 5
+    DEFAULT_TTL = 60
+
+    MAX_AGE = 2 * 86400  # seconds since last use before an entry is pruned
+    MAX_ENTRIES = 5000  # least recently used entries beyond this are pruned
+    PRUNE_INTERVAL = 600  # seconds between prunes per process
+
+    def __init__(self, cache_dir=None, mode=None):
+        self.cache_dir = cache_dir or os.environ.get('API_CACHE_DIR') or os.path.join(
+            tempfile.gettempdir(), 'abkbet_api_cache'
+        )
+        self.mode = mode or os.environ.get('API_CACHE_MODE', 'normal')
+        if self.mode not in self.MODES:
+            logger.warning(f"[APICache] Unknown mode '{self.mode}', using 'normal'")
+            self.mode = 'normal'
+        self.hits = 0
+        self.misses = 0
+        self.revalidated = 0
+        self.pruned = 0
+        self._lock = threading.Lock()
+        self._last_prune = 0.0
+
+    def ttl_for(self, url, params=None):
+        """Freshness lifetime for a request"""
+        # Live feeds and ?ids= lookups (used to refresh tracked fixtures) go stale fast
+        if params and ('live' in params or 'ids' in params):
+            return self.LIVE_TTL
+        endpoint = urlparse(url).path.rstrip('/').rsplit('/', 1)[-1]
+        return self.ENDPOINT_TTLS.get(endpoint, self.DEFAULT_TTL)
+
+    def key_for(self, url, params=None):
+        """Stable cache key for URL + params (param order does not matter)"""
+        normalized = json.dumps([url, sorted((str(k), str(v)) for k, v in (params or {}).items())])
+        return hashlib.sha256(normalized.encode()).hexdigest()
+
+    def is_fresh(self, url, params=None):
+        """True when get_json would answer from disk without touching the network"""
+        if self.mode in ('off', 'record'):
+            return False
+        entry = self._load(self._path(url, params))
+        if entry is None:
+            return False
+        return self.mode == 'replay' or time.time() - entry['stored_at'] < self.ttl_for(url, params)
+
+    def get_json(self, url, headers=None, params=None, timeout=15):
+        """
+        GET url and return the decoded JSON body, via the cache
+
+        Raises:
+            requests.exceptions.RequestException on network/HTTP errors
+            (CacheMiss in replay mode when nothing was recorded)
+        """
+        if self.mode == 'off':
+            response = http_client.get(url, headers=headers, params=params, timeout=timeout)
+            response.raise_for_status()
+            return response.json()
+
+        path = self._path(url, params)
+        entry = self._load(path)
+
+        if self.mode == 'replay':
+            if entry is None:
+                raise CacheMiss(f"No recorded response for {url} {params}")
+            self._count('hits')
+            return entry['body']
+
+        if self.mode == 'normal' and entry and time.time() - entry['stored_at'] < self.ttl_for(url, params):
+            self._count('hits')
+            self._touch(path)
+            return entry['body']
+
+        # Stale (or recording): revalidate when the provider gave us validators
+        request_headers = dict(headers or {})
+        if entry and self.mode == 'normal':
+            if entry.get('etag'):
+                request_headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                request_headers['If-Modified-Since'] = entry['last_modified']
+
+        # Freshness counts from when the request went out, not when the answer arrived
+        requested_at = time.time()
+        response = http_client.get(url, headers=request_headers, params=params, timeout=timeout)
+        if response.status_code == 304 and entry:
+            self._count('revalidated')
+            entry['stored_at'] = requested_at
+            self._store(path, entry)
+            return entry['body']
+
+        response.raise_for_status()
+        body = response.json()
+        self._count('misses')
+
+        # Provider-side errors (e.g. rate limits) come back as 200 - never cache those
+        if not (isinstance(body, dict) and body.get('errors')):
+            self._store(path, {
+                'url': url,
+                'params': params,
+                'stored_at': requested_at,
+                'etag': response.headers.get('ETag'),
+                'last_modified': response.headers.get('Last-Modified'),
+                'body': body
+            })
+        return body
+
+    def clear(self):
+        """Remove every cached response"""
+        if not os.path.isdir(self.cache_dir):
+            return
+        for name in os.listdir(self.cache_dir):
+            if name.endswith('.json'):
+                os.remove(os.path.join(self.cache_dir, name))
+
+    def prune(self, now=None):
+        """
+        Remove entries unused for MAX_AGE, then the least recently used
+        beyond MAX_ENTRIES (file mtime is the last use); returns entries removed
+        """
+        now = now or time.time()
+        try:
+            names = [name for name in os.listdir(self.cache_dir) if name.endswith('.json')]
+        except OSError:
+            return 0
+
+        entries = []
+        for name in names:
+            try:
+                entries.append((os.path.getmtime(os.path.join(self.cache_dir, name)), name))
+            except OSError:
+                continue  # removed by another process
+        entries.sort(reverse=True)
+        doomed = [name for i, (used, name) in enumerate(entries)
+                  if i >= self.MAX_ENTRIES or now - used > self.MAX_AGE]
+
+        removed = 0
+        for name in doomed:
+            try:
+                os.remove(os.path.join(self.cache_dir, name))
+                removed += 1
+            except OSError:
+                pass
+        if removed:
+            self._count('pruned', removed)
+            logger.info(f"[APICache] Pruned {removed} cached responses")
+        return removed
+
+    def stats(self):
+        return {'mode': self.mode, 'hits': self.hits, 'misses': self.misses,
+                'revalidated': self.revalidated, 'pruned': self.pruned}
+
+    def _path(self, url, params):
+        return os.path.join(self.cache_dir, f'{self.key_for(url, params)}.json')
+
+    def _load(self, path):
+        try:
+            with open(path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _store(self, path, entry):
+        # Write to a temp file and rename so concurrent readers never see a partial entry
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+            with os.fdopen(fd, 'w') as f:
+                json.dump(entry, f)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"[APICache] Could not store response: {e}")
+            return
+        # Recorded fixtures are kept; the live cache is pruned every PRUNE_INTERVAL
+        if self.mode == 'normal' and time.time() - self._last_prune >= self.PRUNE_INTERVAL:
+            self._last_prune = time.time()
+            self.prune()
+
+    def _touch(self, path):
+        """Mark an entry as used so LRU pruning keeps it"""
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+    def _count(self, counter, amount=1):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + amount)
+
+
+api_cache = ResponseCache()
@@ -0,0 +1,225 @@
+"""
+Outbound HTTP Client - one pooled, resilient layer for every external call
+Each upstream host gets its own keep-alive connection pool, idempotent
+requests are retried a bounded number of times with jittered exponential
+backoff, and a per-host circuit breaker fails fast while a provider is
+down instead of tying up workers on timeouts. Per-host request, error and
+latency counters are kept for monitoring (see stats()).
+"""
+import logging
+import math
+import random
+import threading
+import time
+from collections import deque
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitOpenError(requests.exceptions.ConnectionError):
+    """Raised without a network call while a host's circuit is open"""
+    pass
+
+
+class CircuitBreaker:
+    """Consecutive-failure breaker: closed -> open -> half-open (one trial) -> closed"""
+
+    def __init__(self, failure_threshold=5, reset_timeout=30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self._trial_running = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        if self.opened_at is None:
+            return 'closed'
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return 'half-open'
+        return 'open'
+
+    def allow(self):
+        """Whether a request may go out now (half-open lets a single trial through)"""
+        with self._lock:
+            state = self.state
+            if state == 'closed':
+                return True
+            if state == 'half-open' and not self._trial_running:
+                self._trial_running = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._trial_running = False
+
+    def release(self):
+        """End a half-open trial that produced no verdict (e.g. the caller's own error)"""
+        with self._lock:
+            self._trial_running = False
+
+    def record_failure(self):
+        """Returns True when this failure (re)opened the circuit"""
+        with self._lock:
+            self.failures += 1
+            reopened = self._trial_running or (
+                self.opened_at is None and self.failures >= self.failure_threshold
+            )
+            if reopened:
+                self.opened_at = time.monotonic()
+            self._trial_running = False
+            return reopened
+
+
+class HostStats:
+    """Request, error and latency counters for one host (updated under the host breaker's lock)"""
+
+    LATENCY_WINDOW = 200  # recent samples kept for percentiles
+
+    def __init__(self, lock=None):
+        self.requests = 0
+        self.errors = 0
+        self.retries = 0
+        self.rejected = 0  # failed fast by the open circuit
+        self.latencies = deque(maxlen=self.LATENCY_WINDOW)
+        self._lock = lock or threading.Lock()
+
+    def count(self, counter=None, latency=None):
+        """Bump a counter and/or record a latency sample"""
+        with self._lock:
+            if counter:
+                setattr(self, counter, getattr(self, counter) + 1)
+            if latency is not None:
+                self.latencies.append(latency)
+
+    def to_dict(self):
+        with self._lock:
+            samples = sorted(self.latencies)
+            counts = {'requests': self.requests, 'errors': self.errors,
+                      'retries': self.retries, 'rejected': self.rejected}
+        latency = {'avg': None, 'p95': None, 'max': None}
+        if samples:
+            latency = {
+                'avg': round(sum(samples) / len(samples) * 1000, 1),
+                'p95': round(samples[max(0, math.ceil(len(samples) * 0.95) - 1)] * 1000, 1),
+                'max': round(samples[-1] * 1000, 1)
+            }
+        return dict(counts, latency_ms=latency)
+
+
+class HttpClient:
+    """Pooled sessions, retries with jittered backoff and a circuit breaker per host"""
+
+    POOL_SIZE = 10
+    MAX_RETRIES = 2
+    BACKOFF_BASE = 0.5  # seconds; attempt n waits up to BACKOFF_BASE * 2**n
+    CONNECT_TIMEOUT = 3.05
+    RETRY_STATUSES = (429, 500, 502, 503, 504)
+    RETRY_METHODS = ('GET', 'HEAD')  # never replay a POST that may have landed
+
+    def __init__(self):
+        self._sessions = {}
+        self._breakers = {}
+        self._stats = {}
+        self._lock = threading.Lock()
+
+    def get(self, url, **kwargs):
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request('POST', url, **kwargs)
+
+    def request(self, method, url, timeout=10, **kwargs):
+        """
+        Send a request through the host's pool
+
+        Returns:
+            requests.Response (callers still call raise_for_status())
+
+        Raises:
+            CircuitOpenError while the host's circuit is open, otherwise the
+            usual requests exceptions once retries are exhausted
+        """
+        host = urlparse(url).netloc
+        session, breaker, stats = self._host(host)
+        retries = self.MAX_RETRIES if method.upper() in self.RETRY_METHODS else 0
+
+        # A short connect timeout stops a dead host from holding a worker for the full read timeout
+        if isinstance(timeout, (int, float)):
+            timeout = (min(self.CONNECT_TIMEOUT, timeout), timeout)
+
+        for attempt in range(retries + 1):
+            if not breaker.allow():
+                stats.count('rejected')
+                raise CircuitOpenError(f"Circuit open for {host}, failing fast")
+
+            stats.count('requests')
+            started = time.monotonic()
+            try:
+                response = session.request(method, url, timeout=timeout, **kwargs)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                stats.count(latency=time.monotonic() - started)
+                self._record_failure(host, breaker, stats)
+                if attempt == retries:
+                    raise
+                logger.warning(f"[HTTP] {method} {host} failed ({e.__class__.__name__}), retrying")
+            except requests.exceptions.RequestException:
+                # Not worth retrying (e.g. a broken chunked body or too many redirects),
+                # but it still settles a half-open trial
+                stats.count(latency=time.monotonic() - started)
+                self._record_failure(host, breaker, stats)
+                raise
+            except BaseException:
+                # Not the host's fault; free the trial slot so the circuit can still close
+                breaker.release()
+                raise
+            else:
+                stats.count(latency=time.monotonic() - started)
+                if response.status_code not in self.RETRY_STATUSES:
+                    breaker.record_success()
+                    return response
+                self._record_failure(host, breaker, stats)
+                if attempt == retries:
+                    return response
+                logger.warning(f"[HTTP] {method} {host} returned {response.status_code}, retrying")
+
+            stats.count('retries')
+            # Full jitter keeps clients from retrying in lockstep
+            time.sleep(random.uniform(0, self.BACKOFF_BASE * 2 ** attempt))
+
+    def stats(self):
+        """Per-host counters and circuit state"""
+        with self._lock:
+            hosts = list(self._stats)
+        return {
+            host: dict(self._stats[host].to_dict(), circuit=self._breakers[host].state)
+            for host in hosts
+        }
+
+    def _host(self, host):
+        with self._lock:
+            if host not in self._sessions:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.POOL_SIZE)
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                self._sessions[host] = session
+                breaker = self._breakers[host] = CircuitBreaker()
+                self._stats[host] = HostStats(breaker._lock)
+            return self._sessions[host], self._breakers[host], self._stats[host]
+
+    def _record_failure(self, host, breaker, stats):
+        stats.count('errors')
+        if breaker.record_failure():
+            logger.error(f"[HTTP] Circuit opened for {host} after {breaker.failures} failures")
+
+
+http_client = HttpClient()
@@ -0,0 +1,672 @@
+"""
+Fixture Ingestion Pipeline - provider adapters -> normalized records -> one writer
+Every cycle fetches each upstream payload once (through the shared
+scheduler, response cache and HTTP client), normalizes it into one fixture
+or odds record shape, and fans the records out to every consumer table (matches
+for the sportsbook, game_picks for the ticket picks). All fixture parsing
+and writing for football lives here; the older per-table clients delegate
+to it.
+"""
+import json
+import logging
+import random
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import select, update, bindparam
+
+from app.extensions import db
+from app.models import Match, MatchStatus
+from app.models.game_pick import GamePick
+from app.services.fetch_scheduler import PRIORITY_LIVE, PRIORITY_TODAY, PRIORITY_FUTURE
+from app.services.football_api import POPULAR_LEAGUES
+from app.services.match_upsert import upsert_matches
+from app.services.poll_scheduler import poll_scheduler, odds_scheduler
+
+logger = logging.getLogger(__name__)
+
+# API-Sports short status -> matches.status
+STATUS_MAP = {
+    'TBD': MatchStatus.SCHEDULED.value,
+    'NS': MatchStatus.SCHEDULED.value,
+    '1H': MatchStatus.LIVE.value,
+    'HT': MatchStatus.LIVE.value,
+    '2H': MatchStatus.LIVE.value,
+    'ET': MatchStatus.LIVE.value,
+    'BT': MatchStatus.LIVE.value,
+    'P': MatchStatus.LIVE.value,
+    'LIVE': MatchStatus.LIVE.value,
+    'FT': MatchStatus.FINISHED.value,
+    'AET': MatchStatus.FINISHED.value,
+    'PEN': MatchStatus.FINISHED.value,
+    'AWD': MatchStatus.FINISHED.value,
+    'WO': MatchStatus.FINISHED.value,
+    'PST': MatchStatus.CANCELLED.value,
+    'CANC': MatchStatus.CANCELLED.value,
+    'ABD': MatchStatus.CANCELLED.value
+}
+GAME_PICK_LIVE_CODES = ('NS', '1H', 'HT', '2H', 'ET', 'BT', 'P', 'LIVE')
+
+# API-Sports bet name -> {value label: matches column}
+ODDS_MARKETS = {
+    'Match Winner': {'Home': 'home_odds', 'Draw': 'draw_odds', 'Away': 'away_odds'},
+    'Double Chance': {'Home/Draw': 'home_draw_odds', 'Home/Away': 'home_away_odds', 'Draw/Away': 'draw_away_odds'},
+    'Both Teams Score': {'Yes': 'gg_odds', 'No': 'ng_odds'},
+    'Goals Over/Under': {
+        'Over 1.5': 'over15_odds', 'Under 1.5': 'under15_odds',
+        'Over 2.5': 'over25_odds', 'Under 2.5': 'under25_odds',
+        'Over 3.5': 'over35_odds', 'Under 3.5': 'under35_odds'
+    }
+}
+# matches column -> game_picks column
+PICK_ODDS_COLUMNS = {
+    'home_odds': 'odds_home', 'draw_odds': 'odds_draw', 'away_odds': 'odds_away',
+    'home_draw_odds': 'odds_home_or_draw', 'home_away_odds': 'odds_home_or_away',
+    'draw_away_odds': 'odds_away_or_draw',
+    'gg_odds': 'odds_btts_yes', 'ng_odds': 'odds_btts_no',
+    'over15_odds': 'odds_over_1_5', 'under15_odds': 'odds_under_1_5',
+    'over25_odds': 'odds_over_2_5', 'under25_odds': 'odds_under_2_5',
+    'over35_odds': 'odds_over_3_5', 'under35_odds': 'odds_under_3_5'
+}
+
+
+def _parse_kick_off(value):
+    """ISO timestamp from the API -> naive UTC datetime"""
+    if not value:
+        return datetime.utcnow()
+    parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    if parsed.tzinfo:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+def normalize_fixture(fixture):
+    """
+    API-Sports football fixture -> normalized fixture record
+
+    Returns:
+        dict with fixture_id, league/teams, kick_off (naive UTC), status_code
+        (provider code), status (matches.status), elapsed and scores; None if
+        the payload has no fixture id
+    """
+    info = fixture.get('fixture') or {}
+    fixture_id = info.get('id')
+    if not fixture_id:
+        return None
+
+    league = fixture.get('league') or {}
+    teams = fixture.get('teams') or {}
+    goals = fixture.get('goals') or {}
+    status = info.get('status') or {}
+    status_code = status.get('short', 'NS')
+
+    return {
+        'fixture_id': fixture_id,
+        'sport': 'Football',
+        'league': league.get('name', 'Unknown League'),
+        'league_id': league.get('id'),
+        'country': league.get('country', ''),
+        'home_team': (teams.get('home') or {}).get('name', 'Unknown'),
+        'away_team': (teams.get('away') or {}).get('name', 'Unknown'),
+        'home_logo': (teams.get('home') or {}).get('logo'),
+        'away_logo': (teams.get('away') or {}).get('logo'),
+        'kick_off': _parse_kick_off(info.get('date')),
+        'status_code': status_code,
+        'status': STATUS_MAP.get(status_code, MatchStatus.SCHEDULED.value),
+        'elapsed': status.get('elapsed'),
+        'home_score': goals.get('home'),
+        'away_score': goals.get('away'),
+        'venue': (info.get('venue') or {}).get('name')
+    }
+
+
+def normalize_odds(item, bookmaker_id=None):
+    """
+    API-Sports odds entry -> normalized odds record
+
+    Returns:
+        dict with fixture_id, prices ({matches column: odd}), correct_score
+        ({'1-0': odd}) and htft ({'Home/Draw': odd}) from the requested
+        bookmaker (else the first listed); None without a fixture id or prices
+    """
+    fixture_id = (item.get('fixture') or {}).get('id')
+    bookmakers = item.get('bookmakers') or []
+    if not fixture_id or not bookmakers:
+        return None
+    bookmaker = next((b for b in bookmakers if b.get('id') == bookmaker_id), bookmakers[0])
+
+    record = {'fixture_id': fixture_id, 'prices': {}, 'correct_score': {}, 'htft': {}}
+    for bet in bookmaker.get('bets') or []:
+        name = bet.get('name')
+        for value in bet.get('values') or []:
+            try:
+                odd = float(value['odd'])
+            except (KeyError, TypeError, ValueError):
+                continue
+            label = str(value.get('value'))
+            if name in ODDS_MARKETS and label in ODDS_MARKETS[name]:
+                record['prices'][ODDS_MARKETS[name][label]] = odd
+            elif name == 'Exact Score':
+                record['correct_score'][label.replace(':', '-')] = odd
+            elif name == 'HT/FT Double':
+                record['htft'][label] = odd
+    if not (record['prices'] or record['correct_score'] or record['htft']):
+        return None
+    return record
+
+
+class ApiSportsAdapter:
+    """Provider adapter for API-Sports football, on top of MultiSportAPIService's transport"""
+
+    name = 'api-sports'
+    IDS_PER_REQUEST = 20  # api-sports limit for ?ids=
+    ODDS_BOOKMAKER = 8  # Bet365
+    ODDS_PAGES_PER_BATCH = 20  # odds pages in flight (and in memory) at once
+
+    def __init__(self, api=None):
+        if api is None:
+            from app.services.multi_sport_api_service import multi_sport_api
+            api = multi_sport_api
+        self.api = api
+
+    def initialize(self, api_key, **kwargs):
+        self.api.initialize(api_key, **kwargs)
+
+    def fetch(self, requests_list, endpoint='fixtures', envelope=False):
+        """
+        Fetch [(priority, params), ...] from an endpoint; identical requests
+        in one call are sent once
+
+        Returns:
+            Payload lists (whole bodies with envelope=True) in request order,
+            None for failed requests
+        """
+        unique = {}
+        for priority, params in requests_list:
+            key = tuple(sorted(params.items()))
+            unique[key] = min(priority, unique.get(key, (priority,))[0]), params
+        keys = list(unique)
+        responses = self.api._request_many([
+            (unique[key][0], 'football', endpoint, unique[key][1]) for key in keys
+        ], envelope=envelope)
+        by_key = dict(zip(keys, responses))
+        return [by_key[tuple(sorted(params.items()))] for _, params in requests_list]
+
+    def fixtures_for_dates(self, dates):
+        """{date: [raw fixtures]} with today's date fetched first"""
+        today = datetime.utcnow().strftime('%Y-%m-%d')
+        responses = self.fetch([
+            (PRIORITY_TODAY if date == today else PRIORITY_FUTURE, {'date': date}) for date in dates
+        ])
+        return {date: response or [] for date, response in zip(dates, responses)}
+
+    def live_fixtures(self, extra_ids=()):
+        """All in-play fixtures (one live=all call) plus extra_ids missing from it, in id batches"""
+        live = self.fetch([(PRIORITY_LIVE, {'live': 'all'})])[0] or []
+        seen = {(f.get('fixture') or {}).get('id') for f in live}
+        missing = [fid for fid in dict.fromkeys(extra_ids) if fid not in seen]
+        live.extend(self.fixtures_for_ids(missing))
+        logger.info(f"[Ingestion] Live: {len(live)} fixtures in "
+                    f"{1 + -(-len(missing) // self.IDS_PER_REQUEST)} requests")
+        return live
+
+    def id_requests(self, fixture_ids, priority=PRIORITY_LIVE):
+        """?ids= requests covering fixture_ids, IDS_PER_REQUEST per call"""
+        fixture_ids = list(dict.fromkeys(fixture_ids))
+        return [
+            (priority, {'ids': '-'.join(str(fid) for fid in fixture_ids[i:i + self.IDS_PER_REQUEST])})
+            for i in range(0, len(fixture_ids), self.IDS_PER_REQUEST)
+        ]
+
+    def fixtures_for_ids(self, fixture_ids, priority=PRIORITY_LIVE):
+        """Raw fixtures for the given ids, in id batches"""
+        fixtures = []
+        for response in self.fetch(self.id_requests(fixture_ids, priority)):
+            fixtures.extend(response or [])
+        return fixtures
+
+    def odds_pages(self, dates, bookmaker_id=ODDS_BOOKMAKER):
+        """
+        Yield raw odds entries page by page for every date. Page 1 of each
+        date goes out first and carries the page count; the remaining pages
+        follow in scheduled batches, so only a batch of pages is held at once.
+        """
+        today = datetime.utcnow().strftime('%Y-%m-%d')
+
+        def request(date, page):
+            priority = PRIORITY_TODAY if date == today else PRIORITY_FUTURE
+            return priority, {'date': date, 'bookmaker': bookmaker_id, 'page': page}
+
+        remaining = []
+        for date, body in zip(dates, self.fetch([request(date, 1) for date in dates], 'odds', envelope=True)):
+            if not body:
+                continue
+            yield body.get('response') or []
+            pages = (body.get('paging') or {}).get('total') or 1
+            remaining.extend(request(date, page) for page in range(2, pages + 1))
+
+        for start in range(0, len(remaining), self.ODDS_PAGES_PER_BATCH):
+            for body in self.fetch(remaining[start:start + self.ODDS_PAGES_PER_BATCH], 'odds', envelope=True):
+                if body:
+                    yield body.get('response') or []
+
+    def normalize_odds(self, entries, bookmaker_id=ODDS_BOOKMAKER):
+        """Raw odds entries -> {fixture_id: odds record}"""
+        records = {}
+        for entry in entries:
+            try:
+                record = normalize_odds(entry, bookmaker_id)
+            except (TypeError, AttributeError) as e:
+                logger.warning(f"[Ingestion] Skipping malformed odds entry: {e}")
+                continue
+            if record:
+                records[record['fixture_id']] = record
+        return records
+
+    def normalize(self, fixtures):
+        """Raw fixtures -> {fixture_id: record}"""
+        records = {}
+        for fixture in fixtures:
+            try:
+                record = normalize_fixture(fixture)
+            except (TypeError, ValueError, AttributeError) as e:
+                logger.warning(f"[Ingestion] Skipping malformed fixture: {e}")
+                continue
+            if record:
+                records[record['fixture_id']] = record
+        return records
+
+
+class FixtureWriter:
+    """The one place fixture records are written, for every consumer table"""
+
+    ODDS_BATCH_SIZE = 500
+
+    # Columns a re-sync may overwrite on an existing match; odds are insert-only
+    MATCH_SYNC_FIELDS = ('home_team', 'away_team', 'league', 'match_date', 'status', 'home_score', 'away_score')
+
+    def __init__(self, pick_leagues=None):
+        self.pick_leagues = set(pick_leagues or POPULAR_LEAGUES.values())
+
+    def write_matches(self, records):
+        """Upsert scheduled fixtures into matches; returns (created, updated)"""
+        rows = [dict(self._match_columns(record), **self.generated_odds()) for record in records]
+        return upsert_matches(rows, self.MATCH_SYNC_FIELDS)
+
+    def write_game_picks(self, records):
+        """Add popular-league fixtures as game picks and refresh existing ones; returns (created, updated)"""
+        records = [r for r in records if r['league_id'] in self.pick_leagues]
+        if not records:
+            return 0, 0
+        existing = {
+            pick.api_fixture_id: pick
+            for pick in GamePick.query.filter(GamePick.api_fixture_id.in_([r['fixture_id'] for r in records]))
+        }
+        created = updated = 0
+        for record in records:
+            pick = existing.get(record['fixture_id'])
+            if pick is None:
+                db.session.add(GamePick(
+                    match_name=f"{record['home_team']} vs {record['away_team']}",
+                    league=record['league'],
+                    api_fixture_id=record['fixture_id'],
+                    api_league_id=record['league_id'],
+                    home_team=record['home_team'],
+                    away_team=record['away_team'],
+                    kick_off_time=record['kick_off'],
+                    **self._pick_live_columns(record)
+                ))
+                created += 1
+            elif self._apply(pick, self._pick_live_columns(record)):
+                updated += 1
+        return created, updated
+
+    def write_live(self, records):
+        """
+        Diff live records against tracked matches and game picks in memory;
+        only rows whose score, minute or status changed are written
+
+        Returns:
+            (changed matches, changed game picks) - lists of ORM rows
+        """
+        fixture_ids = list(records)
+        if not fixture_ids:
+            return [], []
+
+        changed_matches = []
+        for match in Match.query.filter(
+            Match.api_fixture_id.in_(fixture_ids),
+            Match.status.in_([MatchStatus.SCHEDULED.value, MatchStatus.LIVE.value])
+        ):
+            record = records[match.api_fixture_id]
+            values = {
+                'home_score': record['home_score'],
+                'away_score': record['away_score'],
+                'match_time': record['elapsed'] or match.match_time,
+                'status': record['status']
+            }
+            minute_reported = values['match_time'] != match.match_time
+            if self._apply(match, values):
+                match.updated_at = datetime.utcnow()
+                if minute_reported:
+                    match.match_time_at = match.updated_at
+                changed_matches.append(match)
+
+        changed_picks = [
+            pick for pick in GamePick.query.filter(
+                GamePick.api_fixture_id.in_(fixture_ids),
+                GamePick.status.in_(GAME_PICK_LIVE_CODES)
+            )
+            if self._apply(pick, self._pick_live_columns(records[pick.api_fixture_id]))
+        ]
+        return changed_matches, changed_picks
+
+    def write_odds(self, records):
+        """
+        Bulk-write bookmaker prices to open matches and game picks; rows whose
+        prices did not move are skipped
+
+        Returns:
+            ({match id: new prices}, {game pick id: new prices}) for changed rows
+        """
+        match_values, pick_values = {}, {}
+        for record in records:
+            values = dict(record['prices'])
+            if record['correct_score']:
+                values['correct_score_odds'] = json.dumps(record['correct_score'], sort_keys=True)
+            if record['htft']:
+                values['htft_odds'] = json.dumps(record['htft'], sort_keys=True)
+            match_values[record['fixture_id']] = values
+
+            picks = {PICK_ODDS_COLUMNS[col]: odd for col, odd in record['prices'].items()}
+            for score, odd in record['correct_score'].items():
+                picks[f"odds_{score.replace('-', '_')}"] = odd
+            for outcome, odd in record['htft'].items():
+                picks[f"odds_ht_ft_{outcome.replace('/', '_').lower()}"] = odd
+            pick_columns = GamePick.__table__.c
+            pick_values[record['fixture_id']] = {col: odd for col, odd in picks.items() if col in pick_columns}
+
+        open_matches = Match.__table__.c.status.in_([MatchStatus.SCHEDULED.value, MatchStatus.LIVE.value])
+        open_picks = GamePick.__table__.c.status.in_(GAME_PICK_LIVE_CODES)
+        return (
+            self._write_prices(Match.__table__, open_matches, match_values),
+            self._write_prices(GamePick.__table__, open_picks, pick_values)
+        )
+
+    def _write_prices(self, table, open_clause, values_by_fixture):
+        """Diff prices against stored rows in one select per batch, then one executemany per column set"""
+        values_by_fixture = {fid: values for fid, values in values_by_fixture.items() if values}
+        columns = sorted(set().union(*values_by_fixture.values())) if values_by_fixture else []
+        fixture_ids = list(values_by_fixture)
+        changed = {}
+        for start in range(0, len(fixture_ids), self.ODDS_BATCH_SIZE):
+            stored = db.session.execute(
+                select(table.c.id, table.c.api_fixture_id, *[table.c[col] for col in columns])
+                .where(table.c.api_fixture_id.in_(fixture_ids[start:start + self.ODDS_BATCH_SIZE]), open_clause)
+            ).mappings()
+            for row in stored:
+                values = values_by_fixture[row['api_fixture_id']]
+                if any(row[col] != odd for col, odd in values.items()):
+                    changed[row['id']] = values
+
+        # Rows priced by the same bookmaker share a column set, so this is usually one statement
+        groups = {}
+        for row_id, values in changed.items():
+            groups.setdefault(tuple(sorted(values)), []).append(dict(values, b_id=row_id))
+        for cols, rows in groups.items():
+            db.session.execute(
+                update(table).where(table.c.id == bindparam('b_id')).values({col: bindparam(col) for col in cols}),
+                rows
+            )
+        return changed
+
+    def _match_columns(self, record):
+        return {
+            'api_fixture_id': record['fixture_id'],
+            'home_team': record['home_team'],
+            'away_team': record['away_team'],
+            'league': record['league'],
+            'match_date': record['kick_off'],
+            'status': record['status'],
+            'home_score': record['home_score'],
+            'away_score': record['away_score'],
+            'is_manual': False
+        }
+
+    def _pick_live_columns(self, record):
+        return {
+            'home_score': record['home_score'],
+            'away_score': record['away_score'],
+            'status': record['status_code'],
+            'elapsed_time': record['elapsed']
+        }
+
+    def generated_odds(self):
+        # Placeholder prices for new fixtures until real odds are ingested
+        return {
+            'home_odds': round(random.uniform(1.5, 4.5), 2),
+            'draw_odds': round(random.uniform(2.8, 3.8), 2),
+            'away_odds': round(random.uniform(1.5, 4.5), 2),
+            'over25_odds': round(random.uniform(1.6, 2.2), 2),
+            'under25_odds': round(random.uniform(1.6, 2.2), 2),
+            'gg_odds': round(random.uniform(1.6, 2.2), 2),
+            'ng_odds': round(random.uniform(1.6, 2.2), 2)
+        }
+
+    @staticmethod
+    def _apply(row, values):
+        """Set only the values that differ; returns True if anything changed"""
+        diff = {k: v for k, v in values.items() if getattr(row, k) != v}
+        for field, value in diff.items():
+            setattr(row, field, value)
+        return bool(diff)
+
+
+class IngestionPipeline:
+    """Fetch once per cycle, normalize, fan out to every consumer"""
+
+    CONSUMERS = ('matches', 'game_picks')
+    MAX_NEW_PER_DAY = 15  # fixtures per date offered to consumers; popular leagues first
+
+    def __init__(self, adapter=None, writer=None, poller=None):
+        self.adapter = adapter or ApiSportsAdapter()
+        self.writer = writer or FixtureWriter()
+        self.poller = poller or poll_scheduler
+
+    def run_schedule(self, days_ahead=7, consumers=CONSUMERS, dates=None):
+        """
+        Sync upcoming fixtures for today + days_ahead - 1 days, or for the
+        given 'YYYY-MM-DD' dates
+
+        Returns:
+            {'fetched': n, 'matches': (created, updated), 'game_picks': (created, updated)}
+        """
+        from app.services.match_archive_service import archive_finished_matches
+
+        if dates is None:
+            dates = [(datetime.utcnow() + timedelta(days=offset)).strftime('%Y-%m-%d')
+                     for offset in range(days_ahead)]
+        records = {}
+        for date, fixtures in self.adapter.fixtures_for_dates(dates).items():
+            day = sorted(
+                self.adapter.normalize(fixtures).values(),
+                key=lambda r: (r['league_id'] not in self.writer.pick_leagues, r['kick_off'])
+            )
+            # A fixture listed under two dates is still one record
+            for record in day[:self.MAX_NEW_PER_DAY]:
+                records.setdefault(record['fixture_id'], record)
+        records = list(records.values())
+
+        summary = {'fetched': len(records)}
+        if not records:
+            return summary
+
+        # Old finished matches go to the archive before new ones are written
+        if 'matches' in consumers:
+            archive_finished_matches()
+        try:
+            if 'matches' in consumers:
+                summary['matches'] = self.writer.write_matches(records)
+            if 'game_picks' in consumers:
+                summary['game_picks'] = self.writer.write_game_picks(records)
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"[Ingestion] Schedule sync failed: {e}")
+            raise
+        logger.info(f"[Ingestion] Schedule: {summary}")
+        return summary
+
+    def run_tick(self, timestamp=None):
+        """
+        Poll only the tracked fixtures whose state-based interval is due, in
+        the fewest provider calls: one live=all call when anything in-play is
+        due, a date call for dates with more due fixtures than fit one ?ids=
+        call, id batches for the rest, and a final id batch for in-play
+        fixtures missing from the live feed (just finished)
+
+        Returns:
+            {'due': n, 'requests': n, 'fetched': n, 'matches': changed count, 'game_picks': changed count}
+        """
+        now = datetime.utcnow()
+        in_play, by_date = self.poller.plan(self._tracked_fixtures(), now, timestamp)
+        summary = {'due': len(in_play) + sum(len(ids) for ids in by_date.values()),
+                   'requests': 0, 'fetched': 0, 'matches': 0, 'game_picks': 0}
+        if not summary['due']:
+            return summary
+
+        today = now.strftime('%Y-%m-%d')
+        requests_list, by_id = [], []
+        if in_play:
+            requests_list.append((PRIORITY_LIVE, {'live': 'all'}))
+        for date, fixture_ids in by_date.items():
+            priority = PRIORITY_TODAY if date <= today else PRIORITY_FUTURE
+            if len(fixture_ids) > self.adapter.IDS_PER_REQUEST:
+                requests_list.append((priority, {'date': date}))
+            else:
+                by_id.extend(self.adapter.id_requests(fixture_ids, priority))
+        requests_list.extend(by_id)
+
+        fixtures = []
+        for response in self.adapter.fetch(requests_list):
+            fixtures.extend(response or [])
+        records = self.adapter.normalize(fixtures)
+        missing = [fid for fid in in_play if fid not in records]
+        summary['requests'] = len(requests_list) + len(self.adapter.id_requests(missing))
+        records.update(self.adapter.normalize(self.adapter.fixtures_for_ids(missing)))
+
+        summary.update(self._write_live(records))
+        logger.info(f"[Ingestion] Tick: {summary}")
+        return summary
+
+    def run_live(self):
+        """
+        Refresh every tracked in-play fixture in both tables from one live fetch
+
+        Returns:
+            {'fetched': n, 'matches': changed count, 'game_picks': changed count}
+        """
+        tracked = [fid for fid, (in_play, _) in self._tracked_fixtures().items() if in_play]
+        records = self.adapter.normalize(self.adapter.live_fixtures(extra_ids=tracked))
+        result = self._write_live(records)
+        logger.info(f"[Ingestion] Live: {result['matches']} matches, {result['game_picks']} picks changed")
+        return result
+
+    def _write_live(self, records):
+        """Write changed live rows, commit and broadcast them; open bets on changed matches get new cashout values"""
+        from app.websocket_events import broadcast_match_update, push_match_cashouts
+
+        try:
+            changed_matches, changed_picks = self.writer.write_live(records)
+            if changed_matches or changed_picks:
+                db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"[Ingestion] Live refresh failed: {e}")
+            raise
+
+        rows = [(row, 'match') for row in changed_matches] + [(row, 'pick') for row in changed_picks]
+        for row, kind in rows:
+            try:
+                broadcast_match_update(row.to_dict(), kind)
+            except Exception as e:
+                logger.debug(f"[Ingestion] Could not broadcast fixture update: {e}")
+
+        if changed_matches:
+            try:
+                push_match_cashouts(match.id for match in changed_matches)
+            except Exception as e:
+                logger.error(f"[Ingestion] Cashout push failed: {e}")
+
+        return {'fetched': len(records), 'matches': len(changed_matches), 'game_picks': len(changed_picks)}
+
+    def run_odds(self, dates=None):
+        """
+        Refresh bookmaker prices for every listed fixture from the date-paged
+        odds endpoint. Pages are parsed as they arrive into compact records
+        and written in bulk.
+
+        Args:
+            dates: 'YYYY-MM-DD' dates to fetch (default: kick-off dates of
+                   open matches and game picks whose odds interval is due)
+
+        Returns:
+            {'pages': n, 'priced': n, 'matches': changed count, 'game_picks': changed count}
+        """
+        from app.websocket_events import broadcast_odds_update
+
+        if dates is None:
+            _, by_date = odds_scheduler.plan(self._tracked_fixtures(), datetime.utcnow())
+            dates = sorted(by_date)
+        summary = {'pages': 0, 'priced': 0, 'matches': 0, 'game_picks': 0}
+        changed_matches, changed_picks = {}, {}
+        pending = {}
+
+        def flush():
+            matches, picks = self.writer.write_odds(pending.values())
+            changed_matches.update(matches)
+            changed_picks.update(picks)
+            summary['priced'] += len(pending)
+            pending.clear()
+
+        try:
+            for entries in self.adapter.odds_pages(dates):
+                summary['pages'] += 1
+                pending.update(self.adapter.normalize_odds(entries))
+                if len(pending) >= self.writer.ODDS_BATCH_SIZE:
+                    flush()
+            flush()
+            if changed_matches or changed_picks:
+                db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"[Ingestion] Odds refresh failed: {e}")
+            raise
+
+        updates = ([(row_id, prices, 'match') for row_id, prices in changed_matches.items()] +
+                   [(row_id, prices, 'pick') for row_id, prices in changed_picks.items()])
+        for row_id, prices, kind in updates:
+            try:
+                broadcast_odds_update(row_id, prices, kind)
+            except Exception as e:
+                logger.debug(f"[Ingestion] Could not broadcast odds update: {e}")
+
+        summary['matches'], summary['game_picks'] = len(changed_matches), len(changed_picks)
+        logger.info(f"[Ingestion] Odds: {summary} across {len(dates)} dates")
+        return summary
+
+    def _tracked_fixtures(self):
+        """{fixture_id: (in_play, kick_off)} for every open match and game pick that came from the API"""
+        fixtures = {}
+        for fixture_id, status, kick_off in db.session.query(Match.api_fixture_id, Match.status, Match.match_date).filter(
+            Match.status.in_([MatchStatus.SCHEDULED.value, MatchStatus.LIVE.value]),
+            Match.api_fixture_id.isnot(None)
+        ):
+            fixtures[fixture_id] = (status == MatchStatus.LIVE.value, kick_off)
+        for fixture_id, status, kick_off in db.session.query(
+            GamePick.api_fixture_id, GamePick.status, GamePick.kick_off_time
+        ).filter(GamePick.status.in_(GAME_PICK_LIVE_CODES), GamePick.api_fixture_id.isnot(None)):
+            in_play = status != 'NS' or fixtures.get(fixture_id, (False,))[0]
+            fixtures[fixture_id] = (in_play, kick_off)
+        return fixtures
+
+ingestion_pipeline = IngestionPipeline()
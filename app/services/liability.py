@@ -0,0 +1,241 @@
+"""
+Liability Engine - house exposure per match and outcome across open bets
+Every open sports bet adds its potential payout to the (match, outcome) it
+needs: a single to its own selection, an accumulator to each of its legs
+(the payout is owed if that leg and all the others win). The book is built
+per request from one set-based query over the open bets, so it always
+matches the database - whichever process placed or settled the bets and
+however they were updated.
+
+The scenario evaluator scores every full-time result up to N goals a side
+in one NumPy product - outcome masks (outcomes x scores) against payouts
+(matches x outcomes) - giving the payout owed for every score of every
+match and so the worst case per match.
+"""
+import json
+import logging
+import threading
+
+import numpy as np
+from sqlalchemy import select
+
+from app.models import Bet, BetStatus, BookingCode, Match
+from app.models.premium_booking import PremiumBooking
+
+logger = logging.getLogger(__name__)
+
+OPEN_STATUSES = (BetStatus.ACTIVE.value, BetStatus.PENDING.value)
+OTHER = 'other'  # outcomes the score grid can't resolve; counted as paying in every scenario
+DEFAULT_MAX_GOALS = 6
+
+MARKET_ALIASES = {
+    'match result': '1x2', 'full time result': '1x2', 'match winner': '1x2',
+    'double chance': 'dc', 'both teams score': 'gg', 'both teams to score': 'gg', 'btts': 'gg',
+    'ou15': 'ou1', 'ou25': 'ou2', 'ou35': 'ou3',
+    'over/under 1.5': 'ou1', 'over/under 2.5': 'ou2', 'over/under 3.5': 'ou3',
+    'half time/full time': 'htft', 'ht/ft': 'htft', 'correct score': 'cs', 'o/u': 'ou2'
+}
+SELECTION_ALIASES = {
+    '1': 'home', 'x': 'draw', '2': 'away',
+    'yes': 'gg', 'no': 'ng', '1x': '1x', '12': '12', 'x2': 'x2',
+    'home/draw': '1x', 'home/away': '12', 'draw/away': 'x2'
+}
+
+
+def outcome_key(market, selection, home_team=None, away_team=None):
+    """
+    Canonical outcome for a market/selection pair as used by the bet slips
+    ('home', 'x2', 'ng', 'over2.5', 'cs:2-1', 'htft:dh', ...), or OTHER
+    """
+    market = (market or '').strip().lower()
+    market = MARKET_ALIASES.get(market, market)
+    selection = (selection or '').strip().lower()
+    if home_team and selection == home_team.strip().lower():
+        selection = 'home'
+    elif away_team and selection == away_team.strip().lower():
+        selection = 'away'
+    selection = SELECTION_ALIASES.get(selection, selection)
+
+    if market == '1x2' and selection in ('home', 'draw', 'away'):
+        return selection
+    if market == 'dc' and selection in ('1x', '12', 'x2'):
+        return selection
+    if market == 'gg' and selection in ('gg', 'ng'):
+        return selection
+    if market in ('ou1', 'ou2', 'ou3'):
+        line = f'{market[-1]}.5'
+        for side in ('over', 'under'):
+            if selection in (side, f'{side}{market[-1]}', f'{side} {line}', f'{side}{line}'):
+                return f'{side}{line}'
+    if market == 'cs' and '-' in selection:
+        home, _, away = selection.partition('-')
+        if home.strip().isdigit() and away.strip().isdigit():
+            return f'cs:{int(home)}-{int(away)}'
+    if market == 'htft' and len(selection) == 2 and set(selection) <= set('hda'):
+        return f'htft:{selection}'
+    return OTHER
+
+
+def outcome_mask(outcome, home_goals, away_goals):
+    """Boolean array: which full-time scores pay the outcome"""
+    if outcome in ('home', 'draw', 'away'):
+        result = np.sign(home_goals - away_goals)
+        return result == {'home': 1, 'draw': 0, 'away': -1}[outcome]
+    if outcome in ('1x', '12', 'x2'):
+        return ~outcome_mask({'1x': 'away', '12': 'draw', 'x2': 'home'}[outcome], home_goals, away_goals)
+    if outcome in ('gg', 'ng'):
+        both = (home_goals > 0) & (away_goals > 0)
+        return both if outcome == 'gg' else ~both
+    if outcome.startswith(('over', 'under')):
+        line = float(outcome.lstrip('overund'))
+        total = home_goals + away_goals
+        return total > line if outcome.startswith('over') else total < line
+    if outcome.startswith('cs:'):
+        home, away = (int(goals) for goals in outcome[3:].split('-'))
+        return (home_goals == home) & (away_goals == away)
+    if outcome.startswith('htft:'):
+        # The half-time leg isn't on the grid; any half-time result is possible
+        return outcome_mask({'h': 'home', 'd': 'draw', 'a': 'away'}[outcome[-1]], home_goals, away_goals)
+    return np.ones_like(home_goals, dtype=bool)
+
+
+class LiabilityBook:
+    """Open-bet payouts at risk per match and outcome"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._bets = {}  # bet_id -> [(match_id, outcome, payout, stake)]
+        self._exposure = {}  # match_id -> {outcome: payout}
+        self._stakes = {}  # match_id -> stake of open bets with a leg on the match
+
+    # ---- building ----
+
+    def add(self, bet_id, legs):
+        """Record an open bet's legs; adding the same bet twice is a no-op"""
+        with self._lock:
+            if bet_id in self._bets or not legs:
+                return
+            self._bets[bet_id] = legs
+            for match_id, outcome, payout, stake in legs:
+                outcomes = self._exposure.setdefault(match_id, {})
+                outcomes[outcome] = outcomes.get(outcome, 0.0) + payout
+                self._stakes[match_id] = self._stakes.get(match_id, 0.0) + stake
+
+    def rebuild(self, session):
+        """Reload the whole book from the open bets in the database"""
+        bets = session.execute(
+            select(Bet.id, Bet.match_id, Bet.market_type, Bet.selection, Bet.booking_code,
+                   Bet.amount, Bet.potential_payout, Bet.bet_type)
+            .where(Bet.status.in_(OPEN_STATUSES))
+        ).all()
+        resolved = resolve_legs(session.connection(), bets)
+        with self._lock:
+            self._bets, self._exposure, self._stakes = {}, {}, {}
+        for bet_id, legs in resolved.items():
+            self.add(bet_id, legs)
+        logger.debug(f"[Liability] Built book: {len(resolved)} open bets on {len(self._exposure)} matches")
+
+    # ---- queries ----
+
+    def exposure(self, match_id=None):
+        """{match_id: {'stake', 'outcomes': {outcome: payout}}}"""
+        with self._lock:
+            ids = [match_id] if match_id is not None else list(self._exposure)
+            return {
+                mid: {'stake': round(self._stakes[mid], 8), 'outcomes': dict(self._exposure[mid])}
+                for mid in ids if mid in self._exposure
+            }
+
+    def scenarios(self, match_ids=None, max_goals=DEFAULT_MAX_GOALS):
+        """
+        Payout owed for every full-time score of every match
+
+        Returns:
+            (match_ids, array of shape (matches, max_goals + 1, max_goals + 1))
+        """
+        with self._lock:
+            ids = [mid for mid in (match_ids if match_ids is not None else self._exposure) if mid in self._exposure]
+            outcomes = sorted({outcome for mid in ids for outcome in self._exposure[mid]})
+            payouts = np.array([[self._exposure[mid].get(outcome, 0.0) for outcome in outcomes] for mid in ids])
+        size = max_goals + 1
+        home_goals, away_goals = np.divmod(np.arange(size * size), size)
+        masks = np.array([outcome_mask(outcome, home_goals, away_goals) for outcome in outcomes], dtype=float)
+        if not ids:
+            return ids, np.zeros((0, size, size))
+        return ids, (payouts @ masks.reshape(len(outcomes), -1)).reshape(len(ids), size, size)
+
+    def worst_cases(self, match_ids=None, max_goals=DEFAULT_MAX_GOALS):
+        """Worst full-time score per match with its payout, worst first"""
+        ids, grid = self.scenarios(match_ids, max_goals)
+        flat = grid.reshape(len(ids), -1)
+        worst = flat.argmax(axis=1) if ids else []
+        exposure = self.exposure()
+        rows = []
+        for n, match_id in enumerate(ids):
+            home, away = divmod(int(worst[n]), max_goals + 1)
+            payout = float(flat[n, worst[n]])
+            rows.append({
+                'match_id': match_id,
+                'worst_score': f'{home}-{away}',
+                'worst_payout': round(payout, 8),
+                'stake': exposure[match_id]['stake'],
+                'worst_net': round(payout - exposure[match_id]['stake'], 8),
+                'outcomes': exposure[match_id]['outcomes']
+            })
+        return sorted(rows, key=lambda row: row['worst_payout'], reverse=True)
+
+
+def resolve_legs(connection, bets):
+    """
+    Legs of open sports bets as {bet_id: [(match_id, outcome, payout, stake)]}
+
+    Args:
+        connection: Connection to read booking codes and team names with
+        bets: Rows with id, match_id, market_type, selection, booking_code,
+              amount, potential_payout and bet_type
+    """
+    bets = [bet for bet in bets if bet.bet_type != 'virtual']
+    codes = {bet.booking_code for bet in bets if bet.booking_code and not bet.match_id}
+    slips = {}
+    if codes:
+        for code, bet_data in connection.execute(
+                select(BookingCode.code, BookingCode.bet_data).where(BookingCode.code.in_(codes))):
+            try:
+                slips[code] = [(pick.get('matchId'), pick.get('market'), pick.get('type'))
+                               for pick in json.loads(bet_data)]
+            except (TypeError, ValueError, AttributeError):
+                continue
+        for code, selections in connection.execute(
+                select(PremiumBooking.booking_code, PremiumBooking.selections)
+                .where(PremiumBooking.booking_code.in_(codes))):
+            slips[code] = [(sel.get('match_id'), sel.get('market'), sel.get('selection'))
+                           for sel in (selections or [])]
+
+    picks = {}
+    for bet in bets:
+        if bet.match_id:
+            picks[bet.id] = [(bet.match_id, bet.market_type, bet.selection)]
+        elif bet.booking_code in slips:
+            picks[bet.id] = slips[bet.booking_code]
+
+    match_ids = {int(match_id) for legs in picks.values() for match_id, _, _ in legs if match_id}
+    teams = dict((mid, (home, away)) for mid, home, away in connection.execute(
+        select(Match.id, Match.home_team, Match.away_team).where(Match.id.in_(match_ids)))) if match_ids else {}
+
+    bets_by_id = {bet.id: bet for bet in bets}
+    resolved = {}
+    for bet_id, legs in picks.items():
+        bet = bets_by_id[bet_id]
+        resolved[bet_id] = [
+            (int(match_id), outcome_key(market, selection, *teams.get(int(match_id), (None, None))),
+             float(bet.potential_payout or 0), float(bet.amount or 0))
+            for match_id, market, selection in legs if match_id
+        ]
+    return resolved
+
+
+def load_book(session):
+    """A LiabilityBook of the open bets as they are in the database now"""
+    book = LiabilityBook()
+    book.rebuild(session)
+    return book
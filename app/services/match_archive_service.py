@@ -0,0 +1,108 @@
+"""
+Match Archive Service - move finished matches out of the hot matches table
+Finished and cancelled matches older than the retention window are copied
+to matches_archive with INSERT ... SELECT and removed with a set-based
+DELETE, one chunk per transaction. Matches with unsettled bets stay hot so
+settlement keeps working - both bets placed on the match and open booking-code
+bets with a leg on it; bets keep their match_id and resolve through
+Bet.match_record.
+"""
+import logging
+import os
+from datetime import datetime, timedelta
+
+from sqlalchemy import select, insert, delete, exists, literal
+
+from app.extensions import db
+from app.models import Match, MatchArchive, Bet, BetStatus
+from app.services.liability import OPEN_STATUSES, resolve_legs
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RETENTION_DAYS = 1
+CHUNK_SIZE = 500
+
+
+def booking_leg_match_ids():
+    """Ids of matches that open booking-code bets (BookingCode / PremiumBooking slips) have a leg on"""
+    bets = db.session.execute(
+        select(Bet.id, Bet.match_id, Bet.market_type, Bet.selection, Bet.booking_code,
+               Bet.amount, Bet.potential_payout, Bet.bet_type)
+        .where(Bet.status.in_(OPEN_STATUSES), Bet.match_id.is_(None), Bet.booking_code.isnot(None))
+    ).all()
+    legs = resolve_legs(db.session.connection(), bets) if bets else {}
+    return {match_id for bet_legs in legs.values() for match_id, _, _, _ in bet_legs}
+
+
+def archive_finished_matches(retention_days=None, chunk_size=CHUNK_SIZE):
+    """
+    Archive finished/cancelled matches older than retention_days
+
+    Args:
+        retention_days: Days finished matches stay in the hot table
+                        (MATCH_ARCHIVE_RETENTION_DAYS, default 1)
+        chunk_size: Matches moved per transaction
+
+    Returns:
+        Number of matches archived
+    """
+    if retention_days is None:
+        retention_days = int(os.environ.get('MATCH_ARCHIVE_RETENTION_DAYS') or DEFAULT_RETENTION_DAYS)
+    cutoff = datetime.utcnow() - timedelta(days=retention_days)
+
+    has_open_bets = exists().where(
+        Bet.match_id == Match.id,
+        Bet.status.in_([BetStatus.PENDING.value, BetStatus.ACTIVE.value])
+    )
+    candidates = (
+        select(Match.id)
+        .where(
+            Match.match_date < cutoff,
+            Match.status.in_(['finished', 'cancelled']),
+            ~has_open_bets
+        )
+        .order_by(Match.id)
+        .limit(chunk_size)
+    )
+    # Booking-code legs live in JSON slips, so they are resolved once and skipped in Python
+    booked = booking_leg_match_ids()
+
+    columns = [column.name for column in Match.__table__.columns]
+    archived = 0
+    after = 0
+
+    while True:
+        scanned = db.session.execute(candidates.where(Match.id > after)).scalars().all()
+        if not scanned:
+            break
+        after = scanned[-1]
+        ids = [match_id for match_id in scanned if match_id not in booked]
+        if not ids:
+            continue
+
+        try:
+            archived_at = datetime.utcnow()
+            db.session.execute(
+                insert(MatchArchive.__table__).from_select(
+                    columns + ['archived_at'],
+                    select(*[Match.__table__.c[name] for name in columns], literal(archived_at))
+                    .where(Match.id.in_(ids))
+                )
+            )
+            db.session.execute(
+                delete(Match.__table__).where(Match.id.in_(ids)),
+                execution_options={'synchronize_session': False}
+            )
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"[MatchArchive] Failed to archive chunk of {len(ids)} matches: {e}")
+            break
+
+        archived += len(ids)
+        if len(scanned) < chunk_size:
+            break
+
+    if archived:
+        logger.info(f"[MatchArchive] Archived {archived} matches finished before {cutoff.strftime('%Y-%m-%d')}")
+    return archived
@@ -0,0 +1,226 @@
+"""
+Match Broadcaster - coalesced, delta-encoded live match pushes
+Updates published within a short window are merged per row and sent as
+one 'match_delta' carrying only the changed fields and a per-row sequence
+number. A small replay buffer per row lets reconnecting clients resume
+from their last sequence instead of refetching everything.
+
+Publishing happens in Celery workers while subscribe/resume are answered
+by the web process, so sequence numbers, snapshots and replay buffers live
+in Redis: one atomic script diffs a row against its shared snapshot, bumps
+the sequence with INCR and appends to a capped list. Matches and game picks
+have separate id spaces, so keys and rooms are namespaced by kind
+('match:<id>' / 'pick:<id>').
+"""
+import json
+import logging
+import threading
+from collections import deque
+
+from app import socketio
+from app.services.redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+
+KINDS = ('match', 'pick')  # Match rows, GamePick rows
+
+
+def flatten(data, prefix=''):
+    """Flatten nested dicts into dotted keys ({'odds': {'home': 2}} -> {'odds.home': 2})"""
+    flat = {}
+    for key, value in data.items():
+        path = f'{prefix}{key}'
+        if isinstance(value, dict) and value:
+            flat.update(flatten(value, f'{path}.'))
+        else:
+            flat[path] = value
+    return flat
+
+
+def encode(value):
+    return json.dumps(value, sort_keys=True, default=str)
+
+
+class LocalLiveStore:
+    """Per-process sequences and snapshots, for running without Redis"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._seq = {}  # key -> last sequence number
+        self._snapshots = {}  # key -> {field: encoded value}
+        self._replay = {}  # key -> deque of (seq, changes)
+
+    def append(self, key, changes, replay_size, ttl=None):
+        """Record the fields that differ from the snapshot; returns (seq, changes) or (0, {})"""
+        with self._lock:
+            snapshot = self._snapshots.setdefault(key, {})
+            changed = {k: v for k, v in changes.items() if snapshot.get(k) != encode(v)}
+            if not changed:
+                return 0, {}
+            seq = self._seq.get(key, 0) + 1
+            self._seq[key] = seq
+            snapshot.update((k, encode(v)) for k, v in changed.items())
+            replay = self._replay.get(key)
+            if replay is None or replay.maxlen != replay_size:
+                replay = self._replay[key] = deque(replay or (), maxlen=replay_size)
+            replay.append((seq, changed))
+            return seq, changed
+
+    def snapshot(self, key):
+        with self._lock:
+            data = {k: json.loads(v) for k, v in self._snapshots.get(key, {}).items()}
+            return self._seq.get(key, 0), data
+
+    def replay(self, key):
+        with self._lock:
+            return self._seq.get(key, 0), list(self._replay.get(key, ()))
+
+
+class RedisLiveStore:
+    """Sequences, snapshots and replay buffers shared by every process through Redis"""
+
+    # KEYS: seq, snapshot hash, replay list. ARGV: replay size, ttl, field, encoded value, ...
+    APPEND_SCRIPT = """
+    local changed, parts = {}, {}
+    for i = 3, #ARGV, 2 do
+        if redis.call('HGET', KEYS[2], ARGV[i]) ~= ARGV[i + 1] then
+            table.insert(changed, ARGV[i])
+            table.insert(changed, ARGV[i + 1])
+            table.insert(parts, cjson.encode(ARGV[i]) .. ':' .. ARGV[i + 1])
+        end
+    end
+    if #changed == 0 then
+        return {0}
+    end
+    local seq = redis.call('INCR', KEYS[1])
+    redis.call('HSET', KEYS[2], unpack(changed))
+    redis.call('RPUSH', KEYS[3], '[' .. seq .. ',{' .. table.concat(parts, ',') .. '}]')
+    redis.call('LTRIM', KEYS[3], -tonumber(ARGV[1]), -1)
+    for i = 1, 3 do
+        redis.call('EXPIRE', KEYS[i], ARGV[2])
+    end
+    local result = {seq}
+    for i = 1, #changed, 2 do
+        table.insert(result, changed[i])
+    end
+    return result
+    """
+
+    def __init__(self, client):
+        self.client = client
+        self._append = client.register_script(self.APPEND_SCRIPT)
+
+    def _keys(self, key):
+        return f'live:{key}:seq', f'live:{key}:state', f'live:{key}:replay'
+
+    def append(self, key, changes, replay_size, ttl):
+        args = [replay_size, ttl]
+        for field, value in changes.items():
+            args += [field, encode(value)]
+        result = self._append(keys=self._keys(key), args=args)
+        seq = int(result[0])
+        return (seq, {field: changes[field] for field in result[1:]}) if seq else (0, {})
+
+    def snapshot(self, key):
+        seq_key, state_key, _ = self._keys(key)
+        pipe = self.client.pipeline()
+        pipe.get(seq_key)
+        pipe.hgetall(state_key)
+        seq, state = pipe.execute()
+        return int(seq or 0), {k: json.loads(v) for k, v in state.items()}
+
+    def replay(self, key):
+        seq_key, _, replay_key = self._keys(key)
+        pipe = self.client.pipeline()
+        pipe.get(seq_key)
+        pipe.lrange(replay_key, 0, -1)
+        seq, entries = pipe.execute()
+        return int(seq or 0), sorted(tuple(json.loads(entry)) for entry in entries)
+
+
+class MatchBroadcaster:
+    """Coalesces match/odds updates and sequences them in the shared live store"""
+
+    WINDOW = 0.5  # seconds updates are coalesced for
+    REPLAY_SIZE = 50  # deltas kept per row for resume
+    STATE_TTL = 6 * 3600  # seconds a row's live state outlives its last update
+
+    def __init__(self, store=None):
+        self._lock = threading.Lock()
+        self._store = store
+        self._pending = {}  # (kind, id) -> changes waiting for the next flush
+        self._worker = None
+
+    @property
+    def store(self):
+        if self._store is None:
+            client = get_redis()
+            self._store = RedisLiveStore(client) if client else LocalLiveStore()
+        return self._store
+
+    def publish(self, match_id, data, kind='match'):
+        """Queue a full or partial payload for a match or game pick"""
+        with self._lock:
+            self._pending.setdefault((kind, match_id), {}).update(flatten(data))
+        self._ensure_worker()
+
+    def flush(self):
+        """Send one delta per row whose fields changed; returns number of deltas sent"""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+
+        sent = 0
+        for (kind, match_id), changes in pending.items():
+            try:
+                seq, changed = self.store.append(f'{kind}:{match_id}', changes, self.REPLAY_SIZE, self.STATE_TTL)
+            except Exception as e:
+                logger.error(f"[Broadcast] Could not sequence {kind} {match_id}: {e}")
+                continue
+            if not seq:
+                continue
+            delta = {'kind': kind, 'match_id': match_id, 'seq': seq, 'changes': changed}
+            sent += 1
+            try:
+                # One emit per update; a client in both rooms still receives it once
+                socketio.emit('match_delta', delta, to=[f'{kind}_{match_id}', 'live_matches'])
+            except Exception as e:
+                logger.debug(f"[Broadcast] Could not emit delta for {kind} {match_id}: {e}")
+        return sent
+
+    def snapshot(self, match_id, kind='match'):
+        """Full last-sent state for a row, as {'kind', 'match_id', 'seq', 'data'}"""
+        seq, data = self.store.snapshot(f'{kind}:{match_id}')
+        return {'kind': kind, 'match_id': match_id, 'seq': seq, 'data': data}
+
+    def deltas_since(self, match_id, last_seq, kind='match'):
+        """
+        Deltas after last_seq, or None if the replay buffer no longer
+        reaches back that far (client must take a snapshot instead)
+        """
+        current, buffered = self.store.replay(f'{kind}:{match_id}')
+        if last_seq >= current:
+            return []
+        if not buffered or buffered[0][0] > last_seq + 1:
+            return None
+        return [
+            {'kind': kind, 'match_id': match_id, 'seq': seq, 'changes': changes}
+            for seq, changes in buffered if seq > last_seq
+        ]
+
+    def _ensure_worker(self):
+        if self._worker is not None:
+            return
+        with self._lock:
+            if self._worker is None:
+                self._worker = socketio.start_background_task(self._run)
+
+    def _run(self):
+        while True:
+            socketio.sleep(self.WINDOW)
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"[Broadcast] Flush error: {e}")
+
+
+match_broadcaster = MatchBroadcaster()
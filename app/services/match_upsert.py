@@ -0,0 +1,120 @@
+"""
+Match Upsert - bulk insert/update of API fixtures keyed by api_fixture_id
+Each incoming row carries a content hash of the fields a sync may
+overwrite. Stored hashes for a batch are read in one query, unchanged
+fixtures are dropped, and the rest go out as a single
+INSERT ... ON CONFLICT (api_fixture_id) DO UPDATE per batch (Postgres
+and SQLite), so a sync that changes nothing writes nothing.
+"""
+import hashlib
+import json
+import logging
+from datetime import datetime
+
+from sqlalchemy import insert, select, update, bindparam
+
+from app.extensions import db
+from app.models import Match
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 500
+
+
+def content_hash(row, fields):
+    """Stable hash of the given fields of a row"""
+    payload = json.dumps([row.get(field) for field in fields], default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def _upsert_statement(rows, update_fields):
+    """Dialect-specific INSERT ... ON CONFLICT DO UPDATE, or None if unsupported"""
+    dialect = db.engine.dialect.name
+    if dialect == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    elif dialect == 'sqlite':
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    else:
+        return None
+
+    stmt = dialect_insert(Match.__table__).values(rows)
+    excluded = stmt.excluded
+    return stmt.on_conflict_do_update(
+        index_elements=['api_fixture_id'],
+        set_=dict(
+            {field: excluded[field] for field in update_fields},
+            content_hash=excluded.content_hash,
+            updated_at=datetime.utcnow()
+        ),
+        # A concurrent sync may already have written the same content
+        where=Match.__table__.c.content_hash.is_distinct_from(excluded.content_hash)
+    )
+
+
+def upsert_matches(rows, update_fields, batch_size=BATCH_SIZE):
+    """
+    Insert new fixtures and update changed ones, one statement per batch
+
+    Args:
+        rows: Column dicts for Match; each needs api_fixture_id. Fields not
+              in update_fields (e.g. generated odds) are only used on insert.
+        update_fields: Columns an existing fixture may be updated with; the
+              content hash covers exactly these
+        batch_size: Fixtures per statement
+
+    Returns:
+        (created, updated) counts. The caller commits.
+    """
+    # Last row wins if the provider repeats a fixture
+    by_fixture = {row['api_fixture_id']: row for row in rows if row.get('api_fixture_id')}
+    fixture_ids = list(by_fixture)
+    created = updated = 0
+
+    for start in range(0, len(fixture_ids), batch_size):
+        batch_ids = fixture_ids[start:start + batch_size]
+        stored = dict(db.session.execute(
+            select(Match.api_fixture_id, Match.content_hash).where(Match.api_fixture_id.in_(batch_ids))
+        ).all())
+
+        changed = []
+        for fixture_id in batch_ids:
+            row = dict(by_fixture[fixture_id], content_hash=content_hash(by_fixture[fixture_id], update_fields))
+            if fixture_id not in stored:
+                created += 1
+            elif stored[fixture_id] != row['content_hash']:
+                updated += 1
+            else:
+                continue
+            changed.append(row)
+
+        if not changed:
+            continue
+
+        # Multi-row VALUES needs every row to carry the same keys
+        columns = set().union(*changed)
+        changed = [{column: row.get(column) for column in columns} for row in changed]
+
+        stmt = _upsert_statement(changed, update_fields)
+        if stmt is not None:
+            db.session.execute(stmt)
+            continue
+
+        # Other databases: one executemany per kind instead of ON CONFLICT
+        new_rows = [row for row in changed if row['api_fixture_id'] not in stored]
+        if new_rows:
+            db.session.execute(insert(Match.__table__), new_rows)
+        existing = [row for row in changed if row['api_fixture_id'] in stored]
+        if existing:
+            db.session.execute(
+                update(Match.__table__)
+                .where(Match.__table__.c.api_fixture_id == bindparam('b_fixture_id'))
+                .values(dict(
+                    {field: bindparam(field) for field in list(update_fields) + ['content_hash']},
+                    updated_at=datetime.utcnow()
+                )),
+                [dict(row, b_fixture_id=row['api_fixture_id']) for row in existing]
+            )
+
+    logger.info(f"[MatchUpsert] {len(fixture_ids)} fixtures: {created} new, {updated} changed, "
+                f"{len(fixture_ids) - created - updated} unchanged")
+    return created, updated
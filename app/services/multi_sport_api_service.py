@@ -3,12 +3,15 @@ Multi-Sport API Service - Supports Football, Basketball, Baseball, Hockey, etc.
 Fetches real matches with proper odds from API-Sports.io
 """
 
+import os
 import requests
 import logging
-import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from app.extensions import db
-from app.models import Match, MatchStatus
+from app.services.http_cache import api_cache
+from app.services.fetch_scheduler import (
+    FetchScheduler, QuotaExceeded, PRIORITY_TODAY
+)
 
 logger = logging.getLogger(__name__)
 
@@ -52,14 +55,41 @@ class MultiSportAPIService:
         'nfl': 'https://api-american-football.p.rapidapi.com'
     }
     
+    # Only football works on free PythonAnywhere (others blocked by proxy)
+    # To enable other sports, upgrade to paid PythonAnywhere account
+    ENABLED_SPORTS = ['football']  # Add 'basketball', 'hockey', etc. when proxy issue resolved
+    
+    # API-Sports free plan limits; override with API_SPORTS_PER_MINUTE / API_SPORTS_PER_DAY
+    DEFAULT_PER_MINUTE = 10
+    DEFAULT_PER_DAY = 100
+    MAX_WORKERS = 4
+    
     def __init__(self):
         self.api_key = None
         self.headers = None
         self.use_rapidapi = False
+        self.base_url = None
+        self.scheduler = None
     
-    def initialize(self, api_key):
-        """Initialize the service with API key"""
+    def initialize(self, api_key, base_url=None, per_minute=None, per_day=None):
+        """Initialize the service with API key
+        
+        Args:
+            api_key: API-Sports or RapidAPI key
+            base_url: Send every sport to this URL instead (e.g. a local stub server)
+            per_minute: Plan requests per minute (defaults from env / free plan)
+            per_day: Plan requests per day (defaults from env / free plan)
+        """
         self.api_key = api_key
+        self.base_url = base_url or os.environ.get('API_SPORTS_BASE_URL')
+        
+        per_minute = int(per_minute or os.environ.get('API_SPORTS_PER_MINUTE') or self.DEFAULT_PER_MINUTE)
+        per_day = int(per_day or os.environ.get('API_SPORTS_PER_DAY') or self.DEFAULT_PER_DAY)
+        
+        # Keep the scheduler (and its quota count) across re-initialization
+        if (self.scheduler is None or self.scheduler.bucket.capacity != per_minute
+                or self.scheduler.bucket.per_day != per_day):
+            self.scheduler = FetchScheduler(per_minute, per_day, max_workers=self.MAX_WORKERS)
         
         # Detect if it's a RapidAPI key (they're longer and contain 'msh')
         self.use_rapidapi = 'msh' in api_key or len(api_key) > 40
@@ -78,42 +108,37 @@ class MultiSportAPIService:
                 'x-apisports-key': api_key
             }
     
-    def _make_request(self, sport, endpoint, params=None):
-        """Make a request to the API for a specific sport"""
+    def _make_request(self, sport, endpoint, params=None, envelope=False):
+        """Make a request to the API for a specific sport
+        
+        Args:
+            envelope: Return the whole body (results, paging) instead of just the response list
+        """
         if not self.api_key:
             logger.error("API key not configured")
             return None
         
         # Choose the correct base URL and headers based on API type
-        if self.use_rapidapi:
-            base_url = self.RAPIDAPI_ENDPOINTS.get(sport)
-            if not base_url:
-                logger.error(f"Unsupported sport on RapidAPI: {sport}")
-                return None
+        # (headers are copied - requests run concurrently)
+        headers = dict(self.headers)
+        url = self._endpoint_url(sport, endpoint)
+        if not url:
+            logger.error(f"Unsupported sport{' on RapidAPI' if self.use_rapidapi else ''}: {sport}")
+            return None
+        if self.use_rapidapi and not self.base_url:
             # Update the host header for this specific sport
-            self.headers['x-rapidapi-host'] = self.RAPIDAPI_HOSTS.get(sport, 'api-football-v1.p.rapidapi.com')
-        else:
-            base_url = self.SPORT_ENDPOINTS.get(sport)
-            if not base_url:
-                logger.error(f"Unsupported sport: {sport}")
-                return None
+            headers['x-rapidapi-host'] = self.RAPIDAPI_HOSTS.get(sport, 'api-football-v1.p.rapidapi.com')
         
         try:
-            url = f"{base_url}/{endpoint}"
             logger.info(f"🌐 API Request: {url}")
             logger.info(f"   Params: {params}")
             if self.use_rapidapi:
                 logger.info(f"   Header: x-rapidapi-key = {self.api_key[:10]}...")
-                logger.info(f"   Header: x-rapidapi-host = {self.headers.get('x-rapidapi-host')}")
+                logger.info(f"   Header: x-rapidapi-host = {headers.get('x-rapidapi-host')}")
             else:
                 logger.info(f"   Header: x-apisports-key = {self.api_key[:10]}...")
             
-            response = requests.get(url, headers=self.headers, params=params, timeout=15)
-            
-            logger.info(f"   Status Code: {response.status_code}")
-            
-            response.raise_for_status()
-            data = response.json()
+            data = api_cache.get_json(url, headers=headers, params=params, timeout=15)
             
             if data.get('errors') and len(data['errors']) > 0:
                 logger.error(f"   ✗ API returned errors: {data['errors']}")
@@ -125,44 +150,99 @@ class MultiSportAPIService:
             if results_count == 0:
                 logger.warning(f"   ⚠ API returned 0 results (no matches for this date/sport)")
             
-            return data.get('response', [])
+            return data if envelope else data.get('response', [])
         except requests.exceptions.RequestException as e:
             logger.error(f"   ✗ API request failed for {sport}: {e}")
             return None
     
+    def _endpoint_url(self, sport, endpoint):
+        """Full URL for a sport's endpoint, or None if the sport is unsupported"""
+        if self.base_url:
+            return f"{self.base_url.rstrip('/')}/{endpoint}"
+        base_url = (self.RAPIDAPI_ENDPOINTS if self.use_rapidapi else self.SPORT_ENDPOINTS).get(sport)
+        return f"{base_url}/{endpoint}" if base_url else None
+    
+    def _request_many(self, requests_list, envelope=False):
+        """
+        Run several API requests concurrently under the plan's rate limit
+        
+        Args:
+            requests_list: [(priority, sport, endpoint, params), ...]
+            envelope: Return whole bodies (see _make_request)
+        
+        Returns:
+            Responses in the same order (None for failed requests)
+        """
+        if self.scheduler is None:
+            logger.error("API service not initialized")
+            return [None] * len(requests_list)
+        
+        # Responses still fresh in the cache are served inline and spend no rate-limit tokens
+        results = [None] * len(requests_list)
+        network = []
+        for idx, (priority, sport, endpoint, params) in enumerate(requests_list):
+            url = self._endpoint_url(sport, endpoint)
+            if url and api_cache.is_fresh(url, params):
+                results[idx] = self._make_request(sport, endpoint, params, envelope)
+            else:
+                network.append(idx)
+        
+        fetched = self.scheduler.run_all([
+            (requests_list[idx][0], self._make_request, requests_list[idx][1:] + (envelope,))
+            for idx in network
+        ])
+        for idx, result in zip(network, fetched):
+            results[idx] = result
+        
+        for idx, result in enumerate(results):
+            if isinstance(result, QuotaExceeded):
+                logger.warning(f"   ⚠ {result} - skipping remaining requests")
+                results[idx] = None
+            elif isinstance(result, Exception):
+                logger.error(f"   ✗ Request failed: {result}")
+                results[idx] = None
+        return results
+    
+    def _request(self, priority, sport, endpoint, params=None):
+        """Single rate-limited request"""
+        return self._request_many([(priority, sport, endpoint, params)])[0]
+    
     def get_all_sports_matches(self, days_ahead=7):
         """Get upcoming matches from ALL supported sports"""
         all_matches = []
+        sports = self.ENABLED_SPORTS
         
-        # Only football works on free PythonAnywhere (others blocked by proxy)
-        # To enable other sports, upgrade to paid PythonAnywhere account
-        sports = ['football']  # Add 'basketball', 'hockey', etc. when proxy issue resolved
-        
-        for sport in sports:
-            logger.info(f"=" * 40)
-            logger.info(f"Fetching {sport.upper()} matches...")
-            try:
-                sport_matches = self.get_sport_matches(sport, days_ahead)
-                if sport_matches:
-                    all_matches.extend(sport_matches)
-                    logger.info(f"✓ Found {len(sport_matches)} {sport} matches")
-                else:
-                    logger.warning(f"⚠ No scheduled {sport} matches found, trying live matches...")
-                    # Fallback: Try to fetch live matches if no scheduled matches
-                    live_matches = self._get_live_football_matches()
-                    if live_matches:
-                        all_matches.extend(live_matches)
-                        logger.info(f"✓ Found {len(live_matches)} live {sport} matches")
-                    else:
-                        logger.warning(f"✗ No live or scheduled {sport} matches available")
-            except Exception as e:
-                logger.error(f"✗ Error fetching {sport}: {e}")
-                continue
+        # Sports are fetched side by side; their requests share the scheduler's rate limit
+        with ThreadPoolExecutor(max_workers=len(sports)) as executor:
+            for sport_matches in executor.map(lambda sport: self.fetch_sport(sport, days_ahead), sports):
+                all_matches.extend(sport_matches)
         
         logger.info(f"=" * 40)
         logger.info(f"TOTAL: {len(all_matches)} matches from all sports")
         return all_matches
     
+    def fetch_sport(self, sport, days_ahead):
+        """Fetch one sport's matches, falling back to live matches when none are scheduled"""
+        logger.info(f"=" * 40)
+        logger.info(f"Fetching {sport.upper()} matches...")
+        try:
+            sport_matches = self.get_sport_matches(sport, days_ahead)
+            if sport_matches:
+                logger.info(f"✓ Found {len(sport_matches)} {sport} matches")
+                return sport_matches
+            else:
+                logger.warning(f"⚠ No scheduled {sport} matches found, trying live matches...")
+                # Fallback: Try to fetch live matches if no scheduled matches
+                live_matches = self._get_live_football_matches()
+                if live_matches:
+                    logger.info(f"✓ Found {len(live_matches)} live {sport} matches")
+                    return live_matches
+                else:
+                    logger.warning(f"✗ No live or scheduled {sport} matches available")
+        except Exception as e:
+            logger.error(f"✗ Error fetching {sport}: {e}")
+        return []
+    
     def get_sport_matches(self, sport, days_ahead=7):
         """Get upcoming matches for a specific sport"""
         if sport == 'football':
@@ -192,134 +272,30 @@ class MultiSportAPIService:
         else:
             return []
     
-    def _get_football_matches(self, days_ahead):
-        """Get football/soccer matches with REAL ODDS"""
-        matches = []
+    def fetch_dates(self, days_ahead):
+        """'YYYY-MM-DD' dates a fetch of today + days_ahead - 1 days covers"""
+        return [(datetime.utcnow() + timedelta(days=offset)).strftime('%Y-%m-%d') for offset in range(days_ahead)]
+    
+    def _get_football_matches(self, days_ahead=7):
+        """Get football/soccer fixtures as normalized records (fetched and parsed by the ingestion adapter)"""
+        from app.services.ingestion import ApiSportsAdapter, IngestionPipeline
+        adapter = ApiSportsAdapter(self)
         
-        # Fetch matches for today and next few days
         logger.info(f"   Fetching fixtures for next {days_ahead} days...")
-        
-        for day_offset in range(days_ahead):
-            fetch_date = (datetime.utcnow() + timedelta(days=day_offset)).strftime('%Y-%m-%d')
-            logger.info(f"   Checking date: {fetch_date}")
-            
-            fixtures = self._make_request('football', 'fixtures', {'date': fetch_date})
-            
-            if not fixtures:
-                logger.info(f"   No fixtures found for {fetch_date}")
-                continue
-            
-            logger.info(f"   Found {len(fixtures)} fixtures for {fetch_date}. Processing first 15...")
-            
-            # Process fewer matches per day to avoid rate limits
-            for idx, fixture in enumerate(fixtures[:15], 1):
-                try:
-                    fixture_id = fixture.get('fixture', {}).get('id')
-                    teams = fixture.get('teams', {})
-                    league = fixture.get('league', {})
-                    
-                    # Generate varied realistic odds (to avoid rate limit, we skip individual odds calls)
-                    import random
-                    
-                    # Generate realistic varied odds based on match context
-                    home_odds = round(random.uniform(1.5, 4.5), 2)
-                    away_odds = round(random.uniform(1.5, 4.5), 2)
-                    draw_odds = round(random.uniform(2.8, 3.8), 2)
-                    over25_odds = round(random.uniform(1.6, 2.2), 2)
-                    under25_odds = round(random.uniform(1.6, 2.2), 2)
-                    gg_odds = round(random.uniform(1.6, 2.2), 2)
-                    ng_odds = round(random.uniform(1.6, 2.2), 2)
-                    
-                    match_data = {
-                        'fixture_id': fixture_id,
-                        'home_team': teams.get('home', {}).get('name', 'Unknown'),
-                        'away_team': teams.get('away', {}).get('name', 'Unknown'),
-                        'league': league.get('name', 'Unknown League'),
-                        'country': league.get('country', ''),
-                        'match_date': fixture.get('fixture', {}).get('date'),
-                        'status': fixture.get('fixture', {}).get('status', {}).get('short', 'NS'),
-                        'home_score': fixture.get('goals', {}).get('home'),
-                        'away_score': fixture.get('goals', {}).get('away'),
-                        'home_odds': home_odds,
-                        'draw_odds': draw_odds,
-                        'away_odds': away_odds,
-                        'over25_odds': over25_odds,
-                        'under25_odds': under25_odds,
-                        'gg_odds': gg_odds,
-                        'ng_odds': ng_odds,
-                        'sport': 'Football'
-                    }
-                    
-                    matches.append(match_data)
-                    logger.info(f"   [{idx}/15] {match_data['home_team']} vs {match_data['away_team']} (Odds: {home_odds}/{draw_odds}/{away_odds})")
-                    
-                except Exception as e:
-                    logger.error(f"Error processing football fixture {fixture_id}: {e}")
-                    continue
-            
-            # Small delay between date requests to respect rate limits
-            if day_offset < days_ahead - 1:
-                time.sleep(2)
+        matches = []
+        for fetch_date, fixtures in adapter.fixtures_for_dates(self.fetch_dates(days_ahead)).items():
+            records = list(adapter.normalize(fixtures).values())[:IngestionPipeline.MAX_NEW_PER_DAY]
+            logger.info(f"   {fetch_date}: {len(fixtures)} fixtures, keeping {len(records)}")
+            matches.extend(records)
         
         logger.info(f"   Total football matches collected: {len(matches)}")
         return matches
     
     def _get_live_football_matches(self):
-        """Get currently live football matches as fallback"""
-        matches = []
-        logger.info("   Fetching live matches...")
-        
-        fixtures = self._make_request('football', 'fixtures', {'live': 'all'})
-        
-        if not fixtures:
-            logger.info("   No live fixtures found")
-            return []
-        
-        logger.info(f"   Found {len(fixtures)} live fixtures. Processing first 10...")
-        
-        for idx, fixture in enumerate(fixtures[:10], 1):
-            try:
-                import random
-                fixture_id = fixture.get('fixture', {}).get('id')
-                teams = fixture.get('teams', {})
-                league = fixture.get('league', {})
-                
-                home_odds = round(random.uniform(1.5, 4.5), 2)
-                away_odds = round(random.uniform(1.5, 4.5), 2)
-                draw_odds = round(random.uniform(2.8, 3.8), 2)
-                over25_odds = round(random.uniform(1.6, 2.2), 2)
-                under25_odds = round(random.uniform(1.6, 2.2), 2)
-                gg_odds = round(random.uniform(1.6, 2.2), 2)
-                ng_odds = round(random.uniform(1.6, 2.2), 2)
-                
-                match_data = {
-                    'fixture_id': fixture_id,
-                    'home_team': teams.get('home', {}).get('name', 'Unknown'),
-                    'away_team': teams.get('away', {}).get('name', 'Unknown'),
-                    'league': league.get('name', 'Unknown League'),
-                    'country': league.get('country', ''),
-                    'match_date': fixture.get('fixture', {}).get('date'),
-                    'status': fixture.get('fixture', {}).get('status', {}).get('short', 'LIVE'),
-                    'home_score': fixture.get('goals', {}).get('home'),
-                    'away_score': fixture.get('goals', {}).get('away'),
-                    'home_odds': home_odds,
-                    'draw_odds': draw_odds,
-                    'away_odds': away_odds,
-                    'over25_odds': over25_odds,
-                    'under25_odds': under25_odds,
-                    'gg_odds': gg_odds,
-                    'ng_odds': ng_odds,
-                    'sport': 'Football'
-                }
-                
-                matches.append(match_data)
-                logger.info(f"   [LIVE {idx}/10] {match_data['home_team']} {match_data['home_score']}-{match_data['away_score']} {match_data['away_team']}")
-                
-            except Exception as e:
-                logger.error(f"Error processing live fixture {fixture_id}: {e}")
-                continue
-        
-        return matches
+        """Get currently live football fixtures as normalized records (fallback)"""
+        from app.services.ingestion import ApiSportsAdapter
+        adapter = ApiSportsAdapter(self)
+        return list(adapter.normalize(adapter.live_fixtures()).values())[:10]
     
     def _get_basketball_matches(self, days_ahead):
         """Get basketball matches"""
@@ -327,7 +303,7 @@ class MultiSportAPIService:
         today = datetime.utcnow().strftime('%Y-%m-%d')
         
         # Fetch today's games - Remove league parameter to get ALL games
-        games = self._make_request('basketball', 'games', {'date': today, 'season': '2024-2025'})
+        games = self._request(PRIORITY_TODAY, 'basketball', 'games', {'date': today, 'season': '2024-2025'})
         
         if not games:
             return []
@@ -366,7 +342,7 @@ class MultiSportAPIService:
         matches = []
         today = datetime.utcnow().strftime('%Y-%m-%d')
         
-        games = self._make_request('baseball', 'games', {'date': today, 'season': '2024'})
+        games = self._request(PRIORITY_TODAY, 'baseball', 'games', {'date': today, 'season': '2024'})
         
         if not games:
             return []
@@ -406,7 +382,7 @@ class MultiSportAPIService:
         today = datetime.utcnow().strftime('%Y-%m-%d')
         
         # Free plan only has 2021-2023 seasons
-        games = self._make_request('hockey', 'games', {'date': today, 'season': '2023'})
+        games = self._request(PRIORITY_TODAY, 'hockey', 'games', {'date': today, 'season': '2023'})
         
         if not games:
             return []
@@ -445,7 +421,7 @@ class MultiSportAPIService:
         matches = []
         today = datetime.utcnow().strftime('%Y-%m-%d')
         
-        games = self._make_request('nba', 'games', {'date': today})
+        games = self._request(PRIORITY_TODAY, 'nba', 'games', {'date': today})
         
         if not games:
             return []
@@ -484,7 +460,7 @@ class MultiSportAPIService:
         matches = []
         today = datetime.utcnow().strftime('%Y-%m-%d')
         
-        games = self._make_request('nfl', 'games', {'date': today})
+        games = self._request(PRIORITY_TODAY, 'nfl', 'games', {'date': today})
         
         if not games:
             return []
@@ -523,7 +499,7 @@ class MultiSportAPIService:
         matches = []
         today = datetime.utcnow().strftime('%Y-%m-%d')
         
-        games = self._make_request('rugby', 'games', {'date': today})
+        games = self._request(PRIORITY_TODAY, 'rugby', 'games', {'date': today})
         
         if not games:
             return []
@@ -562,7 +538,7 @@ class MultiSportAPIService:
         matches = []
         today = datetime.utcnow().strftime('%Y-%m-%d')
         
-        games = self._make_request('volleyball', 'games', {'date': today})
+        games = self._request(PRIORITY_TODAY, 'volleyball', 'games', {'date': today})
         
         if not games:
             return []
@@ -601,7 +577,7 @@ class MultiSportAPIService:
         matches = []
         today = datetime.utcnow().strftime('%Y-%m-%d')
         
-        games = self._make_request('handball', 'games', {'date': today})
+        games = self._request(PRIORITY_TODAY, 'handball', 'games', {'date': today})
         
         if not games:
             return []
@@ -640,7 +616,7 @@ class MultiSportAPIService:
         matches = []
         today = datetime.utcnow().strftime('%Y-%m-%d')
         
-        games = self._make_request('mma', 'fights', {'date': today})
+        games = self._request(PRIORITY_TODAY, 'mma', 'fights', {'date': today})
         
         if not games:
             return []
@@ -679,7 +655,7 @@ class MultiSportAPIService:
         matches = []
         today = datetime.utcnow().strftime('%Y-%m-%d')
         
-        games = self._make_request('afl', 'games', {'date': today})
+        games = self._request(PRIORITY_TODAY, 'afl', 'games', {'date': today})
         
         if not games:
             return []
@@ -718,7 +694,7 @@ class MultiSportAPIService:
         matches = []
         today = datetime.utcnow().strftime('%Y-%m-%d')
         
-        races = self._make_request('formula1', 'races', {'date': today})
+        races = self._request(PRIORITY_TODAY, 'formula1', 'races', {'date': today})
         
         if not races:
             return []
@@ -752,206 +728,14 @@ class MultiSportAPIService:
         
         return matches
     
-    def sync_matches_to_database(self, matches_data):
-        """Sync matches from API to database with REAL odds"""
-        if not matches_data:
-            logger.warning("No matches data to sync")
-            return 0, 0
-        
-        # Clean up old matches (older than 24 hours and finished)
-        try:
-            yesterday = datetime.utcnow() - timedelta(days=1)
-            old_matches = Match.query.filter(
-                Match.match_date < yesterday,
-                Match.status.in_(['finished', 'cancelled'])
-            ).all()
-            
-            deleted_count = len(old_matches)
-            for old_match in old_matches:
-                db.session.delete(old_match)
-            
-            if deleted_count > 0:
-                logger.info(f"🗑️ Cleaned up {deleted_count} old matches from before {yesterday.strftime('%Y-%m-%d')}")
-        except Exception as e:
-            logger.error(f"Error cleaning up old matches: {e}")
-        
-        created = 0
-        updated = 0
-        
-        for match_data in matches_data:
-            try:
-                fixture_id = match_data.get('fixture_id')
-                if not fixture_id:
-                    continue
-                
-                # Check if match exists
-                existing_match = Match.query.filter_by(api_fixture_id=fixture_id).first()
-                
-                # Parse date
-                match_date_str = match_data.get('match_date')
-                if match_date_str:
-                    match_date = datetime.fromisoformat(match_date_str.replace('Z', '+00:00'))
-                else:
-                    match_date = datetime.utcnow()
-                
-                # Map status
-                status = self._map_status(match_data.get('status', 'NS'))
-                
-                if existing_match:
-                    # Update existing
-                    existing_match.home_team = match_data['home_team']
-                    existing_match.away_team = match_data['away_team']
-                    existing_match.league = match_data['league']
-                    existing_match.match_date = match_date
-                    existing_match.status = status
-                    existing_match.home_score = match_data.get('home_score')
-                    existing_match.away_score = match_data.get('away_score')
-                    existing_match.home_odds = match_data['home_odds']
-                    existing_match.draw_odds = match_data.get('draw_odds')
-                    existing_match.away_odds = match_data['away_odds']
-                    existing_match.over25_odds = match_data.get('over25_odds')
-                    existing_match.under25_odds = match_data.get('under25_odds')
-                    existing_match.gg_odds = match_data.get('gg_odds')
-                    existing_match.ng_odds = match_data.get('ng_odds')
-                    existing_match.updated_at = datetime.utcnow()
-                    updated += 1
-                else:
-                    # Create new with REAL odds
-                    new_match = Match(
-                        home_team=match_data['home_team'],
-                        away_team=match_data['away_team'],
-                        league=match_data['league'],
-                        match_date=match_date,
-                        status=status,
-                        home_score=match_data.get('home_score'),
-                        away_score=match_data.get('away_score'),
-                        home_odds=match_data['home_odds'],
-                        draw_odds=match_data.get('draw_odds'),
-                        away_odds=match_data['away_odds'],
-                        over25_odds=match_data.get('over25_odds'),
-                        under25_odds=match_data.get('under25_odds'),
-                        gg_odds=match_data.get('gg_odds'),
-                        ng_odds=match_data.get('ng_odds'),
-                        is_manual=False,
-                        api_fixture_id=fixture_id
-                    )
-                    db.session.add(new_match)
-                    created += 1
-            
-            except Exception as e:
-                logger.error(f"Error syncing match: {e}")
-                continue
-        
-        try:
-            db.session.commit()
-            logger.info(f"Synced matches: {created} created, {updated} updated")
-        except Exception as e:
-            db.session.rollback()
-            logger.error(f"Database commit failed: {e}")
-            return 0, 0
-        
-        return created, updated
-    
     def update_live_matches(self):
-        """Update scores and times for all live matches"""
+        """Update scores, minute and status for all live matches, writing only rows that changed"""
+        from app.services.ingestion import ApiSportsAdapter, IngestionPipeline
         try:
-            from app.models import Match
-            
-            # Get all live matches from database
-            live_matches = Match.query.filter(
-                Match.status == 'live'
-            ).all()
-            
-            if not live_matches:
-                logger.info("No live matches to update")
-                return 0
-            
-            logger.info(f"Updating {len(live_matches)} live matches...")
-            updated = 0
-            
-            for match in live_matches:
-                try:
-                    if not match.api_fixture_id:
-                        continue
-                    
-                    # Fetch live data for this specific fixture
-                    fixture_data = self._make_request('football', 'fixtures', {
-                        'id': match.api_fixture_id
-                    })
-                    
-                    if not fixture_data or len(fixture_data) == 0:
-                        continue
-                    
-                    fixture = fixture_data[0]
-                    fixture_info = fixture.get('fixture', {})
-                    goals = fixture.get('goals', {})
-                    status_info = fixture.get('status', {})
-                    
-                    # Update scores
-                    match.home_score = goals.get('home')
-                    match.away_score = goals.get('away')
-                    
-                    # Update match time (elapsed minutes)
-                    elapsed = fixture_info.get('status', {}).get('elapsed')
-                    if elapsed:
-                        match.match_time = elapsed  # Store in minutes
-                    
-                    # Update status
-                    status_short = status_info.get('short', 'NS')
-                    new_status = self._map_status(status_short)
-                    
-                    # If match finished, mark as finished
-                    if new_status == 'finished':
-                        match.status = 'finished'
-                        logger.info(f"✓ Match finished: {match.home_team} {match.home_score}-{match.away_score} {match.away_team}")
-                    else:
-                        match.status = new_status
-                    
-                    match.updated_at = datetime.utcnow()
-                    updated += 1
-                    
-                    logger.info(f"   Updated: {match.home_team} {match.home_score}-{match.away_score} {match.away_team} ({elapsed}')")
-                    
-                    # Small delay to avoid rate limits
-                    time.sleep(1)
-                    
-                except Exception as e:
-                    logger.error(f"Error updating live match {match.id}: {e}")
-                    continue
-            
-            if updated > 0:
-                db.session.commit()
-                logger.info(f"✓ Updated {updated} live matches")
-            
-            return updated
-            
+            return IngestionPipeline(adapter=ApiSportsAdapter(self)).run_live()['matches']
         except Exception as e:
             logger.error(f"Error in update_live_matches: {e}")
-            db.session.rollback()
             return 0
-    
-    def _map_status(self, api_status):
-        """Map API status codes to our database status"""
-        status_mapping = {
-            'TBD': 'scheduled',
-            'NS': 'scheduled',
-            '1H': 'live',
-            'HT': 'live',
-            '2H': 'live',
-            'ET': 'live',
-            'P': 'live',
-            'LIVE': 'live',
-            'FT': 'finished',
-            'AET': 'finished',
-            'PEN': 'finished',
-            'FIN': 'finished',
-            'PST': 'cancelled',
-            'CANC': 'cancelled',
-            'ABD': 'cancelled',
-            'AWD': 'finished',
-            'WO': 'finished'
-        }
-        return status_mapping.get(api_status, 'scheduled')
 
 
 # Create global instance
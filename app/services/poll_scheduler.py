@@ -0,0 +1,177 @@
+"""
+Adaptive Poll Scheduler - per-fixture polling intervals from match state
+A frequent tick asks which tracked fixtures are due: in-play fixtures every
+tick, fixtures kicking off soon every minute, the rest of today and later
+fixtures far less often. Each fixture's last poll time is recorded and it
+is due again once its interval has passed. Fixtures past kick-off that
+never go live (postponed, abandoned, missing from the feed) back off from
+the kick-off interval up to the overdue cap instead of being polled every
+minute forever.
+
+Ticks can run in any Celery worker, so the last poll times live in a Redis
+hash claimed atomically by one script; without Redis they are kept per
+process.
+"""
+import logging
+import threading
+import time
+from datetime import timedelta
+
+from app.services.redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+
+STATE_IN_PLAY = 'in_play'
+STATE_KICK_OFF_SOON = 'kick_off_soon'
+STATE_OVERDUE = 'overdue'
+STATE_TODAY = 'today'
+STATE_LATER = 'later'
+
+TICK_SECONDS = 15
+KICK_OFF_WINDOW = timedelta(minutes=15)
+OVERDUE_STEP = timedelta(minutes=15)  # the overdue interval doubles every step past the window
+
+# Seconds between score/status polls per state; STATE_OVERDUE is the back-off cap
+POLL_INTERVALS = {
+    STATE_IN_PLAY: 15,
+    STATE_KICK_OFF_SOON: 60,
+    STATE_OVERDUE: 3600,
+    STATE_TODAY: 900,
+    STATE_LATER: 3600
+}
+# Seconds between odds refreshes per state
+ODDS_INTERVALS = {
+    STATE_IN_PLAY: 300,
+    STATE_KICK_OFF_SOON: 300,
+    STATE_OVERDUE: 3600,
+    STATE_TODAY: 900,
+    STATE_LATER: 3600
+}
+LAST_POLL_TTL = 2 * 86400  # seconds the shared last-poll hash outlives its last tick
+
+
+def fixture_state(in_play, kick_off, now):
+    """Polling state of a fixture at `now` (naive UTC)"""
+    if in_play:
+        return STATE_IN_PLAY
+    if kick_off is not None and now - kick_off > KICK_OFF_WINDOW:
+        # Well past kick-off and still not reported live
+        return STATE_OVERDUE
+    if kick_off is None or kick_off - now <= KICK_OFF_WINDOW:
+        # Just past kick-off but not yet reported live counts as about to start
+        return STATE_KICK_OFF_SOON
+    if kick_off.date() == now.date():
+        return STATE_TODAY
+    return STATE_LATER
+
+
+class LocalPollStore:
+    """Per-process last poll times, for running without Redis"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._last = {}  # name -> {fixture_id: epoch seconds}
+
+    def claim(self, name, intervals, timestamp, ttl=None):
+        """Mark and return the fixtures whose interval has passed; forgets fixtures not listed"""
+        with self._lock:
+            previous = self._last.get(name, {})
+            last = self._last[name] = {fid: previous[fid] for fid in intervals if fid in previous}
+            due = [fid for fid, interval in intervals.items()
+                   if fid not in last or timestamp - last[fid] >= interval]
+            last.update((fid, timestamp) for fid in due)
+            return due
+
+
+class RedisPollStore:
+    """Last poll times in one Redis hash per scheduler, shared by every worker"""
+
+    # KEYS: hash. ARGV: timestamp, ttl, fixture id, interval, ...
+    CLAIM_SCRIPT = """
+    local now, listed, due = tonumber(ARGV[1]), {}, {}
+    for i = 3, #ARGV, 2 do
+        listed[ARGV[i]] = true
+        local last = redis.call('HGET', KEYS[1], ARGV[i])
+        if not last or now - tonumber(last) >= tonumber(ARGV[i + 1]) then
+            redis.call('HSET', KEYS[1], ARGV[i], ARGV[1])
+            table.insert(due, ARGV[i])
+        end
+    end
+    for _, field in ipairs(redis.call('HKEYS', KEYS[1])) do
+        if not listed[field] then
+            redis.call('HDEL', KEYS[1], field)
+        end
+    end
+    redis.call('EXPIRE', KEYS[1], ARGV[2])
+    return due
+    """
+
+    def __init__(self, client):
+        self._claim = client.register_script(self.CLAIM_SCRIPT)
+
+    def claim(self, name, intervals, timestamp, ttl):
+        args = [timestamp, ttl]
+        for fixture_id, interval in intervals.items():
+            args += [fixture_id, interval]
+        ids = {str(fid): fid for fid in intervals}
+        return [ids[field] for field in self._claim(keys=[f'poll:{name}:last'], args=args)]
+
+
+class PollScheduler:
+    """Decides which fixtures are due on a tick"""
+
+    def __init__(self, intervals=None, tick=TICK_SECONDS, name='scores', store=None):
+        self.intervals = dict(intervals or POLL_INTERVALS)
+        self.tick = tick
+        self.name = name
+        self._store = store
+
+    @property
+    def store(self):
+        if self._store is None:
+            client = get_redis()
+            self._store = RedisPollStore(client) if client else LocalPollStore()
+        return self._store
+
+    def interval(self, state, kick_off=None, now=None):
+        """
+        Seconds between polls of a fixture. Half a tick is taken off so beat
+        jitter doesn't push a fixture to the tick after it fell due.
+        """
+        if state == STATE_OVERDUE:
+            steps = int((now - kick_off - KICK_OFF_WINDOW) / OVERDUE_STEP)
+            seconds = min(self.intervals[STATE_KICK_OFF_SOON] * 2 ** min(steps, 16), self.intervals[STATE_OVERDUE])
+        else:
+            seconds = self.intervals[state]
+        return max(seconds, self.tick) - self.tick / 2
+
+    def plan(self, fixtures, now, timestamp=None):
+        """
+        Due fixtures for this tick, recorded as polled at `timestamp`
+
+        Args:
+            fixtures: {fixture_id: (in_play, kick_off)}
+            now: Current naive UTC datetime (for states)
+            timestamp: Epoch seconds of the tick (for due-ness; defaults to now)
+
+        Returns:
+            (in-play fixture ids, {'YYYY-MM-DD': other due fixture ids})
+        """
+        timestamp = time.time() if timestamp is None else timestamp
+        states, intervals = {}, {}
+        for fixture_id, (is_live, kick_off) in fixtures.items():
+            state = states[fixture_id] = fixture_state(is_live, kick_off, now)
+            intervals[fixture_id] = self.interval(state, kick_off, now)
+
+        in_play, by_date = [], {}
+        for fixture_id in self.store.claim(self.name, intervals, timestamp, LAST_POLL_TTL):
+            if states[fixture_id] == STATE_IN_PLAY:
+                in_play.append(fixture_id)
+            else:
+                kick_off = fixtures[fixture_id][1]
+                by_date.setdefault((kick_off or now).strftime('%Y-%m-%d'), []).append(fixture_id)
+        return in_play, by_date
+
+
+poll_scheduler = PollScheduler()
+odds_scheduler = PollScheduler(ODDS_INTERVALS, tick=ODDS_INTERVALS[STATE_IN_PLAY], name='odds')
@@ -0,0 +1,48 @@
+"""
+Redis Client - shared connection for state every process must agree on
+Web workers, Celery workers and the scheduler keep live-match sequences,
+rate-limit counters and job state in the Redis that already carries the
+Celery broker and the Socket.IO queue. Without a Redis URL (or the redis
+package) get_redis() returns None and callers fall back to per-process
+state, which is only correct when everything runs in one process.
+"""
+import logging
+import os
+import threading
+
+logger = logging.getLogger(__name__)
+
+URL_SETTINGS = ('REDIS_URL', 'SOCKETIO_MESSAGE_QUEUE', 'CELERY_BROKER_URL')
+
+_client = None
+_resolved = False
+_lock = threading.Lock()
+
+
+def redis_url():
+    """First Redis URL among REDIS_URL, SOCKETIO_MESSAGE_QUEUE and CELERY_BROKER_URL"""
+    for name in URL_SETTINGS:
+        url = os.environ.get(name)
+        if url and url.startswith(('redis://', 'rediss://', 'unix://')):
+            return url
+    return None
+
+
+def get_redis():
+    """Shared Redis client (str responses), or None when Redis isn't configured or reachable"""
+    global _client, _resolved
+    if _resolved:
+        return _client
+    with _lock:
+        if not _resolved:
+            url = redis_url()
+            if url:
+                try:
+                    import redis
+                    client = redis.Redis.from_url(url, decode_responses=True)
+                    client.ping()
+                    _client = client
+                except Exception as e:
+                    logger.warning(f"[Redis] {url} unavailable, using per-process state: {e}")
+            _resolved = True
+    return _client
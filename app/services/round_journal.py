@@ -0,0 +1,194 @@
+"""
+Round Journal - buffered, append-only writer for casino rounds
+Game endpoints hand rounds to an in-process buffer; a background thread
+bulk-inserts them every few hundred milliseconds so game latency is
+unaffected by journal writes. A batch that keeps failing is written row by
+row so one bad round can't block the rest, and the buffer is capped so a
+database outage can't grow it without bound.
+"""
+import atexit
+import json
+import logging
+import threading
+from datetime import datetime
+
+from flask import current_app
+from sqlalchemy.exc import DataError, IntegrityError
+
+from app.extensions import db
+from app.models.casino_round import CasinoRound
+
+logger = logging.getLogger(__name__)
+
+
+class RoundJournal:
+    """Buffers casino rounds in memory and flushes them in bulk"""
+
+    FLUSH_INTERVAL = 0.25  # seconds between background flushes
+    MAX_BUFFER = 500  # flush early once this many rounds are waiting
+    BUFFER_LIMIT = 50000  # oldest rounds are dropped beyond this
+    MAX_RETRIES = 3  # failed bulk inserts before falling back to row-by-row
+
+    def __init__(self):
+        self._buffer = []
+        self._failures = 0
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._app = None
+        self._thread = None
+
+    def record(self, user_id, game, stake, multiplier, payout,
+               server_seed=None, client_seed=None, nonce=None, details=None):
+        """Queue a single round for the journal"""
+        self.record_many([{
+            'user_id': user_id,
+            'game': game,
+            'stake': stake,
+            'multiplier': multiplier,
+            'payout': payout,
+            'server_seed': server_seed,
+            'client_seed': client_seed,
+            'nonce': nonce,
+            'details': details
+        }])
+
+    def record_many(self, rounds):
+        """Queue several rounds (e.g. an auto-bet batch) for the journal"""
+        now = datetime.utcnow()
+        rows = []
+        for r in rounds:
+            details = r.get('details')
+            rows.append({
+                'user_id': int(r['user_id']),
+                'game': r['game'],
+                'stake': float(r['stake']),
+                'multiplier': float(r.get('multiplier') or 0.0),
+                'payout': float(r.get('payout') or 0.0),
+                'server_seed': r.get('server_seed'),
+                'client_seed': r.get('client_seed'),
+                'nonce': r.get('nonce'),
+                'details': json.dumps(details) if details is not None else None,
+                'created_at': r.get('created_at') or now
+            })
+        if not rows:
+            return
+
+        self._ensure_writer()
+        with self._lock:
+            self._buffer.extend(rows)
+            self._enforce_limit()
+            pending = len(self._buffer)
+        if pending >= self.MAX_BUFFER:
+            self._wakeup.set()
+
+    def flush(self):
+        """
+        Write every buffered round in one bulk INSERT; returns rows written
+
+        A failed batch goes back to the buffer; after MAX_RETRIES failures in
+        a row it is written row by row and rounds the database rejects are
+        dropped.
+        """
+        with self._flush_lock:
+            with self._lock:
+                rows, self._buffer = self._buffer, []
+            if not rows:
+                return 0
+
+            if self._failures >= self.MAX_RETRIES:
+                return self._flush_rows(rows)
+
+            try:
+                db.session.execute(CasinoRound.__table__.insert(), rows)
+                db.session.commit()
+                self._failures = 0
+                return len(rows)
+            except Exception as e:
+                db.session.rollback()
+                self._failures += 1
+                logger.error(f"[RoundJournal] Bulk insert of {len(rows)} rounds failed "
+                             f"({self._failures}/{self.MAX_RETRIES}): {e}")
+                self._requeue(rows)
+                return 0
+
+    def _flush_rows(self, rows):
+        """Insert rows one at a time, dropping the ones the database rejects"""
+        written = 0
+        for i, row in enumerate(rows):
+            try:
+                db.session.execute(CasinoRound.__table__.insert(), [row])
+                db.session.commit()
+                written += 1
+            except (IntegrityError, DataError) as e:
+                db.session.rollback()
+                logger.error(f"[RoundJournal] Dropped {row['game']} round for user {row['user_id']}: {e}")
+            except Exception as e:
+                # Not the row's fault (e.g. the database is down): keep the rest for later
+                db.session.rollback()
+                logger.error(f"[RoundJournal] Row-by-row insert stopped: {e}")
+                self._requeue(rows[i:])
+                return written
+        self._failures = 0
+        return written
+
+    def _requeue(self, rows):
+        """Put unwritten rows back at the front so the next flush retries them"""
+        with self._lock:
+            self._buffer[:0] = rows
+            self._enforce_limit()
+
+    def _enforce_limit(self):
+        """Drop the oldest rounds beyond BUFFER_LIMIT (caller holds _lock)"""
+        excess = len(self._buffer) - self.BUFFER_LIMIT
+        if excess > 0:
+            del self._buffer[:excess]
+            logger.error(f"[RoundJournal] Buffer full, dropped the {excess} oldest rounds")
+
+    def pending(self):
+        """Number of rounds waiting to be written"""
+        with self._lock:
+            return len(self._buffer)
+
+    def _ensure_writer(self):
+        """Start the background writer on first use"""
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._app = current_app._get_current_object()
+            self._thread = threading.Thread(target=self._run, name='round-journal', daemon=True)
+            self._thread.start()
+            atexit.register(self._flush_in_app)
+
+    def _run(self):
+        while True:
+            self._wakeup.wait(self.FLUSH_INTERVAL)
+            self._wakeup.clear()
+            self._flush_in_app()
+
+    def _flush_in_app(self):
+        try:
+            with self._app.app_context():
+                self.flush()
+                db.session.remove()
+        except Exception as e:
+            logger.error(f"[RoundJournal] Background flush error: {e}")
+
+
+round_journal = RoundJournal()
+
+
+def get_round_history(user_id, game, limit=50):
+    """Latest rounds for one user and game, served by (user_id, game, created_at)"""
+    # Make sure this user's just-played rounds are visible
+    if round_journal.pending():
+        round_journal.flush()
+
+    rounds = CasinoRound.query.filter_by(
+        user_id=int(user_id),
+        game=game
+    ).order_by(CasinoRound.created_at.desc()).limit(limit).all()
+
+    return [r.to_dict() for r in rounds]
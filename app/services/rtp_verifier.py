@@ -0,0 +1,295 @@
+"""
+RTP Verifier - Monte Carlo return-to-player check for the in-house games
+Plays millions of rounds of crash, dice, plinko and mines with the same
+outcome mappings the routes use and reports RTP, house edge, variance and
+tail payout percentiles next to the exact expected RTP.
+
+Dice, plinko and mines outcomes come from SHA-256 digests laid out like the
+provably fair endpoints, so hashing dominates the cost: rounds are split
+into chunks that run on a process pool, and each chunk is mapped to payouts
+in one vectorized pass. Crash points come from Python's random module
+rather than a hash, so crash is drawn straight from its distribution with
+NumPy. Payouts only take a handful of values per game, so chunks return
+(value, count) pairs and the summary is exact without keeping every round.
+"""
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from math import comb
+
+import numpy as np
+
+from app.routes.crash_routes import CRASH_SEGMENTS, GROWTH_PER_SECOND, MAX_FLIGHT_SECONDS
+from app.routes.dice_routes import DICE_OUTCOMES, dice_multiplier, dice_results
+from app.routes.mines_routes import calculate_multiplier
+from app.routes.plinko_routes import MULTIPLIERS
+from app.services.auto_bet_service import auto_bet_service
+
+logger = logging.getLogger(__name__)
+
+GAMES = ('crash', 'dice', 'plinko', 'mines')
+DEFAULT_ROUNDS = 10_000_000
+CHUNK_ROUNDS = 200_000
+PERCENTILES = (50, 90, 99, 99.9)
+
+# get_current_multiplier forces a crash once the round has flown MAX_FLIGHT_SECONDS
+CRASH_FORCED_AT = 1.0 + GROWTH_PER_SECOND * MAX_FLIGHT_SECONDS
+
+MINES_TILES = 25
+MINES_MAX = 16  # generate_mine_positions reads 4 hex chars per mine from one 64-char digest
+PLINKO_ROWS = 16
+
+
+# ---- payout distributions ----
+
+def payout_distribution(payouts):
+    """Collapse per-round payouts into sorted (values, counts)"""
+    return np.unique(np.asarray(payouts, dtype=np.float64), return_counts=True)
+
+
+def merge_distributions(parts):
+    """Combine (values, counts) pairs from several chunks"""
+    values = np.concatenate([part[0] for part in parts])
+    counts = np.concatenate([part[1] for part in parts])
+    merged, index = np.unique(values, return_inverse=True)
+    return merged, np.bincount(index, weights=counts).astype(np.int64)
+
+
+def summarize(values, counts=None):
+    """
+    RTP, variance and tail percentiles of a payout distribution (stake 1)
+
+    Args:
+        values: Per-round payouts, or distinct payout values when counts is given
+        counts: Rounds that paid each value
+    """
+    if counts is None:
+        values, counts = payout_distribution(values)
+    values, counts = np.asarray(values, dtype=np.float64), np.asarray(counts, dtype=np.int64)
+    rounds = int(counts.sum())
+    if rounds == 0:
+        return {'rounds': 0}
+    weights = counts / rounds
+    rtp = float((values * weights).sum())
+    variance = float((((values - rtp) ** 2) * weights).sum())
+    cumulative = np.cumsum(counts)
+    percentiles = {
+        f'p{p:g}': float(values[min(np.searchsorted(cumulative, rounds * p / 100.0), len(values) - 1)])
+        for p in PERCENTILES
+    }
+    return {
+        'rounds': rounds,
+        'rtp': rtp,
+        'house_edge': 1.0 - rtp,
+        'variance': variance,
+        'std': variance ** 0.5,
+        'std_error': (variance / rounds) ** 0.5,
+        'hit_rate': float(weights[values > 0].sum()),
+        'percentiles': percentiles,
+        'max': float(values[counts > 0].max())
+    }
+
+
+# ---- per-game payouts (stake 1) ----
+
+def crash_points(rng, count):
+    """Crash points with generate_crash_point's distribution, to the cent"""
+    pick, u = rng.random(count), rng.random(count)
+    points = np.ones(count)
+    lower = 0.0
+    for upper, low, width in CRASH_SEGMENTS:
+        segment = (pick >= lower) & (pick < upper)
+        points[segment] = np.round(low + u[segment] * width, 2)
+        lower = upper
+    return points
+
+
+def crash_payouts(rng, count, cashout=2.0):
+    """Cash out at a fixed multiplier: paid if the round gets there before crashing"""
+    if cashout >= CRASH_FORCED_AT:
+        return np.zeros(count)
+    return np.where(crash_points(rng, count) > cashout, cashout, 0.0)
+
+
+def dice_payouts(digests, target=50.0, prediction='over'):
+    results = dice_results(digests)
+    won = results > target if prediction == 'over' else results < target
+    return np.where(won, dice_multiplier(target, prediction), 0.0)
+
+
+def plinko_buckets(digests, rows=PLINKO_ROWS):
+    """
+    Buckets from digests, the mapping of generate_plinko_path: row i goes
+    right when hex pair i is odd, i.e. when digest byte i is odd
+    """
+    rights = (digests[:, :rows] & 1).sum(axis=1)
+    position = 8 + 2 * rights.astype(np.int64) - rows
+    return np.clip(position, 0, len(MULTIPLIERS['low']) - 1)
+
+
+def plinko_payouts(digests, risk='medium'):
+    return np.asarray(MULTIPLIERS[risk])[plinko_buckets(digests)]
+
+
+def mine_positions(digests, mines):
+    """
+    Mine boards from digests, the mapping of generate_mine_positions: each
+    mine takes the next 16 bits mod 25 and steps right past taken tiles
+
+    Returns:
+        bool array (rounds, 25), True where a mine is
+    """
+    count = len(digests)
+    board = np.zeros((count, MINES_TILES), dtype=bool)
+    rows = np.arange(count)
+    offsets = np.arange(MINES_TILES)
+    for i in range(mines):
+        start = ((digests[:, 2 * i].astype(np.int64) << 8) | digests[:, 2 * i + 1]) % MINES_TILES
+        probe = (start[:, None] + offsets) % MINES_TILES
+        free = np.argmax(~board[rows[:, None], probe], axis=1)
+        board[rows, probe[rows, free]] = True
+    return board
+
+
+def mines_payouts(digests, mines=3, revealed=3, tiles=None, rng=None):
+    """
+    Reveal tiles, then cash out
+
+    Args:
+        tiles: Fixed tiles the player always opens; None picks random tiles each round
+    """
+    board = mine_positions(digests, mines)
+    if tiles is None:
+        rng = rng or np.random.default_rng()
+        picks = np.argsort(rng.random(board.shape), axis=1)[:, :revealed]
+    else:
+        picks = np.broadcast_to(np.asarray(tiles[:revealed]), (len(board), revealed))
+    survived = ~np.take_along_axis(board, picks, axis=1).any(axis=1)
+    return np.where(survived, calculate_multiplier(revealed, MINES_TILES, mines), 0.0)
+
+
+# ---- exact expected RTP ----
+
+def expected_rtp(game, **params):
+    """RTP computed from each game's outcome distribution, no sampling"""
+    params = _params(game, params)
+    if game == 'crash':
+        cashout = params['cashout']
+        if cashout >= CRASH_FORCED_AT:
+            return 0.0
+        # A rounded point beats the cash-out from the next cent up
+        threshold = np.floor(cashout * 100 + 1e-9) / 100 + 0.005
+        survive, lower = 0.0, 0.0
+        for upper, low, width in CRASH_SEGMENTS:
+            if width == 0:
+                survive += (upper - lower) * (low > cashout)
+            else:
+                survive += (upper - lower) * min(max((low + width - threshold) / width, 0.0), 1.0)
+            lower = upper
+        return cashout * survive
+    if game == 'dice':
+        # A 32-bit hash mod DICE_OUTCOMES: the lowest 2^32 % DICE_OUTCOMES rolls are one hash more likely
+        rolls = np.arange(DICE_OUTCOMES)
+        weights = (2 ** 32 // DICE_OUTCOMES + (rolls < 2 ** 32 % DICE_OUTCOMES)) / 2 ** 32
+        results = rolls / 100.0
+        won = results > params['target'] if params['prediction'] == 'over' else results < params['target']
+        return dice_multiplier(params['target'], params['prediction']) * float(weights[won].sum())
+    if game == 'plinko':
+        rights = np.arange(PLINKO_ROWS + 1)
+        probabilities = np.array([comb(PLINKO_ROWS, k) for k in rights]) / 2 ** PLINKO_ROWS
+        buckets = np.clip(8 + 2 * rights - PLINKO_ROWS, 0, len(MULTIPLIERS['low']) - 1)
+        return float((np.asarray(MULTIPLIERS[params['risk']])[buckets] * probabilities).sum())
+    if game == 'mines':
+        # Exact for random picks; fixed tiles also depend on where the hash mapping puts mines
+        mines, revealed = params['mines'], params['revealed']
+        survive = comb(MINES_TILES - mines, revealed) / comb(MINES_TILES, revealed)
+        return calculate_multiplier(revealed, MINES_TILES, mines) * survive
+    raise ValueError(f'Unknown game {game}')
+
+
+# ---- simulation ----
+
+def simulate_chunk(game, params, count, seed):
+    """Play one chunk of rounds; returns its (values, counts) payout distribution"""
+    rng = np.random.default_rng(seed)
+    if game == 'crash':
+        return payout_distribution(crash_payouts(rng, count, params['cashout']))
+
+    server_seed, client_seed = rng.bytes(32).hex(), rng.bytes(8).hex()
+    digests = auto_bet_service.hash_rounds(server_seed, client_seed, 0, count)
+    if game == 'dice':
+        payouts = dice_payouts(digests, params['target'], params['prediction'])
+    elif game == 'plinko':
+        payouts = plinko_payouts(digests, params['risk'])
+    else:
+        payouts = mines_payouts(digests, params['mines'], params['revealed'], params.get('tiles'), rng)
+    return payout_distribution(payouts)
+
+
+def simulate(game, rounds=DEFAULT_ROUNDS, workers=None, seed=None, chunk_rounds=CHUNK_ROUNDS, **params):
+    """
+    Play `rounds` rounds of a game and summarize the payouts
+
+    Args:
+        game: crash, dice, plinko or mines
+        workers: Processes for the chunks; 1 runs in this process, None uses every CPU
+        seed: Seed for reproducible runs
+        params: Game settings - crash: cashout; dice: target, prediction;
+                plinko: risk; mines: mines, revealed, tiles
+
+    Returns:
+        summarize() output plus game, params, expected_rtp, seconds and rounds_per_second
+    """
+    params = _params(game, params)
+    sizes = [chunk_rounds] * (rounds // chunk_rounds)
+    if rounds % chunk_rounds:
+        sizes.append(rounds % chunk_rounds)
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    workers = workers or os.cpu_count() or 1
+
+    started = time.perf_counter()
+    if workers == 1 or len(sizes) == 1:
+        parts = [simulate_chunk(game, params, size, s) for size, s in zip(sizes, seeds)]
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(sizes))) as pool:
+            parts = list(pool.map(simulate_chunk, [game] * len(sizes), [params] * len(sizes), sizes, seeds))
+    seconds = time.perf_counter() - started
+
+    report = summarize(*merge_distributions(parts))
+    report.update({
+        'game': game,
+        'params': params,
+        'expected_rtp': expected_rtp(game, **params),
+        'seconds': seconds,
+        'rounds_per_second': rounds / seconds if seconds else None
+    })
+    logger.info(f"[RTP] {game} {params}: RTP {report['rtp']:.5f} "
+                f"(expected {report['expected_rtp']:.5f}) over {rounds} rounds in {seconds:.1f}s")
+    return report
+
+
+def _params(game, params):
+    if game == 'crash':
+        params = {'cashout': 2.0, **params}
+        if params['cashout'] < 1:
+            raise ValueError('Cash-out must be at least 1.00x')
+    elif game == 'dice':
+        params = {'target': 50.0, 'prediction': 'over', **params}
+        if not 1 <= params['target'] <= 98 or params['prediction'] not in ('over', 'under'):
+            raise ValueError('Dice needs a target between 1 and 98 and prediction over or under')
+    elif game == 'plinko':
+        params = {'risk': 'medium', **params}
+        if params['risk'] not in MULTIPLIERS:
+            raise ValueError('Risk must be low, medium, or high')
+    elif game == 'mines':
+        params = {'mines': 3, 'revealed': 3, 'tiles': None, **params}
+        if not 1 <= params['mines'] <= MINES_MAX:
+            raise ValueError(f'Mines must be between 1 and {MINES_MAX}')
+        if not 1 <= params['revealed'] <= MINES_TILES - params['mines']:
+            raise ValueError('Revealed tiles must fit between the mines')
+        if params['tiles'] is not None and len(set(params['tiles'][:params['revealed']])) < params['revealed']:
+            raise ValueError('Fixed tiles must list enough distinct tiles')
+    else:
+        raise ValueError(f'Unknown game {game}')
+    return params
@@ -1,8 +1,13 @@
 import random
 import json
 from datetime import datetime, timedelta
+from sqlalchemy import and_, delete, exists, func, insert, or_, select, update
 from app.extensions import db
-from app.models.virtual_game import VirtualLeague, VirtualTeam, VirtualGame, VirtualGameStatus
+from app.models.virtual_game import (
+    VirtualLeague, VirtualTeam, VirtualGame, VirtualGameStatus, VirtualSeasonArchive
+)
+from app.services.virtual_pricing import pricing_engine
+from app.services.virtual_simulator import round_simulator
 import logging
 
 logger = logging.getLogger(__name__)
@@ -62,21 +67,53 @@ class VirtualGameService:
             raise
     
     def delete_league(self, league_id):
-        """Delete a league and all its teams/games"""
+        """
+        Delete a league and all its teams/games. Refused before anything is
+        deleted when an unsettled bet still needs one of its games.
+        
+        Returns:
+            {'games_deleted': n, 'teams_deleted': n}
+        """
         try:
             league = VirtualLeague.query.get(league_id)
             if not league:
                 raise ValueError("League not found")
+            if self.league_has_open_bets(league_id):
+                raise ValueError("League has games with unsettled bets")
             
-            db.session.delete(league)
+            games_deleted = self.delete_games(VirtualGame.league_id == league_id)
+            if db.session.query(VirtualGame.id).filter_by(league_id=league_id).first():
+                # A bet was placed on one of the games while they were being deleted
+                raise ValueError("League has games with unsettled bets")
+            teams_deleted = VirtualTeam.query.filter_by(league_id=league_id).delete(synchronize_session=False)
+            VirtualLeague.query.filter_by(id=league_id).delete(synchronize_session=False)
             db.session.commit()
             logger.info(f"[VirtualGame] Deleted league {league_id}")
-            return True
+            return {'games_deleted': games_deleted, 'teams_deleted': teams_deleted}
         except Exception as e:
             db.session.rollback()
             logger.error(f"[VirtualGame] Error deleting league: {e}")
             raise
     
+    def delete_all_leagues(self):
+        """
+        Delete every league through delete_league; leagues with games an
+        unsettled bet still needs are kept
+        
+        Returns:
+            {'leagues_deleted', 'teams_deleted', 'games_deleted', 'leagues_kept': [league ids]}
+        """
+        summary = {'leagues_deleted': 0, 'teams_deleted': 0, 'games_deleted': 0, 'leagues_kept': []}
+        for league_id in db.session.execute(select(VirtualLeague.id).order_by(VirtualLeague.id)).scalars().all():
+            if self.league_has_open_bets(league_id):
+                summary['leagues_kept'].append(league_id)
+                continue
+            counts = self.delete_league(league_id)
+            summary['leagues_deleted'] += 1
+            summary['teams_deleted'] += counts['teams_deleted']
+            summary['games_deleted'] += counts['games_deleted']
+        return summary
+    
     # ================== Team Management ==================
     
     def create_team(self, league_id, name, rating=75):
@@ -142,83 +179,14 @@ class VirtualGameService:
     # ================== Game Generation ==================
     
     def generate_odds(self, home_rating, away_rating):
-        """Generate realistic odds based on team ratings"""
-        rating_diff = home_rating - away_rating
-        
-        # Base odds calculation (FIXED: big rating_diff means home is favorite = LOW odds)
-        if rating_diff > 20:  # Home much stronger
-            home_odds = round(random.uniform(1.20, 1.45), 2)  # Favorite gets LOW odds
-            draw_odds = round(random.uniform(5.00, 6.50), 2)
-            away_odds = round(random.uniform(8.00, 15.00), 2)  # Underdog gets HIGH odds
-        elif rating_diff > 10:  # Home stronger
-            home_odds = round(random.uniform(1.50, 1.85), 2)
-            draw_odds = round(random.uniform(3.80, 4.50), 2)
-            away_odds = round(random.uniform(4.50, 7.00), 2)
-        elif rating_diff > -10:  # Even match
-            home_odds = round(random.uniform(2.20, 2.70), 2)
-            draw_odds = round(random.uniform(3.00, 3.40), 2)
-            away_odds = round(random.uniform(2.40, 2.90), 2)
-        elif rating_diff > -20:  # Away stronger
-            home_odds = round(random.uniform(4.00, 6.50), 2)
-            draw_odds = round(random.uniform(3.80, 4.50), 2)
-            away_odds = round(random.uniform(1.55, 1.90), 2)  # Away favorite
-        else:  # Away much stronger
-            home_odds = round(random.uniform(7.00, 14.00), 2)  # Home underdog
-            draw_odds = round(random.uniform(5.00, 6.50), 2)
-            away_odds = round(random.uniform(1.20, 1.50), 2)  # Away favorite
-        
-        # Calculate derived odds
-        home_draw_odds = round(home_odds * draw_odds / (home_odds + draw_odds - 1), 2)
-        home_away_odds = round(home_odds * away_odds / (home_odds + away_odds - 1), 2)
-        draw_away_odds = round(draw_odds * away_odds / (draw_odds + away_odds - 1), 2)
-        
-        gg_odds = round(random.uniform(1.75, 2.10), 2)
-        ng_odds = round(random.uniform(1.75, 2.10), 2)
-        
-        over15_odds = round(random.uniform(1.20, 1.40), 2)
-        under15_odds = round(random.uniform(3.50, 5.00), 2)
-        over25_odds = round(random.uniform(1.75, 2.10), 2)
-        under25_odds = round(random.uniform(1.75, 2.10), 2)
-        over35_odds = round(random.uniform(2.50, 3.20), 2)
-        under35_odds = round(random.uniform(1.35, 1.60), 2)
-        
-        # Correct score odds (simplified)
-        correct_scores = {
-            "1-0": random.uniform(6.0, 8.0),
-            "2-0": random.uniform(7.0, 9.0),
-            "2-1": random.uniform(7.0, 9.0),
-            "3-0": random.uniform(12.0, 16.0),
-            "3-1": random.uniform(14.0, 18.0),
-            "3-2": random.uniform(20.0, 28.0),
-            "0-0": random.uniform(8.0, 11.0),
-            "1-1": random.uniform(5.5, 7.0),
-            "2-2": random.uniform(12.0, 16.0),
-            "0-1": random.uniform(8.0, 11.0),
-            "0-2": random.uniform(11.0, 15.0),
-            "1-2": random.uniform(9.0, 12.0),
-            "0-3": random.uniform(20.0, 28.0),
-            "1-3": random.uniform(18.0, 24.0),
-            "2-3": random.uniform(25.0, 35.0)
-        }
-        correct_score_odds = {k: round(v, 2) for k, v in correct_scores.items()}
-        
-        return {
-            'home_odds': home_odds,
-            'draw_odds': draw_odds,
-            'away_odds': away_odds,
-            'home_draw_odds': home_draw_odds,
-            'home_away_odds': home_away_odds,
-            'draw_away_odds': draw_away_odds,
-            'gg_odds': gg_odds,
-            'ng_odds': ng_odds,
-            'over15_odds': over15_odds,
-            'under15_odds': under15_odds,
-            'over25_odds': over25_odds,
-            'under25_odds': under25_odds,
-            'over35_odds': over35_odds,
-            'under35_odds': under35_odds,
-            'correct_score_odds': json.dumps(correct_score_odds)
-        }
+        """Generate consistent odds for one game from team ratings (see price_fixtures)"""
+        return pricing_engine.price([home_rating], [away_rating])[0]
+    
+    def price_fixtures(self, pairs):
+        """Odds for many (home_team, away_team) pairs in one vectorized batch"""
+        if not pairs:
+            return []
+        return pricing_engine.price([home.rating for home, _ in pairs], [away.rating for _, away in pairs])
     
     def create_game(self, league_id, home_team_id, away_team_id, scheduled_start, auto_play=True):
         """Create a new virtual game"""
@@ -233,15 +201,7 @@ class VirtualGameService:
             # Generate odds based on team ratings
             odds = self.generate_odds(home_team.rating, away_team.rating)
             
-            game = VirtualGame(
-                league_id=league_id,
-                home_team_id=home_team_id,
-                away_team_id=away_team_id,
-                scheduled_start=scheduled_start,
-                game_duration=league.game_duration_seconds,
-                is_auto_play=auto_play,
-                **odds
-            )
+            game = self._new_game(league, home_team, away_team, scheduled_start, auto_play, odds)
             
             db.session.add(game)
             db.session.commit()
@@ -285,34 +245,212 @@ class VirtualGameService:
             random.seed()  # Reset seed to default random behavior
             
             # Pair teams sequentially: [0 vs 1, 2 vs 3, 4 vs 5, ...]
-            # ALL GAMES START AT THE SAME TIME for synchronized racing
-            for i in range(num_games):
-                home_team = available_teams[i * 2]
-                away_team = available_teams[i * 2 + 1]
-                
-                # ALL games use the SAME scheduled_time for synchronized start
-                game = self.create_game(
-                    league_id=league_id,
-                    home_team_id=home_team.id,
-                    away_team_id=away_team.id,
-                    scheduled_start=start_time,  # ALL use same start time
-                    auto_play=True
-                )
-                games_created.append(game)
+            pairs = [(available_teams[i * 2], available_teams[i * 2 + 1]) for i in range(num_games)]
+            
+            # Price and simulate the whole round in one batch; ALL games use the SAME
+            # scheduled_time for synchronized start and are saved with their timelines
+            # in one commit, ready before kickoff
+            for (home_team, away_team), odds in zip(pairs, self.price_fixtures(pairs)):
+                games_created.append(self._new_game(league, home_team, away_team, start_time, True, odds))
+            self.simulate_round(games_created)
+            db.session.add_all(games_created)
+            db.session.commit()
             
             logger.info(f"[VirtualGame] Scheduled {len(games_created)} unique games for league {league_id} (each team plays once)")
             return games_created
         except Exception as e:
+            db.session.rollback()
             logger.error(f"[VirtualGame] Error scheduling games: {e}")
             raise
     
+    # ================== Season Fixtures ==================
+    
+    # Seconds before the first round of a new season kicks off
+    COUNTDOWN_SECONDS = 180
+    # Break after full time before the next round's countdown starts
+    ROUND_BUFFER_SECONDS = 15
+    
+    def season_fixtures(self, teams):
+        """
+        Double round-robin by the circle method: every team plays every other
+        team once at home and once away, and at most once per round
+        
+        Returns:
+            One list of (home_team, away_team) pairs per round - 2 * (n - 1) rounds
+            for an even n; with an odd n each team gets one bye per half (2 * n rounds)
+        """
+        slots = list(teams) + ([None] if len(teams) % 2 else [])
+        n = len(slots)
+        first_half = []
+        for r in range(n - 1):
+            pairs = []
+            for i in range(n // 2):
+                home, away = slots[i], slots[n - 1 - i]
+                # Alternate the fixed team's venue so it isn't at home every week
+                if i == 0 and r % 2:
+                    home, away = away, home
+                if home is not None and away is not None:
+                    pairs.append((home, away))
+            first_half.append(pairs)
+            slots = [slots[0], slots[-1]] + slots[1:-1]
+        return first_half + [[(away, home) for home, away in pairs] for pairs in first_half]
+    
+    def generate_season(self, league_id, start_time=None):
+        """
+        Generate a league's whole season up front: the round-robin fixture
+        list, every game's odds and goal timeline are computed in one batch
+        and bulk-inserted in one transaction. Round r is scheduled r round
+        intervals after the first, so rounds activate by time at kickoff.
+        
+        Returns:
+            The new season number
+        """
+        try:
+            league = VirtualLeague.query.get(league_id)
+            if not league:
+                raise ValueError("League not found")
+            
+            teams = self.get_league_teams(league_id)
+            if len(teams) < 2:
+                raise ValueError("Need at least 2 teams to schedule games")
+            
+            if not start_time:
+                start_time = datetime.utcnow() + timedelta(seconds=self.COUNTDOWN_SECONDS)
+            
+            # Archived seasons leave the hot table, so number on from both
+            season = max(
+                db.session.query(func.max(model.season_number)).filter_by(league_id=league_id).scalar() or 0
+                for model in (VirtualGame, VirtualSeasonArchive)
+            ) + 1
+            
+            rounds = self.season_fixtures(random.sample(teams, len(teams)))
+            fixtures = [(r, home, away) for r, pairs in enumerate(rounds) for home, away in pairs]
+            pairs = [(home, away) for _, home, away in fixtures]
+            odds = self.price_fixtures(pairs)
+            timelines = self._simulate_events(pairs)
+            
+            interval = timedelta(seconds=self.round_interval_seconds())
+            now = datetime.utcnow()
+            rows = [dict(
+                league_id=league_id,
+                home_team_id=home.id,
+                away_team_id=away.id,
+                season_number=season,
+                round_number=r + 1,
+                scheduled_start=start_time + r * interval,
+                game_duration=league.game_duration_seconds,
+                status=VirtualGameStatus.SCHEDULED.value,
+                is_auto_play=True,
+                events=events,
+                created_at=now,
+                **game_odds
+            ) for (r, home, away), game_odds, events in zip(fixtures, odds, timelines)]
+            
+            db.session.execute(insert(VirtualGame), rows)
+            db.session.commit()
+            
+            logger.info(f"[VirtualGame] Generated season {season} for league {league_id}: "
+                        f"{len(rounds)} rounds, {len(rows)} games")
+            return season
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"[VirtualGame] Error generating season: {e}")
+            raise
+    
+    def round_interval_seconds(self):
+        """Seconds between consecutive rounds' kickoffs: countdown, play, then the break"""
+        return self.COUNTDOWN_SECONDS + self.ROUND_DURATION_SECONDS + self.ROUND_BUFFER_SECONDS
+    
+    def next_round(self, league_id):
+        """(season_number, round_number) of the league's next scheduled season round, or None"""
+        row = db.session.query(VirtualGame.season_number, VirtualGame.round_number).filter(
+            VirtualGame.league_id == league_id,
+            VirtualGame.status == VirtualGameStatus.SCHEDULED.value,
+            VirtualGame.round_number.isnot(None)
+        ).order_by(VirtualGame.season_number, VirtualGame.round_number).first()
+        return tuple(row) if row else None
+    
+    def prepare_next_round(self, league_id, now=None):
+        """
+        Make sure the league has a next round on the clock: generates a new
+        season once the current one is used up, and re-times the remaining
+        rounds from a fresh countdown if the schedule fell behind (e.g. the
+        league sat idle past its slots)
+        
+        Returns:
+            The next round's games
+        """
+        now = now or datetime.utcnow()
+        next_round = self.next_round(league_id)
+        if not next_round:
+            self.generate_season(league_id, now + timedelta(seconds=self.COUNTDOWN_SECONDS))
+        else:
+            first_start = self.next_round_start(league_id, next_round)
+            if first_start and first_start < now:
+                self._retime_rounds(league_id, now + timedelta(seconds=self.COUNTDOWN_SECONDS))
+        return self.get_upcoming_games(league_id)
+    
+    def next_round_start(self, league_id, next_round=None):
+        """Scheduled kickoff of the league's next season round, or None"""
+        next_round = next_round or self.next_round(league_id)
+        if not next_round:
+            return None
+        return db.session.query(func.min(VirtualGame.scheduled_start)).filter_by(
+            league_id=league_id,
+            season_number=next_round[0],
+            round_number=next_round[1]
+        ).scalar()
+    
+    def next_one_off_start(self, league_id):
+        """Earliest scheduled kickoff of the league's one-off games (outside any season), or None"""
+        return db.session.query(func.min(VirtualGame.scheduled_start)).filter(
+            VirtualGame.league_id == league_id,
+            VirtualGame.status == VirtualGameStatus.SCHEDULED.value,
+            VirtualGame.round_number.is_(None)
+        ).scalar()
+    
+    def _retime_rounds(self, league_id, start_time):
+        """Reschedule a league's pending season rounds one interval apart from start_time"""
+        try:
+            rows = db.session.query(VirtualGame.id, VirtualGame.season_number, VirtualGame.round_number).filter(
+                VirtualGame.league_id == league_id,
+                VirtualGame.status == VirtualGameStatus.SCHEDULED.value,
+                VirtualGame.round_number.isnot(None)
+            ).all()
+            order = {key: i for i, key in enumerate(sorted({(season, rnd) for _, season, rnd in rows}))}
+            interval = timedelta(seconds=self.round_interval_seconds())
+            db.session.execute(update(VirtualGame), [
+                {'id': game_id, 'scheduled_start': start_time + order[(season, rnd)] * interval}
+                for game_id, season, rnd in rows
+            ])
+            db.session.commit()
+            logger.info(f"[VirtualGame] Re-timed {len(order)} pending rounds for league {league_id}")
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"[VirtualGame] Error re-timing rounds: {e}")
+            raise
+    
+    def _new_game(self, league, home_team, away_team, scheduled_start, auto_play, odds):
+        return VirtualGame(
+            league_id=league.id,
+            home_team_id=home_team.id,
+            away_team_id=away_team.id,
+            scheduled_start=scheduled_start,
+            game_duration=league.game_duration_seconds,
+            is_auto_play=auto_play,
+            **odds
+        )
+    
     # ================== Game Management ==================
     
     def get_upcoming_games(self, league_id=None, limit=20):
-        """Get upcoming scheduled games"""
+        """Get upcoming scheduled games - only the next round for a league with a generated season"""
         query = VirtualGame.query.filter_by(status=VirtualGameStatus.SCHEDULED.value)
         if league_id:
             query = query.filter_by(league_id=league_id)
+            next_round = self.next_round(league_id)
+            if next_round:
+                query = query.filter_by(season_number=next_round[0], round_number=next_round[1])
         return query.order_by(VirtualGame.scheduled_start).limit(limit).all()
     
     def get_live_games(self, league_id=None):
@@ -379,12 +517,16 @@ class VirtualGameService:
             raise
     
     def finish_game(self, game_id):
-        """Finish a virtual game"""
+        """Finish a virtual game - with its simulated result unless an admin set the score"""
         try:
             game = VirtualGame.query.get(game_id)
             if not game:
                 raise ValueError("Game not found")
             
+            if game.status == VirtualGameStatus.FINISHED.value:
+                raise ValueError("Game is already finished")
+            if game.events and not game.result_set_manually:
+                self._apply_timeline(game)
             game.status = VirtualGameStatus.FINISHED.value
             game.finished_at = datetime.utcnow()
             game.current_minute = 90
@@ -401,61 +543,212 @@ class VirtualGameService:
             logger.error(f"[VirtualGame] Error finishing game: {e}")
             raise
     
+    def simulate_round(self, games):
+        """
+        Draw every game's goal timeline in one batch from the pricing model and
+        store it in `events`; scores are read from the timeline at full time.
+        The caller commits.
+        """
+        for game, events in zip(games, self._simulate_events([(game.home_team, game.away_team) for game in games])):
+            game.events = events
+        return games
+    
+    def _simulate_events(self, pairs):
+        """Goal timelines (JSON) for many (home_team, away_team) pairs in one batch"""
+        goals_per_game = round_simulator.simulate(
+            [home.rating if home else 75 for home, _ in pairs],
+            [away.rating if away else 75 for _, away in pairs]
+        )
+        return [json.dumps(self._goal_events(goals)) for goals in goals_per_game]
+    
     def simulate_game_auto(self, game_id):
-        """Auto-simulate a game result based on team ratings"""
+        """Auto-simulate a game result from the pricing model and finish it in one transaction"""
         try:
             game = VirtualGame.query.get(game_id)
             if not game:
                 raise ValueError("Game not found")
             
-            home_team = game.home_team
-            away_team = game.away_team
-            
-            # Calculate goal probabilities based on ratings (more strict/realistic)
-            rating_diff = home_team.rating - away_team.rating
+            if game.status != VirtualGameStatus.SCHEDULED.value:
+                raise ValueError("Game is not in scheduled status")
             
-            # Home goals (0-4) - reduced base probability for more realistic scores
-            home_base_prob = 1.0 + (rating_diff / 40)  # Lower base and less rating impact
-            home_goals = min(4, max(0, int(random.gauss(home_base_prob, 0.9))))  # Tighter distribution
+            now = datetime.utcnow()
+            if not game.events:
+                self.simulate_round([game])
+            self._apply_timeline(game)
+            game.actual_start = now
+            game.status = VirtualGameStatus.FINISHED.value
+            game.finished_at = now
             
-            # Away goals (0-4) - reduced base probability
-            away_base_prob = 1.0 - (rating_diff / 40)  # Lower base and less rating impact
-            away_goals = min(4, max(0, int(random.gauss(away_base_prob, 0.9))))  # Tighter distribution
+            db.session.commit()
             
-            # Extra strictness: reduce by 1 if both scores are high
-            if home_goals + away_goals > 5:
-                if random.random() < 0.6:  # 60% chance to reduce one score
-                    if home_goals > away_goals:
-                        home_goals = max(0, home_goals - 1)
-                    else:
-                        away_goals = max(0, away_goals - 1)
+            # Settle bets for this game
+            self._settle_game_bets(game)
             
-            # Half-time scores (roughly 35-45% of full-time)
-            ht_home = int(home_goals * random.uniform(0.35, 0.45))
-            ht_away = int(away_goals * random.uniform(0.35, 0.45))
+            logger.info(f"[VirtualGame] Auto-simulated game {game_id}: {game.home_score}-{game.away_score}")
+            return game
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"[VirtualGame] Error auto-simulating game: {e}")
+            raise
+    
+    # ================== Round Timeline ==================
+    
+    # Real seconds a round plays for (the web UI runs 90 virtual minutes at 5 per second)
+    ROUND_DURATION_SECONDS = 18
+    
+    def build_timeline(self, home_goals, away_goals, ht_home, ht_away):
+        """Spread a simulated score into goal events by minute, consistent with the half-time score"""
+        events = []
+        for team, first_half, total in (('home', ht_home, home_goals), ('away', ht_away, away_goals)):
+            minutes = random.sample(range(1, 46), first_half) + random.sample(range(46, 91), total - first_half)
+            events.extend((m, team) for m in minutes)
+        
+        return self._goal_events(sorted(events, key=lambda goal: goal[0]))
+    
+    def _goal_events(self, goals):
+        """[(minute, team), ...] in minute order -> goal events carrying the running score"""
+        events = []
+        home = away = 0
+        for minute, team in goals:
+            if team == 'home':
+                home += 1
+            else:
+                away += 1
+            events.append({'minute': minute, 'team': team, 'type': 'goal', 'score': [home, away]})
+        return events
+    
+    def _apply_timeline(self, game):
+        """Set a game's full-time and half-time scores from its stored timeline"""
+        events = json.loads(game.events) if game.events else []
+        goals = [e for e in events if e.get('type') == 'goal']
+        game.home_score = sum(1 for e in goals if e['team'] == 'home')
+        game.away_score = sum(1 for e in goals if e['team'] == 'away')
+        game.ht_home_score = sum(1 for e in goals if e['team'] == 'home' and e['minute'] <= 45)
+        game.ht_away_score = sum(1 for e in goals if e['team'] == 'away' and e['minute'] <= 45)
+        game.current_minute = 90
+    
+    # Kickoff requests may arrive this many seconds before a round's slot (client clock skew)
+    KICKOFF_GRACE_SECONDS = 5
+    
+    def kickoff_round(self, league_id, now=None):
+        """
+        Kick off the league's next round
+        
+        With a generated season that is the next round once its scheduled
+        start has arrived - its odds and timelines already exist, so kickoff
+        is only a status flip - together with any one-off games that are due.
+        Otherwise every scheduled game in the league is kicked off. Games are claimed with one conditional UPDATE so
+        concurrent callers cannot kick off the same round twice; games
+        without a precomputed goal timeline are simulated in the same
+        transaction.
+        
+        Returns:
+            The games kicked off by this call (empty if none were due)
+        """
+        try:
+            now = now or datetime.utcnow()
+            query = db.session.query(VirtualGame.id).filter_by(
+                league_id=league_id,
+                status=VirtualGameStatus.SCHEDULED.value
+            )
+            next_round = self.next_round(league_id)
+            if next_round:
+                query = query.filter(
+                    or_(
+                        and_(VirtualGame.season_number == next_round[0],
+                             VirtualGame.round_number == next_round[1]),
+                        VirtualGame.round_number.is_(None)
+                    ),
+                    VirtualGame.scheduled_start <= now + timedelta(seconds=self.KICKOFF_GRACE_SECONDS)
+                )
+            ids = [gid for (gid,) in query.all()]
+            if not ids:
+                return []
             
-            # Start the game
-            self.start_game(game_id)
+            claimed = VirtualGame.query.filter(
+                VirtualGame.id.in_(ids),
+                VirtualGame.status == VirtualGameStatus.SCHEDULED.value
+            ).update({
+                VirtualGame.status: VirtualGameStatus.LIVE.value,
+                VirtualGame.actual_start: now,
+                VirtualGame.current_minute: 0
+            }, synchronize_session=False)
+            if claimed != len(ids):
+                db.session.rollback()
+                return []
             
-            # Update with final scores
-            game.home_score = home_goals
-            game.away_score = away_goals
-            game.ht_home_score = ht_home
-            game.ht_away_score = ht_away
-            game.current_minute = 90
+            games = VirtualGame.query.filter(VirtualGame.id.in_(ids)).all()
+            # Rounds are simulated when scheduled; games created one by one are simulated now
+            self.simulate_round([game for game in games if not game.events])
             
             db.session.commit()
+            logger.info(f"[VirtualGame] Kicked off {len(games)} games for league {league_id}")
+            return games
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"[VirtualGame] Error kicking off round: {e}")
+            raise
+    
+    def complete_round(self, league_id):
+        """
+        Finish a league's live games from their stored timelines and settle bets
+        
+        Claims the games with one conditional UPDATE like kickoff_round, so a
+        round is only ever finished and settled once.
+        """
+        try:
+            now = datetime.utcnow()
+            games = self.get_live_games(league_id)
+            if not games:
+                return []
             
-            # Finish the game
-            self.finish_game(game_id)
+            claimed = VirtualGame.query.filter(
+                VirtualGame.id.in_([game.id for game in games]),
+                VirtualGame.status == VirtualGameStatus.LIVE.value
+            ).update({
+                VirtualGame.status: VirtualGameStatus.FINISHED.value,
+                VirtualGame.finished_at: now
+            }, synchronize_session=False)
+            if claimed != len(games):
+                db.session.rollback()
+                return []
             
-            logger.info(f"[VirtualGame] Auto-simulated game {game_id}: {home_goals}-{away_goals}")
-            return game
+            for game in games:
+                self._apply_timeline(game)
+                game.status = VirtualGameStatus.FINISHED.value
+                game.finished_at = now
+            
+            db.session.commit()
+            logger.info(f"[VirtualGame] Completed {len(games)} games for league {league_id}")
+            
+            if games:
+                for game in games:
+                    self._settle_game_bets(game)
+                self.settle_all_virtual_bets()
+            return games
         except Exception as e:
             db.session.rollback()
-            logger.error(f"[VirtualGame] Error auto-simulating game: {e}")
+            logger.error(f"[VirtualGame] Error completing round: {e}")
             raise
     
+    def round_payload(self, games):
+        """Kickoff message for a round: schedule plus each game's goal timeline"""
+        if not games:
+            return None
+        kickoff = min(g.actual_start for g in games if g.actual_start)
+        return {
+            'league_id': games[0].league_id,
+            'kickoff_at': kickoff.isoformat() + 'Z',
+            'server_time': datetime.utcnow().isoformat() + 'Z',
+            'duration_seconds': self.ROUND_DURATION_SECONDS,
+            'games': [{
+                'id': g.id,
+                'home_team': g.home_team.name if g.home_team else 'Unknown',
+                'away_team': g.away_team.name if g.away_team else 'Unknown',
+                'timeline': json.loads(g.events) if g.events else []
+            } for g in games]
+        }
+    
     def _settle_game_bets(self, game):
         """Settle all bets for a finished game"""
         from app.models import Bet, BetStatus
@@ -557,21 +850,98 @@ class VirtualGameService:
             logger.error(f"[VirtualGame] Error deleting game: {e}")
             raise
     
+    # Games removed per DELETE statement / transaction
+    DELETE_CHUNK_SIZE = 1000
+    
+    def delete_games(self, *criteria, chunk_size=None):
+        """
+        Delete the games matching the criteria with set-based DELETEs, one
+        chunk of ids per transaction, without loading them into the session.
+        Games an unsettled bet still depends on are kept so it can settle:
+        singles are excluded in SQL, accumulator legs (JSON selections) per
+        chunk.
+        
+        Returns:
+            Number of games deleted
+        """
+        from app.models import Bet
+        
+        chunk_size = chunk_size or self.DELETE_CHUNK_SIZE
+        candidates = (
+            select(VirtualGame.id)
+            .where(*criteria, ~exists().where(self._open_virtual_bet(), Bet.match_id == VirtualGame.id))
+            .order_by(VirtualGame.id)
+            .limit(chunk_size)
+        )
+        legs = self.open_bet_game_ids(singles=False)
+        
+        deleted = 0
+        after = 0
+        while True:
+            scanned = db.session.execute(candidates.where(VirtualGame.id > after)).scalars().all()
+            if not scanned:
+                break
+            after = scanned[-1]
+            ids = [game_id for game_id in scanned if game_id not in legs]
+            if ids:
+                try:
+                    db.session.execute(
+                        delete(VirtualGame).where(VirtualGame.id.in_(ids)),
+                        execution_options={'synchronize_session': False}
+                    )
+                    db.session.commit()
+                except Exception:
+                    db.session.rollback()
+                    raise
+                deleted += len(ids)
+            if len(scanned) < chunk_size:
+                break
+        return deleted
+    
+    def league_has_open_bets(self, league_id):
+        """Whether an unsettled bet still needs one of the league's games"""
+        from app.models import Bet
+        
+        if db.session.query(Bet.id).join(VirtualGame, VirtualGame.id == Bet.match_id).filter(
+                VirtualGame.league_id == league_id, self._open_virtual_bet()).first():
+            return True
+        legs = self.open_bet_game_ids(singles=False)
+        return bool(legs) and db.session.query(VirtualGame.id).filter(
+            VirtualGame.league_id == league_id, VirtualGame.id.in_(legs)).first() is not None
+    
+    def open_bet_game_ids(self, singles=True):
+        """
+        Ids of virtual games that pending or active bets still need for
+        settlement (singles=False: only accumulator legs)
+        """
+        from app.models import Bet
+        
+        ids = set()
+        for match_id, selection in db.session.query(Bet.match_id, Bet.selection).filter(self._open_virtual_bet()):
+            if match_id and singles:
+                ids.add(match_id)
+            try:
+                selections = json.loads(selection) if selection else []
+            except ValueError:
+                continue  # single bet: the selection is a plain label
+            if isinstance(selections, list):
+                ids.update(int(sel['game_id']) for sel in selections
+                           if isinstance(sel, dict) and sel.get('game_id') is not None)
+        return ids
+    
+    def _open_virtual_bet(self):
+        """Filter for pending or active virtual bets"""
+        from app.models import Bet, BetStatus
+        return (Bet.bet_type == 'virtual') & Bet.status.in_([BetStatus.PENDING.value, BetStatus.ACTIVE.value])
+    
     def clear_all_games(self, league_id=None):
-        """Clear all games for a league or all leagues"""
+        """Clear all games for a league or all leagues; returns the number deleted"""
         try:
-            if league_id:
-                games = VirtualGame.query.filter_by(league_id=league_id).all()
-                logger.info(f"[VirtualGame] Clearing {len(games)} games for league {league_id}")
-            else:
-                games = VirtualGame.query.all()
-                logger.info(f"[VirtualGame] Clearing all {len(games)} games")
-            
-            for game in games:
-                db.session.delete(game)
-            
-            db.session.commit()
-            return len(games)
+            criteria = [VirtualGame.league_id == league_id] if league_id else []
+            deleted = self.delete_games(*criteria)
+            scope = f"league {league_id}" if league_id else "all leagues"
+            logger.info(f"[VirtualGame] Cleared {deleted} games from {scope}")
+            return deleted
         except Exception as e:
             db.session.rollback()
             logger.error(f"[VirtualGame] Error clearing games: {e}")
@@ -584,7 +954,7 @@ class VirtualGameService:
             logger.info(f"[VirtualGame] Reset league {league_id}: deleted {games_deleted} games")
             return {
                 'games_deleted': games_deleted,
-                'teams_count': len(self.get_league_teams(league_id))
+                'teams_count': VirtualTeam.query.filter_by(league_id=league_id).count()
             }
         except Exception as e:
             logger.error(f"[VirtualGame] Error resetting league: {e}")
@@ -697,4 +1067,8 @@ class VirtualGameService:
             if selection == 'under' and total_goals < 2.5:
                 return True
         
+        # Correct Score
+        elif market == 'cs':
+            return selection.replace(' ', '') == f'{home_score}-{away_score}'
+        
         return False
@@ -0,0 +1,123 @@
+"""
+Virtual Pricing Engine - consistent virtual game odds from one score model
+Team ratings give each side a Poisson goal rate; the two rates give the
+full score-probability matrix, and every market (1X2, double chance, BTTS,
+over/under, correct score) is priced from that same matrix with one
+bookmaker margin, so prices can never be combined into an arbitrage.
+Whole rounds or seasons are priced in a single NumPy batch.
+"""
+import json
+import math
+import os
+
+import numpy as np
+
+DEFAULT_MARGIN = 0.06  # overround per market; override with VIRTUAL_ODDS_MARGIN
+MAX_GOALS = 10  # matrix covers 0..MAX_GOALS goals per side
+BASE_GOALS = 1.3  # expected goals per side for evenly rated teams on neutral ground
+HOME_ADVANTAGE = 1.1  # home goal-rate multiplier (away side divides by it)
+RATING_SCALE = 50.0  # rating points for an e-fold change in the goal-rate ratio
+MIN_ODDS = 1.01
+MAX_ODDS = 500.0
+
+# Correct scores offered on virtual games
+CORRECT_SCORES = ('1-0', '2-0', '2-1', '3-0', '3-1', '3-2', '0-0', '1-1', '2-2',
+                  '0-1', '0-2', '1-2', '0-3', '1-3', '2-3')
+
+
+class PricingEngine:
+    """Poisson score-matrix pricing for batches of virtual fixtures"""
+
+    def __init__(self, margin=None, max_goals=MAX_GOALS):
+        if margin is None:
+            margin = float(os.environ.get('VIRTUAL_ODDS_MARGIN') or DEFAULT_MARGIN)
+        self.margin = margin
+        self.max_goals = max_goals
+        goals = np.arange(max_goals + 1)
+        self._goals = goals
+        self._log_factorial = np.array([math.lgamma(k + 1) for k in goals])
+        home, away = np.meshgrid(goals, goals, indexing='ij')
+        self._home_goals, self._away_goals = home, away
+        self._total_goals = home + away
+
+    def goal_rates(self, home_ratings, away_ratings):
+        """Expected goals (home, away) as arrays, one entry per fixture"""
+        diff = (np.asarray(home_ratings, dtype=float) - np.asarray(away_ratings, dtype=float)) / RATING_SCALE
+        return BASE_GOALS * HOME_ADVANTAGE * np.exp(diff), BASE_GOALS / HOME_ADVANTAGE * np.exp(-diff)
+
+    def score_matrix(self, home_rates, away_rates):
+        """
+        Score probabilities, shape (fixtures, goals, goals); [n, h, a] is the
+        probability fixture n ends h-a. Tail mass beyond max_goals is folded
+        back in by renormalizing.
+        """
+        home_pmf = self._poisson(np.atleast_1d(home_rates))
+        away_pmf = self._poisson(np.atleast_1d(away_rates))
+        matrix = home_pmf[:, :, None] * away_pmf[:, None, :]
+        return matrix / matrix.sum(axis=(1, 2), keepdims=True)
+
+    def market_probabilities(self, matrix):
+        """True (margin-free) probability of every priced outcome, as arrays over fixtures"""
+        home, away, total = self._home_goals, self._away_goals, self._total_goals
+        probabilities = {
+            'home': (matrix * (home > away)).sum(axis=(1, 2)),
+            'draw': (matrix * (home == away)).sum(axis=(1, 2)),
+            'away': (matrix * (home < away)).sum(axis=(1, 2)),
+            'gg': (matrix * ((home > 0) & (away > 0))).sum(axis=(1, 2))
+        }
+        probabilities['ng'] = 1 - probabilities['gg']
+        for line in (1, 2, 3):
+            probabilities[f'over{line}5'] = (matrix * (total > line)).sum(axis=(1, 2))
+            probabilities[f'under{line}5'] = 1 - probabilities[f'over{line}5']
+        for score in CORRECT_SCORES:
+            h, a = (int(goals) for goals in score.split('-'))
+            probabilities[score] = matrix[:, h, a]
+        return probabilities
+
+    def price(self, home_ratings, away_ratings):
+        """
+        Odds for a batch of fixtures
+
+        Args:
+            home_ratings, away_ratings: Sequences of team ratings, one per fixture
+
+        Returns:
+            One dict of VirtualGame odds columns per fixture
+        """
+        p = self.market_probabilities(self.score_matrix(*self.goal_rates(home_ratings, away_ratings)))
+        odds = {
+            'home_odds': self._odds(p['home']),
+            'draw_odds': self._odds(p['draw']),
+            'away_odds': self._odds(p['away']),
+            'home_draw_odds': self._odds(p['home'] + p['draw']),
+            'home_away_odds': self._odds(p['home'] + p['away']),
+            'draw_away_odds': self._odds(p['draw'] + p['away']),
+            'gg_odds': self._odds(p['gg']),
+            'ng_odds': self._odds(p['ng'])
+        }
+        for line in (1, 2, 3):
+            odds[f'over{line}5_odds'] = self._odds(p[f'over{line}5'])
+            odds[f'under{line}5_odds'] = self._odds(p[f'under{line}5'])
+        correct_scores = {score: self._odds(p[score]) for score in CORRECT_SCORES}
+
+        return [
+            dict(
+                {column: float(values[n]) for column, values in odds.items()},
+                correct_score_odds=json.dumps({score: float(values[n]) for score, values in correct_scores.items()})
+            )
+            for n in range(len(p['home']))
+        ]
+
+    def _poisson(self, rates):
+        """Poisson pmf over 0..max_goals for each rate, shape (len(rates), goals)"""
+        log_rates = np.log(np.maximum(rates, 1e-9))[:, None]
+        return np.exp(self._goals * log_rates - rates[:, None] - self._log_factorial)
+
+    def _odds(self, probability):
+        """Decimal odds with the margin, rounded down to 2 places and clamped"""
+        with np.errstate(divide='ignore'):
+            odds = 1.0 / (np.asarray(probability) * (1 + self.margin))
+        return np.clip(np.floor(odds * 100) / 100, MIN_ODDS, MAX_ODDS)
+
+
+pricing_engine = PricingEngine()
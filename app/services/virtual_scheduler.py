@@ -0,0 +1,119 @@
+"""
+Virtual Scheduler - server-side round clock for every virtual league
+One loop advances all active leagues through countdown, kickoff, full time
+and settlement on the schedule generated with each season, kicks off any
+one-off games an admin scheduled once they are due, and archives each
+season as it closes; browsers only watch the kickoff and result pushes.
+Each league keeps the time of its next event in memory, so a tick only
+touches the database for leagues that are due. Kickoff and full time claim
+their games with conditional UPDATEs, so a second scheduler by mistake
+can't double-settle a round.
+
+Run it as one process alongside the web app (scripts/run_virtual_scheduler.py);
+pushes reach web clients through the Socket.IO message queue.
+"""
+import logging
+import os
+from datetime import datetime, timedelta
+
+from app import socketio
+from app.extensions import db
+from app.models.virtual_game import VirtualLeague
+from app.services.virtual_game_service import VirtualGameService
+from app.services.virtual_season_archive import archive_finished_seasons
+from app.websocket_events import broadcast_virtual_kickoff, broadcast_virtual_result
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TICK_SECONDS = 1.0  # override with VIRTUAL_SCHEDULER_TICK
+RETRY_SECONDS = 10  # back-off for a league whose step failed
+
+
+class VirtualScheduler:
+    """Drives every active virtual league's rounds from one loop"""
+
+    def __init__(self, service=None, tick_seconds=None):
+        if tick_seconds is None:
+            tick_seconds = float(os.environ.get('VIRTUAL_SCHEDULER_TICK') or DEFAULT_TICK_SECONDS)
+        self.service = service or VirtualGameService()
+        self.tick_seconds = tick_seconds
+        self._due = {}  # league_id -> datetime of its next event
+
+    def tick(self, now=None):
+        """Advance every league whose next event is due; returns {league_id: action}"""
+        now = now or datetime.utcnow()
+        league_ids = [lid for (lid,) in db.session.query(VirtualLeague.id).filter_by(is_active=True).all()]
+        self._due = {lid: due for lid, due in self._due.items() if lid in league_ids}
+
+        actions = {}
+        for league_id in league_ids:
+            due = self._due.get(league_id)
+            if due and due > now:
+                continue
+            try:
+                action, self._due[league_id] = self.advance(league_id, now)
+                if action:
+                    actions[league_id] = action
+            except Exception as e:
+                db.session.rollback()
+                self._due[league_id] = now + timedelta(seconds=RETRY_SECONDS)
+                logger.error(f"[VirtualScheduler] Error advancing league {league_id}: {e}")
+        return actions
+
+    def advance(self, league_id, now):
+        """
+        Take a league one step through its round cycle
+
+        Returns:
+            (action taken or None, time of the league's next event)
+        """
+        duration = timedelta(seconds=self.service.ROUND_DURATION_SECONDS)
+
+        live = self.service.get_live_games(league_id)
+        if live:
+            full_time = min(game.actual_start or now for game in live) + duration
+            if now < full_time:
+                return None, full_time
+            games = self.service.complete_round(league_id)
+            if games:
+                broadcast_virtual_result(league_id, games)
+            return 'full_time', now
+
+        # A new season once the last one is used up; a fresh countdown if we fell
+        # more than a round behind (e.g. the scheduler was down)
+        start = self.service.next_round_start(league_id)
+        stale = timedelta(seconds=self.service.round_interval_seconds())
+        if start is None or start < now - stale:
+            if start is None:
+                # Season close: pack the finished season out of the hot table
+                archive_finished_seasons(league_id)
+            self.service.prepare_next_round(league_id, now)
+            return ('new_season' if start is None else 'retimed'), self.service.next_round_start(league_id)
+
+        # One-off games (created outside the season) kick off with the round or on their own
+        one_off = self.service.next_one_off_start(league_id)
+        due = min(start, one_off) if one_off else start
+        if due > now:
+            return None, due
+        games = self.service.kickoff_round(league_id, now)
+        if not games:
+            return None, now + timedelta(seconds=self.tick_seconds)
+        broadcast_virtual_kickoff(self.service.round_payload(games))
+        return 'kickoff', now + duration
+
+    def run(self, app):
+        """Tick forever inside the app context"""
+        logger.info(f"[VirtualScheduler] Running every {self.tick_seconds}s")
+        while True:
+            with app.app_context():
+                try:
+                    for league_id, action in self.tick().items():
+                        logger.info(f"[VirtualScheduler] League {league_id}: {action}")
+                except Exception as e:
+                    logger.error(f"[VirtualScheduler] Tick error: {e}")
+                finally:
+                    db.session.remove()
+            socketio.sleep(self.tick_seconds)
+
+
+virtual_scheduler = VirtualScheduler()
@@ -0,0 +1,237 @@
+"""
+Virtual Season Archive - pack finished seasons out of the hot games table
+When every game of a league's season is finished (and no open bet still
+needs one), the season is compressed into a single virtual_season_archive
+row: team ids, rounds, scores and the full odds matrix as NumPy arrays
+stored as bytes, plus the final table. The per-game rows are deleted in the
+same transaction. Historical standings and head-to-head records are read
+back from the packed arrays with vectorized filters.
+"""
+import json
+import logging
+from datetime import datetime
+
+import numpy as np
+from sqlalchemy import select, delete, func, case
+
+from app.extensions import db
+from app.models.virtual_game import VirtualGame, VirtualGameStatus, VirtualTeam, VirtualSeasonArchive
+from app.services.virtual_pricing import CORRECT_SCORES
+
+logger = logging.getLogger(__name__)
+
+# Scalar odds columns, then one column per correct score
+ODDS_COLUMNS = (
+    'home_odds', 'draw_odds', 'away_odds', 'home_draw_odds', 'home_away_odds', 'draw_away_odds',
+    'gg_odds', 'ng_odds', 'over15_odds', 'under15_odds', 'over25_odds', 'under25_odds',
+    'over35_odds', 'under35_odds'
+)
+TEAM_DTYPE = np.int32
+ROUND_DTYPE = np.int16
+SCORE_DTYPE = np.int8
+ODDS_DTYPE = np.float32
+
+
+def pack(values, dtype):
+    return np.ascontiguousarray(values, dtype=dtype).tobytes()
+
+
+def unpack(blob, dtype, columns=None):
+    array = np.frombuffer(blob, dtype=dtype)
+    return array.reshape(-1, columns) if columns else array
+
+
+def standings_table(home_ids, away_ids, home_goals, away_goals, names):
+    """
+    League table from per-game arrays, sorted by points, goal difference,
+    goals scored, then name
+
+    Args:
+        home_ids, away_ids, home_goals, away_goals: One entry per finished game
+        names: {team_id: name} - every team listed, even without games
+    """
+    home_ids, away_ids = np.asarray(home_ids, dtype=np.int64), np.asarray(away_ids, dtype=np.int64)
+    home_goals, away_goals = np.asarray(home_goals, dtype=np.int64), np.asarray(away_goals, dtype=np.int64)
+    ids = np.union1d(np.fromiter(names, dtype=np.int64, count=len(names)), np.concatenate([home_ids, away_ids]))
+    home, away, n = np.searchsorted(ids, home_ids), np.searchsorted(ids, away_ids), len(ids)
+
+    def per_team(home_values, away_values):
+        return np.bincount(home, weights=home_values, minlength=n) + np.bincount(away, weights=away_values, minlength=n)
+
+    ones = np.ones(len(home_ids))
+    played = per_team(ones, ones)
+    won = per_team(home_goals > away_goals, away_goals > home_goals)
+    drawn = per_team(home_goals == away_goals, home_goals == away_goals)
+    gf = per_team(home_goals, away_goals)
+    ga = per_team(away_goals, home_goals)
+
+    rows = [{
+        'name': names.get(int(team_id), 'Unknown'),
+        'played': int(played[i]),
+        'won': int(won[i]),
+        'drawn': int(drawn[i]),
+        'lost': int(played[i] - won[i] - drawn[i]),
+        'gf': int(gf[i]),
+        'ga': int(ga[i]),
+        'pts': int(3 * won[i] + drawn[i])
+    } for i, team_id in enumerate(ids)]
+    return sorted(rows, key=lambda x: (-x['pts'], -(x['gf'] - x['ga']), -x['gf'], x['name']))
+
+
+def archive_finished_seasons(league_id=None):
+    """
+    Pack every fully finished season into the archive, one transaction each
+
+    Seasons with a game that an open bet still depends on stay in the hot
+    table until the bet settles.
+
+    Returns:
+        Number of seasons archived
+    """
+    from app.services.virtual_game_service import VirtualGameService
+
+    unfinished = func.sum(case((VirtualGame.status != VirtualGameStatus.FINISHED.value, 1), else_=0))
+    query = (
+        select(VirtualGame.league_id, VirtualGame.season_number)
+        .where(VirtualGame.season_number.isnot(None))
+        .group_by(VirtualGame.league_id, VirtualGame.season_number)
+        .having(unfinished == 0)
+        .order_by(VirtualGame.league_id, VirtualGame.season_number)
+    )
+    if league_id:
+        query = query.where(VirtualGame.league_id == league_id)
+    seasons = db.session.execute(query).all()
+    if not seasons:
+        return 0
+
+    open_bet_games = VirtualGameService().open_bet_game_ids()
+    archived = 0
+    for season_league_id, season_number in seasons:
+        try:
+            if archive_season(season_league_id, season_number, open_bet_games):
+                archived += 1
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"[VirtualArchive] Failed to archive league {season_league_id} "
+                         f"season {season_number}: {e}")
+    return archived
+
+
+def archive_season(league_id, season_number, open_bet_games=()):
+    """Pack one finished season and delete its game rows; False if an open bet still needs it"""
+    columns = [VirtualGame.id, VirtualGame.round_number, VirtualGame.home_team_id, VirtualGame.away_team_id,
+               VirtualGame.home_score, VirtualGame.away_score, VirtualGame.ht_home_score,
+               VirtualGame.ht_away_score, VirtualGame.actual_start, VirtualGame.finished_at,
+               VirtualGame.correct_score_odds] + [getattr(VirtualGame, name) for name in ODDS_COLUMNS]
+    season = (VirtualGame.league_id == league_id, VirtualGame.season_number == season_number)
+    rows = db.session.execute(
+        select(*columns).where(*season).order_by(VirtualGame.round_number, VirtualGame.id)
+    ).all()
+    if not rows or any(row.id in open_bet_games for row in rows):
+        return False
+
+    names = {team_id: name for team_id, name in db.session.execute(
+        select(VirtualTeam.id, VirtualTeam.name).where(VirtualTeam.league_id == league_id)
+    )}
+    home_ids = [row.home_team_id for row in rows]
+    away_ids = [row.away_team_id for row in rows]
+    scores = [[row.home_score or 0, row.away_score or 0, -1 if row.ht_home_score is None else row.ht_home_score,
+               -1 if row.ht_away_score is None else row.ht_away_score] for row in rows]
+    odds = [[getattr(row, name) or np.nan for name in ODDS_COLUMNS] + _correct_score_odds(row.correct_score_odds)
+            for row in rows]
+    standings = standings_table(home_ids, away_ids, [s[0] for s in scores], [s[1] for s in scores], names)
+    starts = [row.actual_start for row in rows if row.actual_start]
+    finishes = [row.finished_at for row in rows if row.finished_at]
+
+    db.session.add(VirtualSeasonArchive(
+        league_id=league_id,
+        season_number=season_number,
+        games_count=len(rows),
+        teams=json.dumps({str(team_id): names.get(team_id, 'Unknown') for team_id in set(home_ids + away_ids)}),
+        round_numbers=pack([row.round_number for row in rows], ROUND_DTYPE),
+        home_team_ids=pack(home_ids, TEAM_DTYPE),
+        away_team_ids=pack(away_ids, TEAM_DTYPE),
+        scores=pack(scores, SCORE_DTYPE),
+        odds_columns=json.dumps(list(ODDS_COLUMNS) + [f'cs:{score}' for score in CORRECT_SCORES]),
+        odds=pack(odds, ODDS_DTYPE),
+        standings=json.dumps(standings),
+        started_at=min(starts) if starts else None,
+        finished_at=max(finishes) if finishes else None,
+        archived_at=datetime.utcnow()
+    ))
+    db.session.execute(delete(VirtualGame).where(*season), execution_options={'synchronize_session': False})
+    db.session.commit()
+    logger.info(f"[VirtualArchive] Archived league {league_id} season {season_number}: {len(rows)} games")
+    return True
+
+
+def _correct_score_odds(blob):
+    try:
+        odds = json.loads(blob) if blob else {}
+    except ValueError:
+        odds = {}
+    return [odds.get(score) or np.nan for score in CORRECT_SCORES]
+
+
+def season_standings(league_id, season_number):
+    """Final table of an archived season, or None if it isn't archived"""
+    standings = db.session.execute(
+        select(VirtualSeasonArchive.standings).where(
+            VirtualSeasonArchive.league_id == league_id,
+            VirtualSeasonArchive.season_number == season_number
+        )
+    ).scalar()
+    return json.loads(standings) if standings else None
+
+
+def head_to_head(league_id, team_a, team_b):
+    """
+    Every meeting of two teams across archived seasons and the games still in
+    the hot table, oldest first, with a summary from team_a's side
+    """
+    games = []
+    archives = db.session.execute(
+        select(VirtualSeasonArchive.season_number, VirtualSeasonArchive.round_numbers,
+               VirtualSeasonArchive.home_team_ids, VirtualSeasonArchive.away_team_ids,
+               VirtualSeasonArchive.scores)
+        .where(VirtualSeasonArchive.league_id == league_id)
+        .order_by(VirtualSeasonArchive.season_number)
+    ).all()
+    for archive in archives:
+        home, away = unpack(archive.home_team_ids, TEAM_DTYPE), unpack(archive.away_team_ids, TEAM_DTYPE)
+        meetings = np.flatnonzero(((home == team_a) & (away == team_b)) | ((home == team_b) & (away == team_a)))
+        if not len(meetings):
+            continue
+        rounds, scores = unpack(archive.round_numbers, ROUND_DTYPE), unpack(archive.scores, SCORE_DTYPE, 4)
+        games.extend({
+            'season_number': archive.season_number,
+            'round_number': int(rounds[i]),
+            'home_team_id': int(home[i]),
+            'away_team_id': int(away[i]),
+            'home_score': int(scores[i, 0]),
+            'away_score': int(scores[i, 1])
+        } for i in meetings)
+
+    hot = db.session.execute(
+        select(VirtualGame.season_number, VirtualGame.round_number, VirtualGame.home_team_id,
+               VirtualGame.away_team_id, VirtualGame.home_score, VirtualGame.away_score)
+        .where(
+            VirtualGame.league_id == league_id,
+            VirtualGame.status == VirtualGameStatus.FINISHED.value,
+            ((VirtualGame.home_team_id == team_a) & (VirtualGame.away_team_id == team_b)) |
+            ((VirtualGame.home_team_id == team_b) & (VirtualGame.away_team_id == team_a))
+        )
+        .order_by(VirtualGame.season_number, VirtualGame.round_number, VirtualGame.id)
+    ).all()
+    games.extend(dict(row._mapping) for row in hot)
+
+    summary = {'played': len(games), 'wins': 0, 'draws': 0, 'losses': 0, 'goals_for': 0, 'goals_against': 0}
+    for game in games:
+        a_home = game['home_team_id'] == team_a
+        scored, conceded = ((game['home_score'] or 0, game['away_score'] or 0) if a_home
+                            else (game['away_score'] or 0, game['home_score'] or 0))
+        summary['goals_for'] += scored
+        summary['goals_against'] += conceded
+        key = 'wins' if scored > conceded else 'losses' if scored < conceded else 'draws'
+        summary[key] += 1
+    return {'games': games, 'summary': summary}
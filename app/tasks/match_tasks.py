@@ -3,11 +3,10 @@ Background tasks for fetching live matches and updating odds
 """
 from celery_app import celery
 from app import create_app, db
-from app.services.football_api import FootballAPIService, POPULAR_LEAGUES
+from app.services.ingestion import ingestion_pipeline
 from app.models.game_pick import GamePick
 from app.models.ticket import Bet
 from config import Config
-from datetime import datetime
 import logging
 
 logger = logging.getLogger(__name__)
@@ -17,7 +16,7 @@ flask_app = create_app()
 
 # Import WebSocket broadcast functions
 try:
-    from app.websocket_events import broadcast_match_update, broadcast_odds_update, broadcast_bet_settled
+    from app.websocket_events import broadcast_bet_settled
     WEBSOCKET_ENABLED = True
 except ImportError:
     WEBSOCKET_ENABLED = False
@@ -26,48 +25,24 @@ except ImportError:
 
 @celery.task(name='app.tasks.match_tasks.fetch_live_matches')
 def fetch_live_matches():
-    """Fetch currently live matches from API and update database"""
+    """Poll tracked fixtures whose state-based interval is due and update database"""
     with flask_app.app_context():
         if not Config.FOOTBALL_API_ENABLED or not Config.FOOTBALL_API_KEY:
             logger.info("Football API not configured, skipping live match fetch")
             return {'status': 'skipped', 'reason': 'API not configured'}
         
         try:
-            api = FootballAPIService(Config.FOOTBALL_API_KEY)
-            
-            # Fetch live matches for popular leagues
-            all_live_matches = []
-            for league_id in POPULAR_LEAGUES.values():
-                matches = api.get_live_matches(league_id=league_id)
-                all_live_matches.extend(matches)
-            
-            logger.info(f"Fetched {len(all_live_matches)} live matches")
-            
-            # Update database with live match data
-            updated_count = 0
-            for match_data in all_live_matches:
-                game_pick = GamePick.query.filter_by(api_fixture_id=match_data['api_id']).first()
-                
-                if game_pick:
-                    # Update existing match with live data
-                    game_pick.home_score = match_data['home_score']
-                    game_pick.away_score = match_data['away_score']
-                    game_pick.status = match_data['status']
-                    game_pick.elapsed_time = match_data['elapsed']
-                    updated_count += 1
-                    
-                    # Broadcast real-time update via WebSocket
-                    if WEBSOCKET_ENABLED:
-                        broadcast_match_update(game_pick.to_dict())
-            
-            if updated_count > 0:
-                db.session.commit()
-                logger.info(f"Updated {updated_count} matches with live scores")
+            # Only fixtures due for a poll are fetched (in-play every tick, kick-off
+            # soon every minute, later ones rarely); nothing due means no API call
+            ingestion_pipeline.adapter.initialize(Config.FOOTBALL_API_KEY)
+            result = ingestion_pipeline.run_tick()
             
             return {
                 'status': 'success',
-                'fetched': len(all_live_matches),
-                'updated': updated_count
+                'due': result['due'],
+                'requests': result['requests'],
+                'fetched': result['fetched'],
+                'updated': result['matches'] + result['game_picks']
             }
             
         except Exception as e:
@@ -85,43 +60,17 @@ def fetch_upcoming_matches():
             return {'status': 'skipped', 'reason': 'API not configured'}
         
         try:
-            api = FootballAPIService(Config.FOOTBALL_API_KEY)
-            
-            # Fetch upcoming matches for popular leagues
-            league_ids = list(POPULAR_LEAGUES.values())
-            matches = api.get_upcoming_matches(league_ids=league_ids, limit=100)
+            # Today's fixtures are fetched once and written to every consumer table
+            ingestion_pipeline.adapter.initialize(Config.FOOTBALL_API_KEY)
+            summary = ingestion_pipeline.run_schedule(days_ahead=1)
             
-            logger.info(f"Fetched {len(matches)} upcoming matches")
-            
-            # Store matches in database
-            new_count = 0
-            for match_data in matches:
-                # Check if match already exists
-                existing = GamePick.query.filter_by(api_fixture_id=match_data['api_id']).first()
-                
-                if not existing:
-                    # Create new match
-                    game_pick = GamePick(
-                        match_name=f"{match_data['home_team']} vs {match_data['away_team']}",
-                        league=match_data['league'],
-                        api_fixture_id=match_data['api_id'],
-                        api_league_id=match_data['league_id'],
-                        home_team=match_data['home_team'],
-                        away_team=match_data['away_team'],
-                        kick_off_time=datetime.fromisoformat(match_data['kick_off'].replace('Z', '+00:00')),
-                        status=match_data['status']
-                    )
-                    db.session.add(game_pick)
-                    new_count += 1
-            
-            if new_count > 0:
-                db.session.commit()
-                logger.info(f"Added {new_count} new matches to database")
+            added, _ = summary.get('game_picks', (0, 0))
+            logger.info(f"Added {added} new matches to database")
             
             return {
                 'status': 'success',
-                'fetched': len(matches),
-                'added': new_count
+                'fetched': summary['fetched'],
+                'added': added
             }
             
         except Exception as e:
@@ -139,54 +88,15 @@ def update_match_odds():
             return {'status': 'skipped', 'reason': 'API not configured'}
         
         try:
-            api = FootballAPIService(Config.FOOTBALL_API_KEY)
-            
-            # Get matches that need odds updates (upcoming and live matches)
-            matches = GamePick.query.filter(
-                GamePick.status.in_(['NS', '1H', '2H', 'HT', 'LIVE'])
-            ).limit(50).all()
-            
-            updated_count = 0
-            for match in matches:
-                if match.api_fixture_id:
-                    odds_data = api.get_match_odds(match.api_fixture_id)
-                    
-                    if odds_data and odds_data.get('markets'):
-                        # Update match odds from API
-                        markets = odds_data['markets']
-                        
-                        # Update Match Winner (1X2) odds
-                        if 'Match Winner' in markets:
-                            winner_odds = markets['Match Winner']
-                            match.odds_home = winner_odds.get('Home', 2.0)
-                            match.odds_draw = winner_odds.get('Draw', 3.0)
-                            match.odds_away = winner_odds.get('Away', 2.0)
-                        
-                        # Update Over/Under odds
-                        if 'Goals Over/Under' in markets:
-                            ou_odds = markets['Goals Over/Under']
-                            match.odds_over_2_5 = ou_odds.get('Over 2.5', 1.8)
-                            match.odds_under_2_5 = ou_odds.get('Under 2.5', 2.0)
-                        
-                        # Update Both Teams to Score
-                        if 'Both Teams Score' in markets:
-                            btts_odds = markets['Both Teams Score']
-                            match.odds_btts_yes = btts_odds.get('Yes', 1.8)
-                            match.odds_btts_no = btts_odds.get('No', 2.0)
-                        
-                        updated_count += 1
-                        
-                        # Broadcast odds update via WebSocket
-                        if WEBSOCKET_ENABLED:
-                            broadcast_odds_update(match.id, match.to_dict()['odds'])
-            
-            if updated_count > 0:
-                db.session.commit()
-                logger.info(f"Updated odds for {updated_count} matches")
+            # Date-paged odds for every listed fixture, written in bulk;
+            # only prices that moved are written and broadcast
+            ingestion_pipeline.adapter.initialize(Config.FOOTBALL_API_KEY)
+            summary = ingestion_pipeline.run_odds()
             
             return {
                 'status': 'success',
-                'updated': updated_count
+                'pages': summary['pages'],
+                'updated': summary['matches'] + summary['game_picks']
             }
             
         except Exception as e:
@@ -267,6 +177,19 @@ def settle_finished_matches():
             return {'status': 'error', 'message': str(e)}
 
 
+@celery.task(name='app.tasks.match_tasks.archive_finished_matches')
+def archive_finished_matches():
+    """Move finished matches past the retention window into matches_archive"""
+    with flask_app.app_context():
+        from app.services.match_archive_service import archive_finished_matches as archive
+        try:
+            return {'status': 'success', 'archived': archive()}
+        except Exception as e:
+            logger.error(f"Error archiving finished matches: {e}")
+            db.session.rollback()
+            return {'status': 'error', 'message': str(e)}
+
+
 def determine_bet_result(bet: Bet, match: GamePick) -> str:
     """
     Determine if a bet won or lost based on match result
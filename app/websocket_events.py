@@ -1,19 +1,59 @@
 """
 WebSocket event handlers for real-time updates
 """
-from flask import request
+from flask import request, current_app, has_app_context
 from flask_socketio import emit, join_room, leave_room
+from flask_jwt_extended import decode_token
+from sqlalchemy import and_, event, inspect, or_
+from sqlalchemy.orm import Session
 from app import socketio
+from app.extensions import db
+from app.models import User, Bet, Transaction, BetStatus
+from app.models.deposit import DepositRequest
+from app.services.betting_service import BettingService
+from app.services.cashout_pricer import cashout_pricer
+from app.services.liability import resolve_legs
+from app.services.match_broadcaster import KINDS, match_broadcaster
+from app.services.virtual_game_service import VirtualGameService
 import logging
+import threading
+import time
 
 logger = logging.getLogger(__name__)
 
+CASHOUT_SWEEP_SECONDS = 5  # how often due cashout drops are pushed
+
+SETTLED_STATUSES = (BetStatus.WON.value, BetStatus.LOST.value, BetStatus.CANCELLED.value, BetStatus.VOIDED.value)
+
+
+def _user_id_from_handshake(auth):
+    """Read and verify the JWT sent with the socket handshake (auth payload or ?token=)"""
+    token = auth.get('token') if isinstance(auth, dict) else None
+    token = token or request.args.get('token')
+    if not token:
+        return None
+    return str(decode_token(token)['sub'])
+
 
 @socketio.on('connect')
-def handle_connect():
-    """Handle client connection"""
-    logger.info(f'Client connected: {request.sid}')
-    emit('connection_response', {'status': 'connected', 'message': 'Connected to ABKBet live updates'})
+def handle_connect(auth=None):
+    """Handle client connection, joining the user room when a valid token is sent"""
+    try:
+        user_id = _user_id_from_handshake(auth)
+    except Exception as e:
+        # A stale stored token still gets the public feeds, just no user room
+        logger.info(f'Socket {request.sid} sent an invalid token, connecting anonymously ({e})')
+        user_id = None
+    
+    if user_id:
+        join_room(f'user_{user_id}')
+    
+    logger.info(f'Client connected: {request.sid} (user {user_id or "anonymous"})')
+    emit('connection_response', {
+        'status': 'connected',
+        'authenticated': bool(user_id),
+        'message': 'Connected to ABKBet live updates'
+    })
 
 
 @socketio.on('disconnect')
@@ -22,26 +62,71 @@ def handle_disconnect():
     logger.info(f'Client disconnected: {request.sid}')
 
 
+def _row_kind(data):
+    """'match' (Match rows, the default) or 'pick' (GamePick rows)"""
+    kind = data.get('kind') or 'match'
+    return kind if kind in KINDS else None
+
+
 @socketio.on('subscribe_match')
 def handle_subscribe_match(data):
-    """Subscribe to updates for a specific match"""
-    match_id = data.get('match_id')
-    if match_id:
-        room = f'match_{match_id}'
+    """Subscribe to updates for a specific match (or game pick with kind='pick')"""
+    match_id, kind = data.get('match_id'), _row_kind(data)
+    if match_id and kind:
+        room = f'{kind}_{match_id}'
         join_room(room)
-        logger.info(f'Client {request.sid} subscribed to match {match_id}')
-        emit('subscribed', {'match_id': match_id, 'room': room})
+        logger.info(f'Client {request.sid} subscribed to {kind} {match_id}')
+        emit('subscribed', {'kind': kind, 'match_id': match_id, 'room': room})
+        emit('match_snapshot', match_broadcaster.snapshot(match_id, kind))
+
+
+@socketio.on('resume_match')
+def handle_resume_match(data):
+    """Replay deltas after the client's last sequence, or send a snapshot if too far behind"""
+    match_id, kind = data.get('match_id'), _row_kind(data)
+    if not match_id or not kind:
+        return
+    join_room(f'{kind}_{match_id}')
+    
+    deltas = match_broadcaster.deltas_since(match_id, int(data.get('last_seq') or 0), kind)
+    if deltas is None:
+        emit('match_snapshot', match_broadcaster.snapshot(match_id, kind))
+        return
+    for delta in deltas:
+        emit('match_delta', delta)
 
 
 @socketio.on('unsubscribe_match')
 def handle_unsubscribe_match(data):
     """Unsubscribe from match updates"""
-    match_id = data.get('match_id')
-    if match_id:
-        room = f'match_{match_id}'
+    match_id, kind = data.get('match_id'), _row_kind(data)
+    if match_id and kind:
+        room = f'{kind}_{match_id}'
         leave_room(room)
-        logger.info(f'Client {request.sid} unsubscribed from match {match_id}')
-        emit('unsubscribed', {'match_id': match_id})
+        logger.info(f'Client {request.sid} unsubscribed from {kind} {match_id}')
+        emit('unsubscribed', {'kind': kind, 'match_id': match_id})
+
+
+@socketio.on('subscribe_virtual_league')
+def handle_subscribe_virtual_league(data):
+    """Join a virtual league room; late joiners get the round in progress"""
+    league_id = data.get('league_id')
+    if not league_id:
+        return
+    join_room(f'virtual_league_{league_id}')
+    emit('subscribed', {'league_id': league_id, 'room': f'virtual_league_{league_id}'})
+    
+    service = VirtualGameService()
+    payload = service.round_payload(service.get_live_games(league_id))
+    if payload:
+        emit('virtual_round_kickoff', payload)
+
+
+@socketio.on('subscribe_virtual_live')
+def handle_subscribe_virtual_live():
+    """Subscribe to kickoffs and results of every virtual league (admin view)"""
+    join_room('virtual_live')
+    emit('subscribed', {'room': 'virtual_live'})
 
 
 @socketio.on('subscribe_live_matches')
@@ -60,37 +145,53 @@ def handle_unsubscribe_live_matches():
     emit('unsubscribed', {'room': 'live_matches'})
 
 
-def broadcast_match_update(match_data):
+def broadcast_match_update(match_data, kind='match'):
     """
     Broadcast match update to subscribed clients
-    Called from Celery tasks when match data changes
+    Called from Celery tasks when match data changes. Updates are coalesced
+    and only changed fields go out, as 'match_delta' with a sequence number.
     
     Args:
         match_data: Dictionary containing match information
+        kind: 'match' for Match rows, 'pick' for GamePick rows
     """
     match_id = match_data.get('id')
-    room = f'match_{match_id}'
-    
-    socketio.emit('match_update', match_data, room=room)
-    socketio.emit('match_update', match_data, room='live_matches')
-    logger.debug(f'Broadcast match update for match {match_id}')
+    match_broadcaster.publish(match_id, match_data, kind)
+    logger.debug(f'Queued {kind} update for {match_id}')
 
 
-def broadcast_odds_update(match_id, odds_data):
+def broadcast_odds_update(match_id, odds_data, kind='match'):
     """
     Broadcast odds update to subscribed clients
+    Only the prices that moved are sent, merged into the row's next delta
+    under the same column names the full row uses.
     
     Args:
-        match_id: Match ID
-        odds_data: Dictionary containing updated odds
+        match_id: Match (or game pick) ID
+        odds_data: Dictionary of updated odds columns
+        kind: 'match' for Match rows, 'pick' for GamePick rows
     """
-    room = f'match_{match_id}'
-    
-    socketio.emit('odds_update', {
-        'match_id': match_id,
-        'odds': odds_data
-    }, room=room)
-    logger.debug(f'Broadcast odds update for match {match_id}')
+    match_broadcaster.publish(match_id, dict(odds_data), kind)
+    logger.debug(f'Queued odds update for {kind} {match_id}')
+
+
+def broadcast_virtual_kickoff(round_payload):
+    """
+    Publish a virtual round once at kickoff: schedule and goal timeline
+    for every game, replayed locally by clients
+    """
+    socketio.emit('virtual_round_kickoff', round_payload,
+                  to=[f"virtual_league_{round_payload['league_id']}", 'virtual_live'])
+    logger.info(f"Broadcast virtual kickoff for league {round_payload['league_id']}")
+
+
+def broadcast_virtual_result(league_id, games):
+    """Publish full-time results for a virtual round"""
+    socketio.emit('virtual_round_result', {
+        'league_id': league_id,
+        'results': [{'id': g.id, 'home_score': g.home_score, 'away_score': g.away_score} for g in games]
+    }, to=[f'virtual_league_{league_id}', 'virtual_live'])
+    logger.info(f'Broadcast virtual results for league {league_id}')
 
 
 def broadcast_bet_settled(bet_data):
@@ -105,3 +206,173 @@ def broadcast_bet_settled(bet_data):
     
     socketio.emit('bet_settled', bet_data, room=room)
     logger.info(f'Broadcast bet settlement to user {user_id}')
+
+
+def _emit_to_user(event_name, user_id, payload):
+    """Emit to a user room; never let a push failure break the caller"""
+    try:
+        socketio.emit(event_name, payload, room=f'user_{user_id}')
+    except Exception as e:
+        logger.debug(f'Could not push {event_name} to user {user_id}: {e}')
+
+
+def push_balance_update(user_id, balance, delta=None):
+    """Push a user's new balance (and the change that produced it)"""
+    _emit_to_user('balance_update', user_id, {'balance': balance, 'delta': delta})
+
+
+def push_cashout_value(user_id, bet_id, cashout_value, cashout_percentage):
+    """Push a new cashout value for one of the user's active bets"""
+    _emit_to_user('cashout_value', user_id, {
+        'bet_id': bet_id,
+        'cashout_value': cashout_value,
+        'cashout_percentage': cashout_percentage * 100
+    })
+
+
+def push_deposit_approved(user_id, deposit_id, amount):
+    """Tell a user their deposit has been credited"""
+    _emit_to_user('deposit_approved', user_id, {'deposit_id': deposit_id, 'amount': amount})
+
+
+# Bets waiting for their full-refund window to close: bet_id -> due time.
+# One sweep per process pushes the priced values, instead of a sleeping task per bet.
+_cashout_drops = {}
+_cashout_lock = threading.Lock()
+_cashout_sweeper = None
+
+
+def schedule_cashout_drop(app, bet_id, delay):
+    """Push the priced cashout value for a bet once its full-refund window closes"""
+    global _cashout_sweeper
+    with _cashout_lock:
+        _cashout_drops[bet_id] = time.time() + delay
+        if _cashout_sweeper is None:
+            _cashout_sweeper = socketio.start_background_task(_sweep_cashout_drops, app)
+
+
+def push_due_cashout_drops(now=None):
+    """Push cashout values for bets whose window has closed and are still open; returns pushes sent"""
+    now = now or time.time()
+    with _cashout_lock:
+        due = [bet_id for bet_id, at in _cashout_drops.items() if at <= now]
+        for bet_id in due:
+            del _cashout_drops[bet_id]
+    if not due:
+        return 0
+
+    bets = Bet.query.filter(
+        Bet.id.in_(due),
+        Bet.status == BetStatus.ACTIVE.value,
+        Bet.is_cashed_out.isnot(True)
+    ).all()
+    owners = {bet.id: bet.user_id for bet in bets}
+    for bet_id, quote in cashout_pricer.quotes(bets).items():
+        push_cashout_value(owners[bet_id], bet_id, quote['cashout_value'], quote['cashout_percentage'])
+    return len(bets)
+
+
+def push_match_cashouts(match_ids):
+    """Re-price open bets with a leg on any of match_ids and push the values to their owners; returns pushes sent"""
+    match_ids = set(match_ids)
+    if not match_ids:
+        return 0
+
+    # Singles on the matches, plus accumulators whose legs live in their booking code
+    bets = Bet.query.filter(
+        Bet.status == BetStatus.ACTIVE.value,
+        Bet.is_cashed_out.isnot(True),
+        Bet.bet_type != 'virtual',
+        or_(Bet.match_id.in_(match_ids), and_(Bet.match_id.is_(None), Bet.booking_code.isnot(None)))
+    ).all()
+    legs = resolve_legs(db.session.connection(), bets) if bets else {}
+    bets = [bet for bet in bets if any(leg[0] in match_ids for leg in legs.get(bet.id, ()))]
+    owners = {bet.id: bet.user_id for bet in bets}
+    for bet_id, quote in cashout_pricer.quotes(bets).items():
+        push_cashout_value(owners[bet_id], bet_id, quote['cashout_value'], quote['cashout_percentage'])
+    return len(bets)
+
+
+def _sweep_cashout_drops(app):
+    """Background task: push due cashout drops every CASHOUT_SWEEP_SECONDS"""
+    while True:
+        socketio.sleep(CASHOUT_SWEEP_SECONDS)
+        with app.app_context():
+            try:
+                push_due_cashout_drops()
+            except Exception as e:
+                logger.error(f'Cashout drop sweep failed: {e}')
+            finally:
+                db.session.remove()
+
+
+# --- Change capture: push deltas for whatever a request committed ---
+# Collected per session in after_flush and only emitted after_commit, so a
+# rolled-back transaction never reaches the client.
+
+@event.listens_for(Session, 'after_flush')
+def _collect_pushes(session, flush_context):
+    pending = session.info.setdefault('live_pushes', {'balances': {}, 'events': []})
+    
+    for obj in session.new:
+        if isinstance(obj, Bet) and obj.status == BetStatus.ACTIVE.value:
+            pending['events'].append(('new_bet', obj.user_id, obj.id, obj.amount))
+    
+    for obj in session.dirty:
+        state = inspect(obj)
+        
+        if isinstance(obj, User):
+            history = state.attrs.balance.history
+            if not history.added or not isinstance(history.added[0], (int, float)):
+                continue
+            entry = pending['balances'].setdefault(obj.id, {'balance': None, 'delta': 0.0})
+            entry['balance'] = history.added[0]
+            if history.deleted and isinstance(history.deleted[0], (int, float)):
+                entry['delta'] += history.added[0] - history.deleted[0]
+        
+        elif isinstance(obj, Bet):
+            if state.attrs.status.history.added and obj.status in SETTLED_STATUSES:
+                pending['events'].append(('bet_settled', obj.user_id, {
+                    'bet_id': obj.id,
+                    'user_id': obj.user_id,
+                    'status': obj.status,
+                    'result': obj.result,
+                    'amount': obj.settled_payout or 0
+                }))
+        
+        elif isinstance(obj, DepositRequest):
+            if state.attrs.status.history.added and obj.status == 'approved':
+                pending['events'].append(('deposit_approved', obj.user_id, obj.id, obj.amount))
+        
+        elif isinstance(obj, Transaction):
+            if (state.attrs.status.history.added and obj.transaction_type == 'deposit'
+                    and obj.status == 'completed'):
+                pending['events'].append(('deposit_approved', obj.user_id, obj.id, obj.amount))
+
+
+@event.listens_for(Session, 'after_commit')
+def _send_pushes(session):
+    pending = session.info.pop('live_pushes', None)
+    if not pending:
+        return
+    
+    for user_id, entry in pending['balances'].items():
+        push_balance_update(user_id, entry['balance'], round(entry['delta'], 8))
+    
+    for kind, user_id, *args in pending['events']:
+        try:
+            if kind == 'bet_settled':
+                broadcast_bet_settled(args[0])
+            elif kind == 'deposit_approved':
+                push_deposit_approved(user_id, *args)
+            elif kind == 'new_bet' and has_app_context():
+                bet_id, amount = args
+                schedule_cashout_drop(current_app._get_current_object(), bet_id,
+                                      BettingService.CASHOUT_FULL_REFUND_SECONDS)
+        except Exception as e:
+            logger.debug(f'Could not push {kind} to user {user_id}: {e}')
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_pushes(session):
+    session.info.pop('live_pushes', None)
@@ -25,10 +25,12 @@ def make_celery(app_name=__name__):
     )
     # Configure periodic tasks
     celery.conf.beat_schedule = {
-        'fetch-live-matches-every-30-seconds': {
+        # Poll tick; each fixture is only fetched when its state's interval is due
+        'poll-fixtures-every-15-seconds': {
             'task': 'app.tasks.match_tasks.fetch_live_matches',
-            'schedule': 30.0,  # 30 seconds
+            'schedule': 15.0,  # 15 seconds (app.services.poll_scheduler.TICK_SECONDS)
         },
+        # Odds tick; dates are only fetched when one of their fixtures is due
         'update-odds-every-5-minutes': {
             'task': 'app.tasks.match_tasks.update_match_odds',
             'schedule': 300.0,  # 5 minutes
@@ -41,6 +43,10 @@ def make_celery(app_name=__name__):
             'task': 'app.tasks.match_tasks.settle_finished_matches',
             'schedule': 120.0,  # 2 minutes
         },
+        'archive-finished-matches-every-hour': {
+            'task': 'app.tasks.match_tasks.archive_finished_matches',
+            'schedule': 3600.0,  # 1 hour
+        },
     }
     return celery
 
@@ -0,0 +1,43 @@
+"""Add season and round numbers to virtual games
+
+Revision ID: a7d3e9b2c514
+Revises: f2a6d4c8e317
+Create Date: 2026-10-19 18:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a7d3e9b2c514'
+down_revision = 'f2a6d4c8e317'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # virtual_games is created by db.create_all() on some deployments
+    insp = sa.inspect(op.get_bind())
+    if 'virtual_games' not in insp.get_table_names():
+        return
+    cols = [c['name'] for c in insp.get_columns('virtual_games')]
+
+    with op.batch_alter_table('virtual_games', schema=None) as batch_op:
+        if 'season_number' not in cols:
+            batch_op.add_column(sa.Column('season_number', sa.Integer(), nullable=True))
+        if 'round_number' not in cols:
+            batch_op.add_column(sa.Column('round_number', sa.Integer(), nullable=True))
+        batch_op.create_index('ix_virtual_games_league_season_round',
+                              ['league_id', 'season_number', 'round_number'], unique=False)
+
+
+def downgrade():
+    insp = sa.inspect(op.get_bind())
+    if 'virtual_games' not in insp.get_table_names():
+        return
+
+    with op.batch_alter_table('virtual_games', schema=None) as batch_op:
+        batch_op.drop_index('ix_virtual_games_league_season_round')
+        batch_op.drop_column('round_number')
+        batch_op.drop_column('season_number')
@@ -0,0 +1,44 @@
+"""Add virtual_season_archive for packed finished seasons
+
+Revision ID: b8e4f1a6d297
+Revises: a7d3e9b2c514
+Create Date: 2026-10-19 20:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b8e4f1a6d297'
+down_revision = 'a7d3e9b2c514'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('virtual_season_archive',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('league_id', sa.Integer(), nullable=False),
+        sa.Column('season_number', sa.Integer(), nullable=False),
+        sa.Column('games_count', sa.Integer(), nullable=False),
+        sa.Column('teams', sa.Text(), nullable=False),
+        sa.Column('round_numbers', sa.LargeBinary(), nullable=False),
+        sa.Column('home_team_ids', sa.LargeBinary(), nullable=False),
+        sa.Column('away_team_ids', sa.LargeBinary(), nullable=False),
+        sa.Column('scores', sa.LargeBinary(), nullable=False),
+        sa.Column('odds_columns', sa.Text(), nullable=False),
+        sa.Column('odds', sa.LargeBinary(), nullable=False),
+        sa.Column('standings', sa.Text(), nullable=False),
+        sa.Column('started_at', sa.DateTime(), nullable=True),
+        sa.Column('finished_at', sa.DateTime(), nullable=True),
+        sa.Column('archived_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('league_id', 'season_number', name='uq_virtual_season_archive_league_season')
+    )
+    op.create_index('ix_virtual_season_archive_league_id', 'virtual_season_archive', ['league_id'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_virtual_season_archive_league_id', table_name='virtual_season_archive')
+    op.drop_table('virtual_season_archive')
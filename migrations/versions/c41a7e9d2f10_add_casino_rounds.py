@@ -0,0 +1,43 @@
+"""Add casino_rounds journal table
+
+Revision ID: c41a7e9d2f10
+Revises: b326d2bc2ead
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c41a7e9d2f10'
+down_revision = 'b326d2bc2ead'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('casino_rounds',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('game', sa.String(length=20), nullable=False),
+        sa.Column('stake', sa.Float(), nullable=False),
+        sa.Column('multiplier', sa.Float(), nullable=False),
+        sa.Column('payout', sa.Float(), nullable=False),
+        sa.Column('server_seed', sa.String(length=64), nullable=True),
+        sa.Column('client_seed', sa.String(length=64), nullable=True),
+        sa.Column('nonce', sa.BigInteger(), nullable=True),
+        sa.Column('details', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('casino_rounds', schema=None) as batch_op:
+        batch_op.create_index('ix_casino_rounds_user_game_created', ['user_id', 'game', 'created_at'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('casino_rounds', schema=None) as batch_op:
+        batch_op.drop_index('ix_casino_rounds_user_game_created')
+
+    op.drop_table('casino_rounds')
@@ -0,0 +1,39 @@
+"""Add fetch_jobs table so admin fetch jobs are shared by every worker
+
+Revision ID: d5b9e2f7a413
+Revises: b8e4f1a6d297
+Create Date: 2026-10-19 18:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd5b9e2f7a413'
+down_revision = 'b8e4f1a6d297'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('fetch_jobs',
+        sa.Column('id', sa.String(length=32), nullable=False),
+        sa.Column('kind', sa.String(length=30), nullable=False),
+        sa.Column('active_kind', sa.String(length=30), nullable=True),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('params', sa.JSON(), nullable=True),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('progress', sa.JSON(), nullable=True),
+        sa.Column('error', sa.Text(), nullable=True),
+        sa.Column('cancel_requested', sa.Boolean(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.Column('finished_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('active_kind')
+    )
+
+
+def downgrade():
+    op.drop_table('fetch_jobs')
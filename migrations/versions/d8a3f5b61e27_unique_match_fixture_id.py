@@ -0,0 +1,36 @@
+"""Unique matches.api_fixture_id and content_hash for bulk fixture upserts
+
+Revision ID: d8a3f5b61e27
+Revises: c41a7e9d2f10
+Create Date: 2026-10-19 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd8a3f5b61e27'
+down_revision = 'c41a7e9d2f10'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Earlier syncs could create duplicates; keep the oldest row per fixture
+    # linked and detach the rest (they may still have bets, so no delete)
+    op.execute(
+        "UPDATE matches SET api_fixture_id = NULL "
+        "WHERE api_fixture_id IS NOT NULL AND id NOT IN ("
+        "SELECT keep_id FROM (SELECT MIN(id) AS keep_id FROM matches "
+        "WHERE api_fixture_id IS NOT NULL GROUP BY api_fixture_id) AS keepers)"
+    )
+    with op.batch_alter_table('matches', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('content_hash', sa.String(length=64), nullable=True))
+        batch_op.create_unique_constraint('uq_matches_api_fixture_id', ['api_fixture_id'])
+
+
+def downgrade():
+    with op.batch_alter_table('matches', schema=None) as batch_op:
+        batch_op.drop_constraint('uq_matches_api_fixture_id', type_='unique')
+        batch_op.drop_column('content_hash')
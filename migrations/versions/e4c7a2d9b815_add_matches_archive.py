@@ -0,0 +1,83 @@
+"""Add matches_archive and decouple bets.match_id from the hot matches table
+
+Revision ID: e4c7a2d9b815
+Revises: d8a3f5b61e27
+Create Date: 2026-10-19 13:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e4c7a2d9b815'
+down_revision = 'd8a3f5b61e27'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('matches_archive',
+        sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column('home_team', sa.String(length=100), nullable=False),
+        sa.Column('away_team', sa.String(length=100), nullable=False),
+        sa.Column('league', sa.String(length=100), nullable=True),
+        sa.Column('match_date', sa.DateTime(), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=True),
+        sa.Column('home_score', sa.Integer(), nullable=True),
+        sa.Column('away_score', sa.Integer(), nullable=True),
+        sa.Column('match_time', sa.Integer(), nullable=True),
+        sa.Column('ht_home_score', sa.Integer(), nullable=True),
+        sa.Column('ht_away_score', sa.Integer(), nullable=True),
+        sa.Column('ht_status', sa.String(length=20), nullable=True),
+        sa.Column('home_odds', sa.Float(), nullable=False),
+        sa.Column('draw_odds', sa.Float(), nullable=False),
+        sa.Column('away_odds', sa.Float(), nullable=False),
+        sa.Column('home_draw_odds', sa.Float(), nullable=True),
+        sa.Column('home_away_odds', sa.Float(), nullable=True),
+        sa.Column('draw_away_odds', sa.Float(), nullable=True),
+        sa.Column('gg_odds', sa.Float(), nullable=True),
+        sa.Column('ng_odds', sa.Float(), nullable=True),
+        sa.Column('over25_odds', sa.Float(), nullable=True),
+        sa.Column('under25_odds', sa.Float(), nullable=True),
+        sa.Column('over15_odds', sa.Float(), nullable=True),
+        sa.Column('under15_odds', sa.Float(), nullable=True),
+        sa.Column('over35_odds', sa.Float(), nullable=True),
+        sa.Column('under35_odds', sa.Float(), nullable=True),
+        sa.Column('htft_odds', sa.Text(), nullable=True),
+        sa.Column('correct_score_odds', sa.Text(), nullable=True),
+        sa.Column('is_manual', sa.Boolean(), nullable=True),
+        sa.Column('api_fixture_id', sa.Integer(), nullable=True),
+        sa.Column('content_hash', sa.String(length=64), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.Column('archived_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('matches_archive', schema=None) as batch_op:
+        batch_op.create_index('ix_matches_archive_match_date', ['match_date'], unique=False)
+        batch_op.create_index('ix_matches_archive_api_fixture_id', ['api_fixture_id'], unique=False)
+
+    # bets.match_id may now point at an archived match, so it can no longer
+    # be a foreign key to matches; the FK name depends on how the table was created
+    inspector = sa.inspect(op.get_bind())
+    fk_names = [
+        fk['name'] for fk in inspector.get_foreign_keys('bets')
+        if fk['referred_table'] == 'matches' and fk.get('name')
+    ]
+    with op.batch_alter_table('bets', schema=None) as batch_op:
+        for fk_name in fk_names:
+            batch_op.drop_constraint(fk_name, type_='foreignkey')
+        batch_op.create_index('ix_bets_match_id', ['match_id'], unique=False)
+
+
+def downgrade():
+    # The bets -> matches FK is not restored: bets may reference archived ids
+    with op.batch_alter_table('bets', schema=None) as batch_op:
+        batch_op.drop_index('ix_bets_match_id')
+
+    with op.batch_alter_table('matches_archive', schema=None) as batch_op:
+        batch_op.drop_index('ix_matches_archive_api_fixture_id')
+        batch_op.drop_index('ix_matches_archive_match_date')
+
+    op.drop_table('matches_archive')
@@ -0,0 +1,30 @@
+"""Add match_time_at so live minutes can be interpolated between polls
+
+Revision ID: f2a6d4c8e317
+Revises: e4c7a2d9b815
+Create Date: 2026-10-19 15:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f2a6d4c8e317'
+down_revision = 'e4c7a2d9b815'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('matches', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('match_time_at', sa.DateTime(), nullable=True))
+    with op.batch_alter_table('matches_archive', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('match_time_at', sa.DateTime(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('matches_archive', schema=None) as batch_op:
+        batch_op.drop_column('match_time_at')
+    with op.batch_alter_table('matches', schema=None) as batch_op:
+        batch_op.drop_column('match_time_at')
@@ -10,7 +10,7 @@ import os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from app import create_app
-from app.services.football_api_service import football_api
+from app.services.ingestion import ingestion_pipeline
 from config import Config
 
 def main():
@@ -48,35 +48,24 @@ def main():
     app = create_app()
     
     with app.app_context():
-        # Initialize football API service
-        football_api.initialize(Config.FOOTBALL_API_KEY)
+        # Initialize the ingestion adapter's API client
+        ingestion_pipeline.adapter.initialize(Config.FOOTBALL_API_KEY)
         
-        # Get popular leagues
-        popular_leagues = football_api.get_popular_leagues()
-        league_ids = [
-            popular_leagues['premier_league'],
-            popular_leagues['la_liga'],
-            popular_leagues['bundesliga'],
-            popular_leagues['serie_a'],
-            popular_leagues['ligue_1'],
-            popular_leagues['champions_league']
-        ]
-        
-        print("Fetching upcoming matches from major leagues...")
-        print("Leagues: Premier League, La Liga, Bundesliga, Serie A, Ligue 1, Champions League")
-        matches = football_api.get_upcoming_matches(days=7, league_ids=league_ids)
+        # One fetch per date; fixtures are normalized and written by the ingestion writer
+        print("Fetching and syncing the next 7 days of fixtures (popular leagues first)...")
+        try:
+            summary = ingestion_pipeline.run_schedule(days_ahead=7, consumers=('matches',))
+        except Exception as e:
+            print(f"❌ Database sync failed: {e}")
+            return
         
-        if not matches:
+        if not summary['fetched']:
             print("❌ No matches found or API request failed")
             print("Check your API key and internet connection")
             return
         
-        print(f"✓ Found {len(matches)} matches from API")
-        print()
-        
-        # Sync to database
-        print("Syncing matches to database...")
-        created, updated = football_api.sync_matches_to_database(matches)
+        print(f"✓ Found {summary['fetched']} matches from API")
+        created, updated = summary['matches']
         
         print()
         print("=" * 60)
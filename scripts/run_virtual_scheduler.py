@@ -0,0 +1,29 @@
+"""
+Virtual league scheduler process
+Advances every active virtual league on the server's clock: countdown,
+kickoff, full time, settlement and the next round. Run exactly one of these
+next to the web app; kickoff and result pushes reach browsers through the
+Socket.IO message queue (SOCKETIO_MESSAGE_QUEUE).
+"""
+
+import sys
+import os
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app import create_app
+from app.services.virtual_scheduler import virtual_scheduler
+
+
+def main():
+    app = create_app(os.getenv('FLASK_ENV', 'development'))
+    print("🎮 ABKBet virtual league scheduler - press Ctrl+C to stop")
+    try:
+        virtual_scheduler.run(app)
+    except KeyboardInterrupt:
+        print("\n🛑 Virtual scheduler stopped.")
+
+
+if __name__ == '__main__':
+    main()
@@ -12,8 +12,7 @@ from datetime import datetime
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from app import create_app
-from app.services.football_api_service import football_api
-from app.models import Match, MatchStatus
+from app.services.ingestion import ingestion_pipeline
 from config import Config
 
 UPDATE_INTERVAL = 900  # 15 minutes in seconds
@@ -23,36 +22,18 @@ def update_all_odds(app):
     """Update odds for all scheduled and live matches"""
     
     with app.app_context():
-        # Get all matches that need odds updates (scheduled or live)
-        matches = Match.query.filter(
-            Match.status.in_([MatchStatus.SCHEDULED.value, MatchStatus.LIVE.value]),
-            Match.api_fixture_id.isnot(None)
-        ).all()
+        print(f"[{datetime.now().strftime('%H:%M:%S')}] Updating odds from date-paged odds feed...")
         
-        if not matches:
-            print(f"[{datetime.now().strftime('%H:%M:%S')}] No matches need odds updates")
+        # One paged fetch per listed date prices every fixture; changed prices are bulk-written
+        ingestion_pipeline.adapter.initialize(Config.FOOTBALL_API_KEY)
+        try:
+            summary = ingestion_pipeline.run_odds()
+        except Exception as e:
+            print(f"  Error updating odds: {e}")
             return
         
-        print(f"[{datetime.now().strftime('%H:%M:%S')}] Updating odds for {len(matches)} matches...")
-        
-        success_count = 0
-        fail_count = 0
-        
-        for match in matches:
-            try:
-                if football_api.update_match_odds(match.api_fixture_id, match.id):
-                    success_count += 1
-                else:
-                    fail_count += 1
-                
-                # Small delay to avoid rate limiting
-                time.sleep(1)
-            
-            except Exception as e:
-                print(f"  Error updating match {match.id}: {e}")
-                fail_count += 1
-        
-        print(f"  ✓ Updated: {success_count}, Failed: {fail_count}")
+        print(f"  ✓ {summary['pages']} pages, {summary['priced']} fixtures priced, "
+              f"{summary['matches']} matches / {summary['game_picks']} picks updated")
 
 
 def sync_live_matches(app):
@@ -61,12 +42,12 @@ def sync_live_matches(app):
     with app.app_context():
         print(f"[{datetime.now().strftime('%H:%M:%S')}] Checking for live matches...")
         
-        live_matches = football_api.get_live_matches()
+        # One live fetch refreshes tracked fixtures in matches and game picks
+        ingestion_pipeline.adapter.initialize(Config.FOOTBALL_API_KEY)
+        result = ingestion_pipeline.run_live()
         
-        if live_matches:
-            created, updated = football_api.sync_matches_to_database(live_matches)
-            if created + updated > 0:
-                print(f"  ✓ Live matches: {created} new, {updated} updated")
+        if result['matches'] + result['game_picks'] > 0:
+            print(f"  ✓ Live matches: {result['matches']} matches, {result['game_picks']} picks updated")
 
 
 def main():
@@ -99,10 +80,6 @@ def main():
     # Create Flask app context
     app = create_app()
     
-    # Initialize football API service
-    with app.app_context():
-        football_api.initialize(Config.FOOTBALL_API_KEY)
-    
     iteration = 0
     
     try:
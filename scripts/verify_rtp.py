@@ -0,0 +1,55 @@
+"""
+Monte Carlo RTP check for the in-house games
+Plays every game (or the ones named) for millions of rounds and prints RTP,
+house edge, spread and tail payouts next to the exact expected RTP, plus
+rounds per second so the run doubles as a benchmark.
+
+    python scripts/verify_rtp.py --rounds 10000000
+    python scripts/verify_rtp.py --games dice plinko --workers 4 --seed 7
+"""
+
+import sys
+import os
+import argparse
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.routes.plinko_routes import MULTIPLIERS
+from app.services.rtp_verifier import DEFAULT_ROUNDS, GAMES, simulate
+
+# Settings checked for each game
+SCENARIOS = {
+    'crash': [{'cashout': c} for c in (1.1, 1.5, 2.0, 3.0, 3.99)],
+    'dice': [{'target': 50.0, 'prediction': 'over'}, {'target': 90.0, 'prediction': 'over'},
+             {'target': 10.0, 'prediction': 'under'}, {'target': 2.0, 'prediction': 'under'}],
+    'plinko': [{'risk': risk} for risk in MULTIPLIERS],
+    'mines': [{'mines': 3, 'revealed': 3}, {'mines': 3, 'revealed': 3, 'tiles': [0, 1, 2]},
+              {'mines': 10, 'revealed': 5}, {'mines': 16, 'revealed': 3}]
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Monte Carlo RTP check for the in-house games')
+    parser.add_argument('--rounds', type=int, default=DEFAULT_ROUNDS, help='rounds per scenario')
+    parser.add_argument('--games', nargs='+', choices=GAMES, default=list(GAMES))
+    parser.add_argument('--workers', type=int, default=None, help='processes (default: every CPU)')
+    parser.add_argument('--seed', type=int, default=None)
+    args = parser.parse_args()
+
+    print(f"🎲 RTP check - {args.rounds:,} rounds per scenario")
+    print(f"{'game':<7} {'settings':<42} {'RTP':>8} {'expected':>9} {'edge':>8} {'std':>8} "
+          f"{'p99':>8} {'p99.9':>8} {'max':>8} {'rounds/s':>11}")
+    for game in args.games:
+        for params in SCENARIOS[game]:
+            report = simulate(game, args.rounds, workers=args.workers, seed=args.seed, **params)
+            settings = ', '.join(f'{k}={v}' for k, v in report['params'].items() if v is not None)
+            flag = ' ⚠️' if report['rtp'] > 1 else ''
+            print(f"{game:<7} {settings:<42} {report['rtp']:>8.4f} {report['expected_rtp']:>9.4f} "
+                  f"{report['house_edge']:>8.2%} {report['std']:>8.3f} {report['percentiles']['p99']:>8.2f} "
+                  f"{report['percentiles']['p99.9']:>8.2f} {report['max']:>8.2f} "
+                  f"{report['rounds_per_second']:>11,.0f}{flag}")
+
+
+if __name__ == '__main__':
+    main()
@@ -218,6 +218,10 @@ class ABKBetClient {
         return this.request(`/bets/${betId}/cashout-value`);
     }
 
+    async getCashoutQuotes() {
+        return this.request('/bets/cashout-quotes');
+    }
+
     /**
      * Admin Methods
      */
@@ -271,10 +275,121 @@ class ABKBetClient {
         return !!this.getToken();
     }
 
+    /**
+     * Shared Socket.IO connection (authenticated when logged in). Handlers
+     * registered with on() survive reconnects and login/logout swaps.
+     */
+    getSocket() {
+        if (typeof io === 'undefined') return null;
+        if (!this.socket) {
+            const token = this.getToken();
+            this.socket = io(token ? { auth: { token } } : {});
+            this.liveConnected = !!token;
+            const handlers = [...(this.liveHandlers || []), ...Object.entries(this.userHandlers || {})];
+            for (const [eventName, handler] of handlers) {
+                this.socket.on(eventName, handler);
+            }
+        }
+        return this.socket;
+    }
+
+    on(eventName, handler) {
+        this.liveHandlers = this.liveHandlers || [];
+        this.liveHandlers.push([eventName, handler]);
+        if (this.socket) this.socket.on(eventName, handler);
+    }
+
+    /**
+     * Open the authenticated connection for balance, bet and deposit
+     * pushes. handlers maps event name -> callback.
+     */
+    connectLive(handlers = {}) {
+        if (typeof io === 'undefined' || !this.getToken()) return null;
+        this.disconnectLive();
+        this.userHandlers = handlers;
+        return this.getSocket();
+    }
+
+    /**
+     * Follow a match (or a game pick, kind 'pick') over the socket.
+     * onChange(data, changes) receives the full merged state and the fields
+     * that changed. Gaps in the sequence (or a reconnect) trigger a resume
+     * from the last sequence seen.
+     */
+    subscribeMatch(matchId, onChange, kind = 'match') {
+        if (!this.getSocket()) return;
+        if (!this.matchState) {
+            this.matchState = {};
+            this.on('match_snapshot', (snap) => {
+                const state = this.matchState[`${snap.kind || 'match'}:${snap.match_id}`];
+                if (!state) return;
+                state.seq = snap.seq;
+                state.data = snap.data;
+                state.onChange(state.data, snap.data);
+            });
+            this.on('match_delta', (delta) => {
+                const state = this.matchState[`${delta.kind || 'match'}:${delta.match_id}`];
+                if (!state || delta.seq <= state.seq) return;
+                if (delta.seq !== state.seq + 1) {
+                    this.socket.emit('resume_match', { kind: state.kind, match_id: state.id, last_seq: state.seq });
+                    return;
+                }
+                state.seq = delta.seq;
+                Object.assign(state.data, delta.changes);
+                state.onChange(state.data, delta.changes);
+            });
+            this.on('connect', () => {
+                for (const state of Object.values(this.matchState)) {
+                    this.socket.emit('resume_match', { kind: state.kind, match_id: state.id, last_seq: state.seq });
+                }
+            });
+        }
+        const key = `${kind}:${matchId}`;
+        if (this.matchState[key]) {
+            this.matchState[key].onChange = onChange;
+            return;
+        }
+        this.matchState[key] = { kind, id: matchId, seq: 0, data: {}, onChange };
+        this.socket.emit('subscribe_match', { kind, match_id: matchId });
+    }
+
+    /**
+     * Join a virtual league room. The server pushes 'virtual_round_kickoff'
+     * (schedule + goal timeline) once per round and 'virtual_round_result'
+     * at full time; the current round is re-sent on every (re)connect.
+     */
+    subscribeVirtualLeague(leagueId) {
+        if (!this.getSocket()) return;
+        if (!this.virtualLeagues) {
+            this.virtualLeagues = new Set();
+            this.on('connect', () => {
+                for (const id of this.virtualLeagues) {
+                    this.socket.emit('subscribe_virtual_league', { league_id: id });
+                }
+            });
+        }
+        this.virtualLeagues.add(leagueId);
+        if (this.socket.connected) {
+            this.socket.emit('subscribe_virtual_league', { league_id: leagueId });
+        }
+    }
+
+    disconnectLive() {
+        if (this.socket) {
+            this.socket.disconnect();
+            this.socket = null;
+        }
+        this.userHandlers = null;
+        this.liveConnected = false;
+    }
+
     logout() {
+        this.disconnectLive();
         this.token = null;
         this.user = null;
         localStorage.removeItem('abkbet_token');
+        // Keep public subscriptions (matches, virtual leagues) on an anonymous socket
+        if (this.liveHandlers) this.getSocket();
     }
 }
 
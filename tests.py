@@ -4,6 +4,7 @@ Unit tests for ABKBet application
 
 import unittest
 import json
+import requests
 from datetime import datetime
 from run import create_app
 from app.models import db, User, Bet, Wallet, Transaction
@@ -139,5 +140,1091 @@ class PaymentTestCase(APITestCase):
         data = json.loads(response.data)
         self.assertEqual(data['currency'], 'USD')
 
+class AutoBetTestCase(unittest.TestCase):
+    """Test batched auto-bet helpers"""
+
+    def setUp(self):
+        from app.services.auto_bet_service import AutoBetService
+        self.service = AutoBetService()
+
+    def test_hash_rounds_matches_single_roll(self):
+        """Batch digests reproduce the single-round dice results"""
+        from app.routes.dice_routes import generate_dice_result
+        digests = self.service.hash_rounds('server', 'client', 1000, 5)
+        for i, digest in enumerate(digests):
+            hash_int = int.from_bytes(bytes(digest[:4]), 'big')
+            self.assertEqual((hash_int % 10000) / 100.0, generate_dice_result('client', 'server', 1000 + i))
+
+    def test_rounds_to_play_stops(self):
+        """Play stops on profit target, loss limit and empty balance"""
+        profits = [1.0, 1.0, -1.0, 1.0, 1.0]
+        self.assertEqual(self.service.rounds_to_play(profits, 1.0, 10.0, stop_on_profit=2), 2)
+        self.assertEqual(self.service.rounds_to_play([-1.0] * 5, 1.0, 10.0, stop_on_loss=3), 3)
+        self.assertEqual(self.service.rounds_to_play([-1.0] * 5, 1.0, 2.0), 2)
+        self.assertEqual(self.service.required_balance([-1.0, -1.0, 3.0], 1.0), 3.0)
+
+    def test_client_seed_fits_the_journal(self):
+        """User client seeds are optional but limited to the journal column width"""
+        self.assertTrue(self.service.valid_client_seed(None))
+        self.assertTrue(self.service.valid_client_seed('s' * 64))
+        self.assertFalse(self.service.valid_client_seed('s' * 65))
+        self.assertFalse(self.service.valid_client_seed(12345))
+
+class RoundJournalTestCase(APITestCase):
+    """Test the buffered casino round journal"""
+
+    def setUp(self):
+        super().setUp()
+        from app.services.round_journal import RoundJournal
+        self.journal = RoundJournal()
+        self.journal._thread = True  # flush manually instead of on the timer
+
+    def test_history_newest_first(self):
+        """Flushed rounds are served newest first for one user and game"""
+        from app.services.round_journal import get_round_history
+        self.journal.record_many([
+            {'user_id': 1, 'game': 'dice', 'stake': 1.0, 'payout': 2.0, 'created_at': datetime(2026, 1, 1, 12, i)}
+            for i in range(3)
+        ] + [{'user_id': 1, 'game': 'plinko', 'stake': 1.0, 'payout': 0.5}])
+        self.assertEqual(self.journal.flush(), 4)
+        history = get_round_history(1, 'dice')
+        self.assertEqual([r['created_at'][-5:] for r in history], ['02:00', '01:00', '00:00'])
+        self.assertEqual(history[0]['status'], 'won')
+
+    def test_bad_round_does_not_block_the_rest(self):
+        """After MAX_RETRIES failed batches the good rounds are written and the bad one dropped"""
+        from app.models.casino_round import CasinoRound
+        self.journal.record_many([{'user_id': 1, 'game': 'dice', 'stake': 1.0},
+                                  {'user_id': 1, 'game': None, 'stake': 1.0},
+                                  {'user_id': 1, 'game': 'mines', 'stake': 1.0}])
+        for _ in range(self.journal.MAX_RETRIES):
+            self.assertEqual(self.journal.flush(), 0)
+        self.assertEqual(self.journal.flush(), 2)
+        self.assertEqual(self.journal.pending(), 0)
+        self.assertEqual(CasinoRound.query.count(), 2)
+        self.journal.record(1, 'dice', 1.0, 2.0, 2.0)
+        self.assertEqual(self.journal.flush(), 1)
+
+    def test_buffer_is_capped(self):
+        """The oldest rounds are dropped once the buffer limit is reached"""
+        self.journal.BUFFER_LIMIT = 5
+        self.journal.record_many([{'user_id': 1, 'game': 'dice', 'stake': float(i)} for i in range(8)])
+        self.assertEqual(self.journal.pending(), 5)
+        self.assertEqual(self.journal._buffer[0]['stake'], 3.0)
+
+class WebSocketEventsTestCase(APITestCase):
+    """Test socket authentication and cashout drop pushes"""
+
+    def setUp(self):
+        super().setUp()
+        import app.websocket_events as events
+        self.events = events
+        self._sweeper, events._cashout_sweeper = events._cashout_sweeper, True  # sweep manually
+        events._cashout_drops.clear()
+
+    def tearDown(self):
+        self.events._cashout_sweeper = self._sweeper
+        self.events._cashout_drops.clear()
+        super().tearDown()
+
+    def test_invalid_token_connects_anonymously(self):
+        """A stale token still connects, just without a user room"""
+        from unittest.mock import patch
+        from flask import request
+        with self.app.test_request_context('/'), \
+                patch.object(self.events, 'emit') as emit, patch.object(self.events, 'join_room') as join_room:
+            request.sid = 'sid'
+            self.assertIsNot(self.events.handle_connect({'token': 'stale'}), False)
+        join_room.assert_not_called()
+        self.assertFalse(emit.call_args[0][1]['authenticated'])
+
+    def test_cashout_drop_skips_closed_bets(self):
+        """Due drops are pushed only for bets that are still open"""
+        import time
+        from unittest.mock import patch
+        from app.models import BetStatus
+        bets = [Bet(user_id=1, amount=1.0, odds=2.0, potential_payout=2.0, bet_type='sports',
+                    event_description='Test bet', status=BetStatus.ACTIVE.value, is_cashed_out=cashed)
+                for cashed in (False, True)]
+        db.session.add_all(bets)
+        db.session.commit()
+        self.assertEqual(set(self.events._cashout_drops), {bet.id for bet in bets})
+
+        with patch.object(self.events, 'push_cashout_value') as push:
+            self.assertEqual(self.events.push_due_cashout_drops(), 0)  # refund window still open
+            self.assertEqual(self.events.push_due_cashout_drops(now=time.time() + 3600), 1)
+        self.assertEqual([c[0][:2] for c in push.call_args_list], [(1, bets[0].id)])
+        self.assertEqual(self.events._cashout_drops, {})
+
+    def test_live_score_change_pushes_cashouts(self):
+        """A live refresh that moves a match re-prices singles and accumulators on it, and only those"""
+        import json
+        from unittest.mock import patch
+        from app.models import BookingCode, Match
+        from app.models.game_pick import GamePick
+        from app.services.ingestion import IngestionPipeline
+        GamePick.__table__.create(db.engine, checkfirst=True)
+        moved, other = [Match(home_team=home, away_team='Away', match_date=datetime.utcnow(), status='live',
+                              home_score=0, away_score=0, match_time=30, home_odds=2.0, draw_odds=3.2,
+                              away_odds=3.5, api_fixture_id=fixture_id)
+                        for home, fixture_id in (('Home', 7), ('Other', 8))]
+        db.session.add_all([moved, other])
+        db.session.flush()
+        db.session.add(BookingCode(code='ACCA1', bet_data=json.dumps([
+            {'matchId': moved.id, 'market': '1x2', 'type': 'home'},
+            {'matchId': other.id, 'market': '1x2', 'type': 'away'}])))
+        single, acca, unrelated = [
+            Bet(user_id=user_id, match_id=match_id, booking_code=code, amount=1.0, odds=2.0, potential_payout=2.0,
+                bet_type='sports', market_type='1x2', selection='home', event_description='Test bet',
+                status='active', created_at=datetime(2026, 1, 1))
+            for user_id, match_id, code in ((1, moved.id, None), (2, None, 'ACCA1'), (3, other.id, None))
+        ]
+        db.session.add_all([single, acca, unrelated])
+        db.session.commit()
+        self.events._cashout_drops.clear()
+
+        record = {'home_score': 1, 'away_score': 0, 'elapsed': 31, 'status': 'live', 'status_code': '1H'}
+        with patch.object(self.events, 'push_cashout_value') as push, \
+                patch.object(self.events, 'broadcast_match_update'):
+            IngestionPipeline(adapter=object())._write_live({7: record})
+        self.assertCountEqual([c[0][:2] for c in push.call_args_list], [(1, single.id), (2, acca.id)])
+
+class MatchBroadcasterTestCase(unittest.TestCase):
+    """Test coalesced match deltas and resume"""
+
+    def setUp(self):
+        from app.services.match_broadcaster import MatchBroadcaster
+        self.broadcaster = MatchBroadcaster()
+        self.broadcaster._worker = True  # flush manually instead of on the timer
+
+    def test_coalesces_changed_fields(self):
+        """Updates in one window become one delta with only changed fields"""
+        self.broadcaster.publish(1, {'id': 1, 'status': 'NS', 'odds': {'home': 2.0, 'away': 3.0}})
+        self.broadcaster.publish(1, {'odds': {'home': 2.1}})
+        self.assertEqual(self.broadcaster.flush(), 1)
+        self.broadcaster.publish(1, {'id': 1, 'status': 'NS', 'odds': {'home': 2.1, 'away': 3.0}})
+        self.assertEqual(self.broadcaster.flush(), 0)
+        self.broadcaster.publish(1, {'status': '1H'})
+        self.broadcaster.flush()
+        self.assertEqual(self.broadcaster.deltas_since(1, 1),
+                         [{'kind': 'match', 'match_id': 1, 'seq': 2, 'changes': {'status': '1H'}}])
+        self.assertEqual(self.broadcaster.snapshot(1)['data']['odds.home'], 2.1)
+
+    def test_state_is_shared_and_namespaced(self):
+        """A second process sharing the store sees the sequence; picks don't collide with matches"""
+        from app.services.match_broadcaster import MatchBroadcaster
+        web = MatchBroadcaster(store=self.broadcaster.store)
+        self.broadcaster.publish(1, {'status': '1H'})
+        self.broadcaster.publish(1, {'status': 'FT'}, kind='pick')
+        self.assertEqual(self.broadcaster.flush(), 2)
+        self.assertEqual(web.snapshot(1), {'kind': 'match', 'match_id': 1, 'seq': 1, 'data': {'status': '1H'}})
+        self.assertEqual(web.snapshot(1, 'pick')['data'], {'status': 'FT'})
+        web._worker = True
+        web.publish(1, {'status': '1H'})
+        self.assertEqual(web.flush(), 0)  # already the shared state
+        web.publish(1, {'status': 'HT'})
+        web.flush()
+        self.assertEqual(self.broadcaster.deltas_since(1, 1)[0]['seq'], 2)
+
+    def test_resume_beyond_buffer_needs_snapshot(self):
+        """Clients further behind than the replay buffer get None (take a snapshot)"""
+        self.broadcaster.REPLAY_SIZE = 2
+        for minute in range(4):
+            self.broadcaster.publish(1, {'minute': minute})
+            self.broadcaster.flush()
+        self.assertIsNone(self.broadcaster.deltas_since(1, 0))
+        self.assertEqual(len(self.broadcaster.deltas_since(1, 2)), 2)
+
+class VirtualTimelineTestCase(unittest.TestCase):
+    """Test virtual round goal timelines"""
+
+    def test_timeline_matches_score(self):
+        """Timeline goals add up to the full-time and half-time scores"""
+        from app.services.virtual_game_service import VirtualGameService
+        events = VirtualGameService().build_timeline(3, 2, 1, 2)
+        minutes = [e['minute'] for e in events]
+        self.assertEqual(minutes, sorted(minutes))
+        self.assertEqual(events[-1]['score'], [3, 2])
+        first_half = [e['team'] for e in events if e['minute'] <= 45]
+        self.assertEqual((first_half.count('home'), first_half.count('away')), (1, 2))
+
+class VirtualPricingTestCase(unittest.TestCase):
+    """Test the Poisson pricing engine for virtual games"""
+
+    def test_markets_share_one_margin(self):
+        """Every market's implied probabilities sum to 1 + margin, in batch or one at a time"""
+        from app.services.virtual_pricing import PricingEngine
+        engine = PricingEngine(margin=0.05)
+        batch = engine.price([90, 70, 55], [60, 70, 85])
+        for odds in batch:
+            for market in (('home_odds', 'draw_odds', 'away_odds'), ('gg_odds', 'ng_odds'),
+                           ('over25_odds', 'under25_odds')):
+                book = sum(1 / odds[column] for column in market)
+                self.assertAlmostEqual(book, 1.05, delta=0.02)
+            # Double chance is the same outcomes at the same margin
+            self.assertAlmostEqual(1 / odds['home_draw_odds'],
+                                   1 / odds['home_odds'] + 1 / odds['draw_odds'], delta=0.02)
+        self.assertLess(batch[0]['home_odds'], batch[1]['home_odds'])
+        self.assertLess(batch[1]['home_odds'], batch[2]['home_odds'])
+        self.assertEqual(engine.price([55], [85])[0], batch[2])
+
+
+class VirtualSimulatorTestCase(unittest.TestCase):
+    """Test batch virtual match simulation against the pricing model"""
+
+    def test_results_follow_the_pricing_matrix(self):
+        """Simulated scores track the priced probabilities; goal minutes are in order"""
+        from app.services.virtual_pricing import PricingEngine
+        from app.services.virtual_simulator import RoundSimulator
+        engine = PricingEngine(margin=0.05)
+        simulator = RoundSimulator(engine, seed=7)
+        games = simulator.simulate([90] * 20000, [60] * 20000)
+        for goals in games[:200]:
+            minutes = [minute for minute, _ in goals]
+            self.assertEqual(minutes, sorted(minutes))
+            self.assertTrue(all(1 <= minute <= 90 for minute in minutes))
+        probabilities = engine.market_probabilities(engine.score_matrix(*engine.goal_rates([90], [60])))
+        home_wins = sum(1 for goals in games
+                        if sum(team == 'home' for _, team in goals) > sum(team == 'away' for _, team in goals))
+        self.assertAlmostEqual(home_wins / len(games), probabilities['home'][0], delta=0.02)
+        self.assertEqual(simulator.simulate([], []), [])
+
+
+class RTPVerifierTestCase(unittest.TestCase):
+    """Test the Monte Carlo RTP verifier against the game routes"""
+
+    def test_vectorized_mappings_match_routes(self):
+        """Batch plinko buckets and mine boards reproduce the single-round functions"""
+        import numpy as np
+        from app.routes.mines_routes import generate_mine_positions
+        from app.routes.plinko_routes import generate_plinko_path
+        from app.services.auto_bet_service import auto_bet_service
+        from app.services.rtp_verifier import mine_positions, plinko_buckets
+        digests = auto_bet_service.hash_rounds('server', 'client', 0, 300)
+        buckets = plinko_buckets(digests)
+        boards = mine_positions(digests, 12)
+        for i in range(300):
+            self.assertEqual(buckets[i], generate_plinko_path('server', 'client', nonce=i)[1])
+            self.assertEqual(set(np.flatnonzero(boards[i])), set(generate_mine_positions('server', f'client{i}', 12)))
+
+    def test_simulated_rtp_matches_expected(self):
+        """Sampled RTP lands within a few standard errors of the exact value for every game"""
+        from app.services.rtp_verifier import expected_rtp, simulate, summarize
+        for game, params in [('crash', {'cashout': 2.0}), ('dice', {'target': 25.0, 'prediction': 'under'}),
+                             ('plinko', {'risk': 'medium'}), ('mines', {'mines': 5, 'revealed': 4})]:
+            report = simulate(game, 100000, workers=1, seed=3, **params)
+            self.assertEqual(report['rounds'], 100000)
+            self.assertLess(abs(report['rtp'] - report['expected_rtp']), 5 * report['std_error'], game)
+        self.assertAlmostEqual(expected_rtp('dice', target=50.0, prediction='over'), 0.99, delta=0.001)
+        summary = summarize([0.0, 0.0, 0.0, 4.0])
+        self.assertEqual((summary['rtp'], summary['variance'], summary['max']), (1.0, 3.0, 4.0))
+        self.assertEqual(summary['percentiles']['p50'], 0.0)
+        self.assertEqual(summary['percentiles']['p99'], 4.0)
+
+    def test_crash_sampler_follows_route(self):
+        """The NumPy crash sampler has generate_crash_point's distribution"""
+        import numpy as np
+        from app.routes.crash_routes import generate_crash_point
+        from app.services.rtp_verifier import crash_points
+        route = np.array([generate_crash_point('server', 'client', i + 1) for i in range(20000)])
+        sampled = crash_points(np.random.default_rng(5), 20000)
+        for cut in (1.0, 2.0, 10.0):
+            self.assertAlmostEqual((route > cut).mean(), (sampled > cut).mean(), delta=0.02)
+        self.assertEqual(route.min(), 1.0)
+        self.assertLessEqual(route.max(), 50.0)
+
+    def test_dice_rolls_follow_route(self):
+        """Vectorized rolls and payouts match generate_dice_result round for round"""
+        import hashlib
+        import numpy as np
+        from app.routes.dice_routes import generate_dice_result
+        from app.services.rtp_verifier import dice_payouts, dice_results
+        digests = np.array([list(hashlib.sha256(f'serverclient{nonce}'.encode()).digest())
+                            for nonce in range(2000)], dtype=np.uint8)
+        rolls = [generate_dice_result('client', 'server', nonce) for nonce in range(2000)]
+        np.testing.assert_array_equal(dice_results(digests), rolls)
+        payouts = dice_payouts(digests, target=30.0, prediction='under')
+        np.testing.assert_array_equal(payouts, [3.3 if roll < 30.0 else 0.0 for roll in rolls])
+
+
+class SeasonGenerationTestCase(APITestCase):
+    """Test pre-generated virtual seasons"""
+
+    def test_double_round_robin_activates_by_round(self):
+        """20 teams give 38 rounds of 10; kickoff claims only the next round once it is due"""
+        from collections import Counter
+        from datetime import timedelta
+        from app.models.virtual_game import VirtualGame
+        from app.services.virtual_game_service import VirtualGameService
+        service = VirtualGameService()
+        league = service.create_league('Test League')
+        for i in range(20):
+            service.create_team(league.id, f'Team {i}', rating=70 + i)
+        start = datetime.utcnow() + timedelta(minutes=5)
+        self.assertEqual(service.generate_season(league.id, start), 1)
+
+        games = VirtualGame.query.all()
+        self.assertEqual(Counter(game.round_number for game in games), {r: 10 for r in range(1, 39)})
+        self.assertEqual(len({(game.home_team_id, game.away_team_id) for game in games}), 380)
+        for r in range(1, 39):
+            teams = [team for game in games if game.round_number == r
+                     for team in (game.home_team_id, game.away_team_id)]
+            self.assertEqual(len(set(teams)), 20)
+        self.assertTrue(all(game.events is not None for game in games))
+
+        self.assertEqual({game.round_number for game in service.get_upcoming_games(league.id)}, {1})
+        self.assertEqual(service.kickoff_round(league.id), [])
+        kicked = service.kickoff_round(league.id, now=start)
+        self.assertEqual({game.round_number for game in kicked}, {1})
+        self.assertEqual(service.next_round(league.id), (1, 2))
+
+
+class VirtualSchedulerTestCase(APITestCase):
+    """Test the server-side virtual league clock"""
+
+    def test_league_cycles_through_a_round(self):
+        """Season, countdown, kickoff at the slot, then full time settles the round once"""
+        from datetime import timedelta
+        from app.models.virtual_game import VirtualGame
+        from app.services.virtual_game_service import VirtualGameService
+        from app.services.virtual_scheduler import VirtualScheduler
+        service = VirtualGameService()
+        league = service.create_league('Test League')
+        for i in range(6):
+            service.create_team(league.id, f'Team {i}', rating=70 + i)
+        scheduler = VirtualScheduler(service, tick_seconds=1)
+        now = datetime.utcnow()
+
+        self.assertEqual(scheduler.tick(now), {league.id: 'new_season'})
+        self.assertEqual(scheduler.tick(now + timedelta(seconds=60)), {})
+        kickoff = now + timedelta(seconds=service.COUNTDOWN_SECONDS)
+        self.assertEqual(scheduler.tick(kickoff), {league.id: 'kickoff'})
+        self.assertEqual(len(service.get_live_games(league.id)), 3)
+        full_time = kickoff + timedelta(seconds=service.ROUND_DURATION_SECONDS)
+        self.assertEqual(scheduler.tick(full_time), {league.id: 'full_time'})
+        self.assertEqual(VirtualGame.query.filter_by(status='finished').count(), 3)
+        self.assertEqual(service.complete_round(league.id), [])
+        self.assertEqual(service.next_round(league.id), (1, 2))
+
+    def test_one_off_games_kick_off_when_due(self):
+        """A game created outside the season kicks off on its own slot and is finished and settled"""
+        from datetime import timedelta
+        from app.services.virtual_game_service import VirtualGameService
+        from app.services.virtual_scheduler import VirtualScheduler
+        service = VirtualGameService()
+        league = service.create_league('Test League')
+        teams = [service.create_team(league.id, f'Team {i}', rating=70 + i) for i in range(6)]
+        scheduler = VirtualScheduler(service, tick_seconds=1)
+        now = datetime.utcnow()
+        self.assertEqual(scheduler.tick(now), {league.id: 'new_season'})
+
+        start = now + timedelta(seconds=60)
+        one_off = service.create_game(league.id, teams[0].id, teams[1].id, start)
+        self.assertEqual(scheduler.advance(league.id, now + timedelta(seconds=1)), (None, start))
+        self.assertEqual(scheduler.advance(league.id, start)[0], 'kickoff')
+        self.assertEqual([game.id for game in service.get_live_games(league.id)], [one_off.id])
+        full_time = start + timedelta(seconds=service.ROUND_DURATION_SECONDS)
+        self.assertEqual(scheduler.advance(league.id, full_time)[0], 'full_time')
+        db.session.refresh(one_off)
+        self.assertEqual(one_off.status, 'finished')
+        self.assertIsNone(service.next_one_off_start(league.id))
+        self.assertEqual(service.next_round(league.id), (1, 1))
+
+
+class VirtualDeletionTestCase(APITestCase):
+    """Test chunked set-based deletion of virtual games"""
+
+    def test_reset_keeps_games_with_open_bets(self):
+        """Reset deletes in chunks and returns the count; games open bets depend on survive"""
+        from app.models.virtual_game import VirtualGame
+        from app.services.virtual_game_service import VirtualGameService
+        service = VirtualGameService()
+        league = service.create_league('Test League')
+        for i in range(6):
+            service.create_team(league.id, f'Team {i}', rating=70 + i)
+        service.generate_season(league.id)
+        game_ids = [game_id for (game_id,) in db.session.query(VirtualGame.id).order_by(VirtualGame.id)]
+        user = User(username='testuser', email='test@example.com', password_hash='x')
+        db.session.add(user)
+        db.session.flush()
+        db.session.add_all([
+            Bet(user_id=user.id, amount=1, odds=2, potential_payout=2, status='pending', bet_type='virtual',
+                event_description='Multi', selection=json.dumps([{'game_id': game_ids[0], 'selection': 'home'}])),
+            Bet(user_id=user.id, amount=1, odds=2, potential_payout=2, status='won', bet_type='virtual',
+                event_description='Multi', selection=json.dumps([{'game_id': game_ids[1], 'selection': 'home'}]))
+        ])
+        db.session.commit()
+
+        service.DELETE_CHUNK_SIZE = 7
+        result = service.reset_league(league.id)
+        self.assertEqual(result, {'games_deleted': len(game_ids) - 1, 'teams_count': 6})
+        self.assertEqual([game_id for (game_id,) in db.session.query(VirtualGame.id)], [game_ids[0]])
+
+    def test_delete_leagues_refuses_before_deleting(self):
+        """A league an open bet needs is left whole; delete-all removes the others with their teams"""
+        from app.models.virtual_game import VirtualGame, VirtualLeague, VirtualTeam
+        from app.services.virtual_game_service import VirtualGameService
+        service = VirtualGameService()
+        leagues = [service.create_league(f'League {n}') for n in range(3)]
+        for league in leagues:
+            for i in range(4):
+                service.create_team(league.id, f'Team {league.id}-{i}')
+            service.generate_season(league.id)
+        ids = [league.id for league in leagues]
+        single, leg = [db.session.query(VirtualGame.id).filter_by(league_id=league_id).first()[0]
+                       for league_id in ids[:2]]
+        user = User(username='testuser', email='test@example.com', password_hash='x')
+        db.session.add(user)
+        db.session.flush()
+        db.session.add_all([
+            Bet(user_id=user.id, match_id=single, amount=1, odds=2, potential_payout=2, status='active',
+                bet_type='virtual', event_description='Single', selection='home'),
+            Bet(user_id=user.id, amount=1, odds=2, potential_payout=2, status='pending', bet_type='virtual',
+                event_description='Multi', selection=json.dumps([{'game_id': str(leg), 'selection': 'home'}]))
+        ])
+        db.session.commit()
+        games = VirtualGame.query.filter_by(league_id=ids[0]).count()
+
+        with self.assertRaises(ValueError):
+            service.delete_league(ids[0])
+        self.assertEqual(VirtualGame.query.filter_by(league_id=ids[0]).count(), games)
+
+        summary = service.delete_all_leagues()
+        self.assertEqual((summary['leagues_deleted'], summary['teams_deleted']), (1, 4))
+        self.assertEqual(summary['leagues_kept'], [ids[0], ids[1]])
+        self.assertEqual(VirtualLeague.query.count(), 2)
+        self.assertEqual(VirtualTeam.query.filter_by(league_id=ids[2]).count(), 0)
+        self.assertEqual(VirtualGame.query.filter_by(league_id=ids[2]).count(), 0)
+
+        service.DELETE_CHUNK_SIZE = 2
+        self.assertEqual(service.delete_games(VirtualGame.league_id.in_([ids[0], ids[1]])), 2 * games - 2)
+        self.assertEqual(sorted(game_id for (game_id,) in db.session.query(VirtualGame.id)), sorted([single, leg]))
+
+
+class VirtualSeasonArchiveTestCase(APITestCase):
+    """Test packing finished virtual seasons into the archive"""
+
+    def test_archived_season_answers_history(self):
+        """A finished season becomes one archive row with the same table and head-to-head"""
+        from app.models.virtual_game import VirtualGame, VirtualSeasonArchive
+        from app.services.virtual_game_service import VirtualGameService
+        from app.services.virtual_season_archive import (
+            archive_finished_seasons, head_to_head, season_standings, standings_table
+        )
+        service = VirtualGameService()
+        league = service.create_league('Test League')
+        teams = [service.create_team(league.id, f'Team {i}', rating=70 + i) for i in range(6)]
+        service.generate_season(league.id)
+        self.assertEqual(archive_finished_seasons(), 0)
+
+        games = VirtualGame.query.all()
+        for game in games:
+            service._apply_timeline(game)
+            game.status = 'finished'
+        db.session.commit()
+        table = standings_table([g.home_team_id for g in games], [g.away_team_id for g in games],
+                                [g.home_score for g in games], [g.away_score for g in games],
+                                {team.id: team.name for team in teams})
+        meetings = head_to_head(league.id, teams[0].id, teams[1].id)
+        self.assertEqual(meetings['summary']['played'], 2)
+
+        self.assertEqual(archive_finished_seasons(), 1)
+        self.assertEqual(VirtualGame.query.count(), 0)
+        self.assertEqual(VirtualSeasonArchive.query.one().games_count, 30)
+        self.assertEqual(season_standings(league.id, 1), table)
+        self.assertEqual(head_to_head(league.id, teams[0].id, teams[1].id), meetings)
+
+    def test_seasons_number_on_after_rollover(self):
+        """Two season rollovers through the scheduler archive seasons 1 and 2 and open season 3"""
+        from app.models.virtual_game import VirtualGame, VirtualSeasonArchive
+        from app.services.virtual_game_service import VirtualGameService
+        from app.services.virtual_scheduler import VirtualScheduler
+        service = VirtualGameService()
+        league = service.create_league('Test League')
+        for i in range(4):
+            service.create_team(league.id, f'Team {i}', rating=70 + i)
+        scheduler = VirtualScheduler(service, tick_seconds=1)
+
+        now, seasons = datetime.utcnow(), 0
+        for _ in range(200):
+            action, due = scheduler.advance(league.id, now)
+            seasons += action == 'new_season'
+            if seasons == 3:
+                break
+            now = max(now, due)
+        self.assertEqual(seasons, 3)
+        self.assertEqual(sorted(a.season_number for a in VirtualSeasonArchive.query.all()), [1, 2])
+        self.assertEqual({g.season_number for g in VirtualGame.query.all()}, {3})
+        self.assertEqual(service.next_round(league.id), (3, 1))
+
+
+class MatchUpsertTestCase(APITestCase):
+    """Test bulk fixture upserts with change detection"""
+
+    def fixture(self, fixture_id, home_score=None):
+        return {
+            'api_fixture_id': fixture_id, 'home_team': 'Home', 'away_team': 'Away', 'league': 'Stub League',
+            'match_date': datetime(2026, 1, 1, 15), 'status': 'scheduled', 'home_score': home_score,
+            'away_score': None, 'home_odds': 2.0, 'draw_odds': 3.0, 'away_odds': 3.5, 'is_manual': False
+        }
+
+    def test_only_new_and_changed_fixtures_are_written(self):
+        """Re-syncing identical fixtures writes nothing; a changed score updates one row"""
+        from app.models import Match
+        from app.services.match_upsert import upsert_matches
+        fields = ('home_team', 'away_team', 'league', 'match_date', 'status', 'home_score', 'away_score')
+        self.assertEqual(upsert_matches([self.fixture(1), self.fixture(2)], fields), (2, 0))
+        db.session.commit()
+        self.assertEqual(upsert_matches([self.fixture(1), self.fixture(2)], fields), (0, 0))
+
+        changed = dict(self.fixture(2, home_score=1), home_odds=9.0)
+        self.assertEqual(upsert_matches([self.fixture(1), changed, self.fixture(3)], fields), (1, 1))
+        db.session.commit()
+        match = Match.query.filter_by(api_fixture_id=2).one()
+        self.assertEqual((match.home_score, match.home_odds), (1, 2.0))  # odds are insert-only
+        self.assertEqual(Match.query.count(), 3)
+
+class LiabilityTestCase(APITestCase):
+    """Test the house liability book and scenario evaluator"""
+
+    def test_book_tracks_placement_and_settlement(self):
+        """Singles and accumulator legs add exposure once placed; settling or a bulk update removes it"""
+        from app.models import Match, BookingCode
+        from app.services.betting_service import BettingService
+        from app.services.liability import load_book
+        user = User(username='testuser', email='test@example.com', password_hash='x', balance=100)
+        match, other = Match(home_team='Home', away_team='Away', match_date=datetime(2026, 1, 1)), \
+            Match(home_team='Red', away_team='Blue', match_date=datetime(2026, 1, 1))
+        db.session.add_all([user, match, other])
+        db.session.commit()
+
+        service = BettingService()
+        home = service.create_bet(user, 10, 2.0, 'sports', 'Home vs Away', '1x2', 'home', match_id=match.id)
+        service.create_bet(user, 5, 4.0, 'sports', 'Home vs Away', 'ou2', 'under2', match_id=match.id)
+        db.session.add(BookingCode(code='ACC1', bet_data=json.dumps([
+            {'matchId': match.id, 'market': 'cs', 'type': '2-0'},
+            {'matchId': other.id, 'market': 'gg', 'type': 'no'}
+        ])))
+        service.create_bet(user, 1, 30.0, 'sports', 'MULTI: ...', 'accumulator', '2 picks', booking_code='ACC1')
+
+        book = load_book(db.session)
+        worst = {row['match_id']: row for row in book.worst_cases(max_goals=5)}
+        self.assertEqual(worst[match.id]['worst_score'], '2-0')  # home + under 2.5 + correct score
+        self.assertAlmostEqual(worst[match.id]['worst_payout'], 20 + 20 + 30)
+        self.assertAlmostEqual(worst[other.id]['worst_payout'], 30)
+        ids, grid = book.scenarios([match.id], max_goals=5)
+        self.assertAlmostEqual(grid[0, 1, 1], 20)  # a draw only pays the under
+
+        service.settle_bet(home, 'loss')
+        book = load_book(db.session)
+        worst = {row['match_id']: row for row in book.worst_cases(max_goals=5)}
+        self.assertAlmostEqual(worst[match.id]['worst_payout'], 50)
+        self.assertEqual(book.exposure(match.id)[match.id]['stake'], 6)
+
+        # Set-based updates bypass the ORM but are still seen
+        Bet.query.filter_by(booking_code='ACC1').update({'status': 'cancelled'}, synchronize_session=False)
+        db.session.commit()
+        self.assertEqual(load_book(db.session).exposure(), {match.id: {'stake': 5, 'outcomes': {'under2.5': 20}}})
+
+
+class CashoutPricerTestCase(APITestCase):
+    """Test model-based cashout quotes"""
+
+    def test_quotes_follow_the_live_score(self):
+        """A winning selection quotes above stake, a losing one below; unpriced bets keep the flat rule"""
+        from datetime import timedelta
+        from app.models import Match
+        from app.services.cashout_pricer import cashout_pricer
+        user = User(username='testuser', email='test@example.com', password_hash='x', balance=100)
+        match = Match(home_team='Home', away_team='Away', match_date=datetime(2026, 1, 1),
+                      home_odds=2.2, draw_odds=3.3, away_odds=3.4)
+        db.session.add_all([user, match])
+        db.session.flush()
+        placed = datetime.utcnow() - timedelta(minutes=10)
+        home, away, virtual = [
+            Bet(user_id=user.id, match_id=match.id, amount=10, odds=odds, potential_payout=10 * odds,
+                bet_type=kind, market_type='1x2', selection=selection, event_description='Home vs Away',
+                status='active', created_at=placed)
+            for kind, selection, odds in (('sports', 'home', 2.2), ('sports', 'away', 3.4), ('virtual', 'home', 2.0))
+        ]
+        db.session.add_all([home, away, virtual])
+        db.session.commit()
+
+        before = cashout_pricer.quotes([home, away])
+        self.assertAlmostEqual(before[home.id]['win_probability'] * 2.2, 1.0, delta=0.1)  # fitted to the odds
+
+        match.status, match.home_score, match.away_score, match.match_time = 'live', 2, 0, 80
+        match.match_time_at = datetime.utcnow()
+        db.session.commit()
+        quotes = cashout_pricer.quotes([home, away, virtual])
+        self.assertGreater(quotes[home.id]['win_probability'], 0.95)
+        self.assertGreater(quotes[home.id]['cashout_value'], 10)
+        self.assertLess(quotes[away.id]['cashout_value'], before[away.id]['cashout_value'])
+        self.assertFalse(quotes[virtual.id]['priced'])
+        self.assertAlmostEqual(quotes[virtual.id]['cashout_value'], 8.5)
+
+        # HT/FT in the second half needs the half-time score, then rides on the full-time result
+        self.assertIsNone(cashout_pricer.probability('htft:hh', match))
+        match.ht_home_score, match.ht_away_score = 1, 0
+        self.assertAlmostEqual(cashout_pricer.probability('htft:hh', match),
+                               quotes[home.id]['win_probability'], delta=1e-6)
+
+
+class BetBuilderTestCase(APITestCase):
+    """Test same-match multi pricing"""
+
+    def test_same_game_legs_are_priced_jointly(self):
+        """Single legs match the listed odds; correlated legs price off the joint distribution"""
+        from datetime import timedelta
+        from app.services.bet_builder import bet_builder
+        from app.services.virtual_game_service import VirtualGameService
+        service = VirtualGameService()
+        league = service.create_league('Test League')
+        home, away = service.create_team(league.id, 'Home', rating=85), service.create_team(league.id, 'Away', rating=65)
+        game = service.create_game(league.id, home.id, away.id, datetime.utcnow() + timedelta(minutes=5))
+
+        single = bet_builder.quote_virtual([{'game_id': game.id, 'market': '1X2', 'selection': '1'}])
+        self.assertAlmostEqual(single['total_odds'], game.home_odds, delta=0.011)
+
+        legs = [{'game_id': game.id, 'market': '1X2', 'selection': '1'},
+                {'game_id': game.id, 'market': 'O/U', 'selection': 'Over'}]
+        joint = bet_builder.quote_virtual(legs)
+        self.assertEqual(len(joint['groups']), 1)
+        self.assertLess(joint['total_odds'], game.home_odds * game.over25_odds)  # positively correlated
+        self.assertGreater(joint['total_odds'], game.over25_odds)
+
+        # Legs implied by each other price as the stronger leg alone
+        implied = bet_builder.quote_virtual([legs[0], {'game_id': game.id, 'market': 'DC', 'selection': '1X'}])
+        self.assertEqual(implied['total_odds'], single['total_odds'])
+        with self.assertRaises(ValueError):
+            bet_builder.quote_virtual([legs[0], {'game_id': game.id, 'market': 'CS', 'selection': '0-0'}])
+
+
+class MatchArchiveTestCase(APITestCase):
+    """Test archival of finished matches"""
+
+    def test_archives_settled_finished_matches_only(self):
+        """Old finished matches move to the archive unless they still have open bets"""
+        from datetime import timedelta
+        from app.models import Match, MatchArchive
+        from app.services.match_archive_service import archive_finished_matches
+        user = User(username='testuser', email='test@example.com', password_hash='x')
+        db.session.add(user)
+        old = datetime.utcnow() - timedelta(days=3)
+        done, open_bets, recent = [
+            Match(home_team='Home', away_team='Away', match_date=date, status='finished')
+            for date in (old, old, datetime.utcnow())
+        ]
+        db.session.add_all([done, open_bets, recent])
+        db.session.flush()
+        settled = Bet(user_id=user.id, match_id=done.id, amount=1, odds=2, potential_payout=2,
+                      bet_type='sports', event_description='Home vs Away', status='won')
+        db.session.add_all([settled, Bet(user_id=user.id, match_id=open_bets.id, amount=1, odds=2,
+                                         potential_payout=2, bet_type='sports',
+                                         event_description='Home vs Away', status='active')])
+        db.session.commit()
+        done_id, settled_id = done.id, settled.id
+
+        self.assertEqual(archive_finished_matches(retention_days=1, chunk_size=1), 1)
+        db.session.expire_all()
+        self.assertEqual(Match.query.count(), 2)
+        self.assertEqual(MatchArchive.query.count(), 1)
+        bet = db.session.get(Bet, settled_id)
+        self.assertEqual((bet.match_id, bet.match_record.status), (done_id, 'finished'))
+
+    def test_keeps_matches_with_open_booking_code_legs(self):
+        """A leg of an open booking-code accumulator keeps its match in the hot table"""
+        from datetime import timedelta
+        from app.models import Match, MatchArchive, BookingCode
+        from app.services.match_archive_service import archive_finished_matches
+        user = User(username='testuser', email='test@example.com', password_hash='x')
+        db.session.add(user)
+        old = datetime.utcnow() - timedelta(days=3)
+        matches = [Match(home_team=f'Home {n}', away_team='Away', match_date=old, status='finished')
+                   for n in range(3)]
+        db.session.add_all(matches)
+        db.session.flush()
+        legs = [{'matchId': match.id, 'market': '1X2', 'type': '1'} for match in matches[:2]]
+        db.session.add_all([
+            BookingCode(code='ACCA1', bet_data=json.dumps(legs)),
+            Bet(user_id=user.id, booking_code='ACCA1', amount=1, odds=4, potential_payout=4,
+                bet_type='sports', event_description='Accumulator', status='pending')
+        ])
+        db.session.commit()
+        kept = {matches[0].id, matches[1].id}
+
+        self.assertEqual(archive_finished_matches(retention_days=1, chunk_size=1), 1)
+        db.session.expire_all()
+        self.assertEqual({match.id for match in Match.query.all()}, kept)
+        self.assertEqual(MatchArchive.query.count(), 1)
+
+class SportsAPIStubTestCase(unittest.TestCase):
+    """Test the sports-API fetcher and response cache against a local stub server"""
+
+    def setUp(self):
+        import tempfile
+        import threading
+        from http.server import BaseHTTPRequestHandler, HTTPServer
+        from urllib.parse import urlparse, parse_qs
+        self.requests_seen = []
+        seen = self.requests_seen
+
+        class StubHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                params = parse_qs(urlparse(self.path).query)
+                seen.append(params)
+                if urlparse(self.path).path == '/odds':
+                    # Two pages per date: fixture 7 on page 1, fixture 8 on page 2
+                    page = int(params['page'][0])
+                    bets = [
+                        {'name': 'Match Winner', 'values': [{'value': 'Home', 'odd': '1.90'},
+                                                            {'value': 'Draw', 'odd': '3.40'},
+                                                            {'value': 'Away', 'odd': '4.20'}]},
+                        {'name': 'Exact Score', 'values': [{'value': '1:0', 'odd': '6.50'}]}
+                    ]
+                    body = json.dumps({'paging': {'current': page, 'total': 2}, 'response': [{
+                        'fixture': {'id': 6 + page},
+                        'bookmakers': [{'id': 8, 'name': 'Bet365', 'bets': bets}]
+                    }]}).encode()
+                    self.send_response(200)
+                    self.send_header('Content-Type', 'application/json')
+                    self.end_headers()
+                    self.wfile.write(body)
+                    return
+                # ?ids= lookups return finished fixtures; everything else one live fixture
+                ids = params['ids'][0].split('-') if 'ids' in params else ['7']
+                fixtures = [{
+                    'fixture': {'id': int(fid), 'date': '2026-01-01T15:00:00+00:00',
+                                'status': {'short': 'FT' if 'ids' in params else '2H', 'elapsed': 90 if 'ids' in params else 60}},
+                    'teams': {'home': {'name': 'Home'}, 'away': {'name': 'Away'}},
+                    'league': {'id': 39, 'name': 'Stub League'},
+                    'goals': {'home': 1, 'away': 0}
+                } for fid in ids]
+                body = json.dumps({'results': len(fixtures), 'response': fixtures}).encode()
+                if self.headers.get('If-None-Match') == '"v1"':
+                    self.send_response(304)
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('ETag', '"v1"')
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = HTTPServer(('127.0.0.1', 0), StubHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url = f'http://127.0.0.1:{self.server.server_port}'
+
+        from app.services.http_cache import api_cache
+        self.cache = api_cache
+        self.cache_dir = tempfile.mkdtemp()
+        self.saved_cache = (api_cache.cache_dir, api_cache.mode)
+        api_cache.cache_dir, api_cache.mode = self.cache_dir, 'normal'
+
+    def tearDown(self):
+        import shutil
+        self.server.shutdown()
+        self.server.server_close()
+        self.cache.cache_dir, self.cache.mode = self.saved_cache
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+    def test_cache_revalidates_with_etag(self):
+        """Fresh entries skip the network; stale ones are revalidated with If-None-Match"""
+        params = {'date': '2026-01-01'}
+        first = self.cache.get_json(f'{self.url}/fixtures', params=params)
+        self.assertEqual(self.cache.get_json(f'{self.url}/fixtures', params=params), first)
+        self.assertEqual(len(self.requests_seen), 1)
+
+        self.cache.ENDPOINT_TTLS = dict(self.cache.ENDPOINT_TTLS, fixtures=0)
+        try:
+            self.assertEqual(self.cache.get_json(f'{self.url}/fixtures', params=params), first)
+        finally:
+            del self.cache.ENDPOINT_TTLS
+        self.assertEqual(len(self.requests_seen), 2)
+        self.assertEqual(self.cache.revalidated, 1)
+
+    def test_prune_drops_old_and_least_used(self):
+        """Entries past MAX_AGE go, then the least recently used beyond MAX_ENTRIES; live TTL beats the tick"""
+        import os
+        import time
+        from app.services.http_cache import ResponseCache
+        from app.services.poll_scheduler import TICK_SECONDS
+        self.assertLess(ResponseCache.LIVE_TTL * 2, TICK_SECONDS)
+        cache = ResponseCache(cache_dir=self.cache_dir, mode='normal')
+        cache.MAX_ENTRIES = 2
+        now = time.time()
+        for i, age in enumerate((10, 20, 30, cache.MAX_AGE + 1)):
+            path = cache._path(f'{self.url}/fixtures', {'ids': str(i)})
+            cache._store(path, {'stored_at': now, 'body': i})
+            os.utime(path, (now - age, now - age))
+        self.assertEqual(cache.prune(now), 2)
+        self.assertEqual(sorted(cache._load(os.path.join(self.cache_dir, name))['body']
+                                for name in os.listdir(self.cache_dir)), [0, 1])
+
+    def test_record_then_replay_offline(self):
+        """Recorded payloads are replayed without the network; unknown requests miss"""
+        from app.services.http_cache import CacheMiss
+        self.cache.mode = 'record'
+        recorded = self.cache.get_json(f'{self.url}/fixtures', params={'live': 'all'})
+        self.server.shutdown()
+        self.cache.mode = 'replay'
+        self.assertEqual(self.cache.get_json(f'{self.url}/fixtures', params={'live': 'all'}), recorded)
+        with self.assertRaises(CacheMiss):
+            self.cache.get_json(f'{self.url}/leagues')
+
+    def test_fetches_all_dates_from_stub(self):
+        """Every date is fetched concurrently and parsed from the stub"""
+        from app.services.multi_sport_api_service import MultiSportAPIService
+        service = MultiSportAPIService()
+        service.initialize('stub-key', base_url=self.url,
+                           per_minute=60, per_day=100)
+        matches = service.get_all_sports_matches(days_ahead=3)
+        self.assertEqual(len(matches), 3)
+        self.assertEqual(len(self.requests_seen), 3)
+        self.assertEqual(matches[0]['home_team'], 'Home')
+
+    def test_live_refresh_writes_only_changes(self):
+        """One live=all call plus one multi-id call; unchanged matches are not written"""
+        from app.models import Match
+        from app.services.multi_sport_api_service import MultiSportAPIService
+        app = create_app('testing')
+        with app.app_context():
+            db.create_all()
+            unchanged = Match(home_team='Home', away_team='Away', match_date=datetime.utcnow(), status='live',
+                              home_score=1, away_score=0, match_time=60, api_fixture_id=7)
+            finished = Match(home_team='Home', away_team='Away', match_date=datetime.utcnow(), status='live',
+                             home_score=1, away_score=0, match_time=88, api_fixture_id=8)
+            db.session.add_all([unchanged, finished])
+            db.session.commit()
+            stamp = unchanged.updated_at
+
+            service = MultiSportAPIService()
+            service.initialize('stub-key', base_url=self.url,
+                               per_minute=60, per_day=100)
+            self.assertEqual(service.update_live_matches(), 1)
+            self.assertEqual(len(self.requests_seen), 2)
+            self.assertEqual(db.session.get(Match, finished.id).status, 'finished')
+            self.assertEqual(db.session.get(Match, unchanged.id).updated_at, stamp)
+            db.session.remove()
+            db.drop_all()
+
+    def test_schedule_fans_out_to_every_consumer(self):
+        """One fetch per date feeds both matches and game picks; a re-run writes nothing"""
+        from app.models import Match
+        from app.models.game_pick import GamePick
+        from app.services.ingestion import ApiSportsAdapter, IngestionPipeline
+        from app.services.multi_sport_api_service import MultiSportAPIService
+        app = create_app('testing')
+        with app.app_context():
+            db.create_all()
+            service = MultiSportAPIService()
+            service.initialize('stub-key', base_url=self.url,
+                               per_minute=60, per_day=100)
+            pipeline = IngestionPipeline(adapter=ApiSportsAdapter(service))
+            summary = pipeline.run_schedule(days_ahead=2)
+            self.assertEqual(len(self.requests_seen), 2)
+            self.assertEqual((summary['matches'], summary['game_picks']), ((1, 0), (1, 0)))
+            self.assertEqual(Match.query.filter_by(api_fixture_id=7).count(), 1)
+            self.assertEqual(GamePick.query.filter_by(api_fixture_id=7).count(), 1)
+
+            summary = pipeline.run_schedule(days_ahead=2)
+            self.assertEqual((summary['matches'], summary['game_picks']), ((0, 0), (0, 0)))
+            db.session.remove()
+            db.drop_all()
+
+    def test_odds_pages_bulk_write(self):
+        """Every odds page of a listed date is fetched and prices land in both tables"""
+        from app.models import Match
+        from app.models.game_pick import GamePick
+        from app.services.ingestion import ApiSportsAdapter, IngestionPipeline
+        from app.services.multi_sport_api_service import MultiSportAPIService
+        app = create_app('testing')
+        with app.app_context():
+            db.create_all()
+            match = Match(home_team='Home', away_team='Away', match_date=datetime.utcnow(), status='scheduled',
+                          home_odds=2.0, draw_odds=3.0, away_odds=2.5, api_fixture_id=7)
+            pick = GamePick(match_name='Home vs Away', league='Stub League', home_team='Home', away_team='Away',
+                            kick_off_time=datetime.utcnow(), status='NS', api_fixture_id=8)
+            db.session.add_all([match, pick])
+            db.session.commit()
+
+            service = MultiSportAPIService()
+            service.initialize('stub-key', base_url=self.url,
+                               per_minute=60, per_day=100)
+            pipeline = IngestionPipeline(adapter=ApiSportsAdapter(service))
+            summary = pipeline.run_odds()
+            self.assertEqual((summary['pages'], summary['matches'], summary['game_picks']), (2, 1, 1))
+            self.assertEqual(len(self.requests_seen), 2)
+
+            db.session.expire_all()
+            match, pick = db.session.get(Match, match.id), db.session.get(GamePick, pick.id)
+            self.assertEqual((match.home_odds, match.draw_odds, match.away_odds), (1.9, 3.4, 4.2))
+            self.assertEqual(json.loads(match.correct_score_odds), {'1-0': 6.5})
+            self.assertEqual((pick.odds_home, pick.odds_1_0), (1.9, 6.5))
+
+            summary = pipeline.run_odds()
+            self.assertEqual((summary['matches'], summary['game_picks']), (0, 0))
+            db.session.remove()
+            db.drop_all()
+
+    def test_tick_polls_only_due_fixtures(self):
+        """In-play fixtures are polled every tick, later ones only on their interval; minutes interpolate"""
+        from datetime import timedelta
+        from app.models import Match
+        from app.models.game_pick import GamePick
+        from app.services.ingestion import ApiSportsAdapter, IngestionPipeline
+        from app.services.multi_sport_api_service import MultiSportAPIService
+        from app.services.poll_scheduler import LocalPollStore, PollScheduler
+        app = create_app('testing')
+        with app.app_context():
+            db.create_all()
+            live = Match(home_team='Home', away_team='Away', match_date=datetime.utcnow(), status='live',
+                         home_score=0, away_score=0, match_time=55, api_fixture_id=7)
+            later = GamePick(match_name='Home vs Away', league='Stub League', home_team='Home', away_team='Away',
+                             kick_off_time=datetime.utcnow() + timedelta(days=3), status='NS', api_fixture_id=9)
+            db.session.add_all([live, later])
+            db.session.commit()
+
+            service = MultiSportAPIService()
+            service.initialize('stub-key', base_url=self.url,
+                               per_minute=60, per_day=100)
+            pipeline = IngestionPipeline(adapter=ApiSportsAdapter(service), poller=PollScheduler(store=LocalPollStore()))
+            # Never polled: both fixtures are due once
+            summary = pipeline.run_tick(timestamp=3600 * 1000)
+            self.assertEqual((summary['due'], summary['requests'], summary['matches']), (2, 2, 1))
+            self.assertCountEqual(self.requests_seen, [{'live': ['all']}, {'ids': ['9']}])
+            db.session.get(GamePick, later.id).status = 'NS'
+            db.session.commit()
+
+            summary = pipeline.run_tick(timestamp=3600 * 1000 + 15)
+            self.assertEqual((summary['due'], summary['requests']), (1, 1))
+
+            _, by_date = pipeline.poller.plan(pipeline._tracked_fixtures(), datetime.utcnow(), 3600 * 1001)
+            self.assertEqual(sum(by_date.values(), []), [9])
+
+            match = db.session.get(Match, live.id)
+            self.assertEqual(match.live_minute, 60)
+            match.match_time_at = datetime.utcnow() - timedelta(minutes=10)
+            self.assertEqual(match.live_minute, 70)
+            match.match_time_at = datetime.utcnow() - timedelta(minutes=50)
+            self.assertEqual(match.live_minute, 90)
+            db.session.remove()
+            db.drop_all()
+
+    def test_postponed_fixtures_back_off(self):
+        """Fixtures past kick-off that never go live are polled less and less often, up to the cap"""
+        from datetime import timedelta
+        from app.services.poll_scheduler import (LocalPollStore, PollScheduler, STATE_OVERDUE,
+                                                 STATE_KICK_OFF_SOON, fixture_state)
+        poller = PollScheduler(store=LocalPollStore())
+        now = datetime(2026, 1, 1, 18, 0)
+        self.assertEqual(fixture_state(False, now - timedelta(minutes=5), now), STATE_KICK_OFF_SOON)
+        self.assertEqual(fixture_state(False, now - timedelta(minutes=20), now), STATE_OVERDUE)
+        intervals = [poller.interval(STATE_OVERDUE, now - timedelta(minutes=minutes), now) + poller.tick / 2
+                     for minutes in (20, 35, 50, 240, 3000)]
+        self.assertEqual(intervals, [60, 120, 240, 3600, 3600])
+
+        fixtures = {5: (False, now - timedelta(hours=6))}
+        due = [t for t in range(0, 7200, poller.tick) if poller.plan(fixtures, now, t)[1]]
+        self.assertEqual(due, [0, 3600])
+
+    def test_fetch_job_reports_progress_and_cancels(self):
+        """Admin fetches run as background jobs with progress; a cancelled job stops before its next step"""
+        import os
+        import time
+        from app.services.fetch_jobs import FetchJob, FetchJobManager, JOB_FETCH_MATCHES
+        app = create_app('testing')
+        os.environ['API_SPORTS_BASE_URL'] = self.url
+        try:
+            with app.app_context():
+                db.create_all()
+                manager = FetchJobManager()
+                job, started = manager.start(app, JOB_FETCH_MATCHES, 1, 'stub-key', days_ahead=2)
+                self.assertTrue(started)
+                job_id = job.id
+                self.assertEqual(manager.start(app, JOB_FETCH_MATCHES, 1, 'stub-key')[0].id, job_id)
+                deadline = time.time() + 10
+                while not job.finished and time.time() < deadline:
+                    time.sleep(0.05)
+                    db.session.expire_all()
+                    job = manager.get(job_id)
+                self.assertEqual(job.status, 'completed')
+                # One step per date, each one fetched call (the stub lists one fixture per date)
+                self.assertEqual((job.progress['steps_total'], job.progress['steps_done']), (2, 2))
+                self.assertEqual(job.progress['created'], 1)
+                self.assertIsNone(job.active_kind)
+
+                cancelled = FetchJob(id='c' * 32, kind=JOB_FETCH_MATCHES, active_kind=JOB_FETCH_MATCHES,
+                                     user_id=1, params={'days_ahead': 7}, progress={})
+                db.session.add(cancelled)
+                db.session.commit()
+                self.assertTrue(manager.cancel(cancelled.id).cancel_requested)
+                manager._run(app, cancelled.id, 'stub-key')
+                db.session.expire_all()
+                cancelled = manager.get('c' * 32)
+                self.assertEqual((cancelled.status, cancelled.progress['steps_done']), ('cancelled', 0))
+                self.assertEqual([j['id'] for j in manager.list()], ['c' * 32, job_id])
+                db.session.remove()
+                db.drop_all()
+        finally:
+            del os.environ['API_SPORTS_BASE_URL']
+
+    def test_circuit_opens_and_fails_fast(self):
+        """Repeated upstream failures open the host's circuit; later calls never reach it"""
+        from app.services.http_client import HttpClient, CircuitOpenError
+        client = HttpClient()
+        client.MAX_RETRIES, client.BACKOFF_BASE = 0, 0
+        port = self.server.server_port
+        self.server.shutdown()
+        self.server.server_close()
+        for _ in range(5):
+            with self.assertRaises(requests.exceptions.ConnectionError):
+                client.get(f'http://127.0.0.1:{port}/fixtures', timeout=1)
+        with self.assertRaises(CircuitOpenError):
+            client.get(f'http://127.0.0.1:{port}/fixtures', timeout=1)
+        stats = client.stats()[f'127.0.0.1:{port}']
+        self.assertEqual((stats['errors'], stats['rejected'], stats['circuit']), (5, 1, 'open'))
+
+    def test_half_open_trial_is_always_settled(self):
+        """A trial ending in any requests error reopens the circuit instead of wedging it"""
+        from unittest.mock import patch
+        from app.services.http_client import HttpClient
+        client = HttpClient()
+        url = f'{self.url}/fixtures'
+        session, breaker, _ = client._host(f'127.0.0.1:{self.server.server_port}')
+        breaker.reset_timeout, breaker.opened_at = 0, 0.0  # open, and due a trial
+        with patch.object(session, 'request', side_effect=requests.exceptions.ChunkedEncodingError('cut')):
+            with self.assertRaises(requests.exceptions.ChunkedEncodingError):
+                client.get(url)
+        with patch.object(session, 'request', side_effect=ValueError('bad kwargs')):
+            with self.assertRaises(ValueError):
+                client.get(url)
+        self.assertEqual(client.get(url).status_code, 200)
+        self.assertEqual(breaker.state, 'closed')
+
+    def test_priority_and_daily_quota(self):
+        """Live requests run before future ones and the daily cap is enforced"""
+        import threading
+        from app.services.fetch_scheduler import FetchScheduler, QuotaExceeded, PRIORITY_LIVE, PRIORITY_FUTURE
+        scheduler = FetchScheduler(per_minute=60, per_day=4, max_workers=1)
+        order = []
+        gate = threading.Event()
+        scheduler.submit(PRIORITY_LIVE, gate.wait, 5)  # hold the worker while the queue fills
+        calls = [
+            (PRIORITY_FUTURE, order.append, ('future',)),
+            (PRIORITY_FUTURE, order.append, ('future',)),
+            (PRIORITY_LIVE, order.append, ('live',)),
+            (PRIORITY_LIVE, order.append, ('live',)),
+        ]
+        futures = [scheduler.submit(priority, fn, *args) for priority, fn, args in calls]
+        gate.set()
+        results = [f.exception() for f in futures]
+        self.assertEqual(order[:2], ['live', 'live'])
+        self.assertEqual(len(order), 3)
+        self.assertEqual(sum(isinstance(r, QuotaExceeded) for r in results), 1)
+
 if __name__ == '__main__':
     unittest.main()